@@ -0,0 +1,271 @@
+"""
+NetAuditBot - Caché de Análisis por Host
+Memoiza los hallazgos de cada host según una huella canónica de sus puertos,
+servicios y versiones: los hosts idénticos reutilizan los hallazgos ya
+calculados y solo se completan los campos propios del host (IP y hostname)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS host_analysis (
+    fingerprint TEXT PRIMARY KEY,
+    findings TEXT NOT NULL,
+    used_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+# Campos de un hallazgo que dependen del host y no se guardan en la caché
+HOST_FIELDS = ('host', 'hostname')
+
+
+def host_fingerprint(host_data: Dict, context: str = '', port_fields: Tuple[str, ...] = (),
+                     host_fields: Tuple[str, ...] = ()) -> Tuple:
+    """
+    Huella canónica de un host a efectos del análisis
+
+    Solo incluye lo que los chequeos leen: número de puertos abiertos y, por
+    puerto, número, servicio, producto, versión y extrainfo (ordenados), más
+    los campos adicionales que declaren los chequeos. Es una tupla para que la
+    capa en memoria no pague un hash criptográfico por host.
+
+    Args:
+        host_data: Datos del host
+        context: Identidad de las reglas/base de CVEs/chequeos con las que se analiza
+        port_fields: Campos adicionales de cada puerto que leen los chequeos
+        host_fields: Campos adicionales del host que leen los chequeos
+
+    Returns:
+        Tupla hashable que identifica la configuración del host
+    """
+    ports = tuple(sorted(
+        (
+            port_info['port'],
+            port_info.get('service', ''),
+            port_info.get('product', ''),
+            port_info.get('version', ''),
+            port_info.get('extrainfo', ''),
+        ) + tuple(_canonical(port_info.get(field)) for field in port_fields)
+        for port_info in host_data['ports']
+    ))
+    extra = tuple(_canonical(host_data.get(field)) for field in host_fields)
+    return context, host_data['open_ports_count'], ports, extra
+
+
+def _canonical(value) -> str:
+    """Representación estable y hashable de un campo adicional"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _disk_key(fingerprint: Tuple) -> str:
+    """Clave de la capa persistente para una huella"""
+    canonical = json.dumps(fingerprint, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Caché LRU acotada en memoria con una capa persistente opcional en SQLite
+
+    Cada entrada es la lista de hallazgos de un host sin sus campos propios.
+    Las entradas nuevas se escriben en disco en bloque con flush(), que además
+    elimina las huellas usadas hace más tiempo si se supera max_rows.
+
+    En el análisis paralelo cada worker usa su copia: entre start_delta() y
+    take_delta() registra lo que ha calculado, y el proceso padre lo
+    incorpora con merge_delta() para persistirlo y contar aciertos y fallos.
+    """
+
+    def __init__(self, max_entries: int = None, path: Optional[str] = None, max_rows: int = None):
+        """
+        Inicializa la caché
+
+        Args:
+            max_entries: Máximo de huellas en memoria (por defecto ANALYSIS_CACHE_SIZE)
+            path: Base de datos persistente (None = solo memoria)
+            max_rows: Máximo de huellas en disco (por defecto ANALYSIS_CACHE_MAX_ROWS; 0 = sin límite)
+        """
+        self.max_entries = max_entries or config.ANALYSIS_CACHE_SIZE
+        self.path = path
+        self.max_rows = config.ANALYSIS_CACHE_MAX_ROWS if max_rows is None else max_rows
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple, List[Dict]]' = OrderedDict()
+        self._pending: Dict[str, List[Dict]] = {}
+        # Huellas leídas de disco cuya fecha de uso se actualiza en flush()
+        self._touched = set()
+        # Entradas nuevas a devolver al proceso padre (None = no se registran)
+        self._delta: Optional[List[Tuple[Tuple, List[Dict]]]] = None
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        # Las conexiones SQLite no deben compartirse entre procesos
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(host_analysis)")}
+            if 'used_at' not in columns:
+                # Bases creadas antes de que la capa persistente tuviera límite
+                self._conn.execute("ALTER TABLE host_analysis ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS host_analysis_used_at ON host_analysis (used_at)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        state['_pending'] = {}
+        state['_touched'] = set()
+        return state
+
+    def _remember(self, fingerprint: Tuple, findings: List[Dict]):
+        self._entries[fingerprint] = findings
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, fingerprint: Tuple) -> Optional[List[Dict]]:
+        """
+        Busca los hallazgos memoizados para una huella
+
+        Returns:
+            Lista de hallazgos sin campos del host, o None si no está en la caché
+        """
+        findings = self._entries.get(fingerprint)
+        if findings is not None:
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return findings
+
+        conn = self._connection()
+        if conn is not None:
+            key = _disk_key(fingerprint)
+            row = conn.execute(
+                "SELECT findings FROM host_analysis WHERE fingerprint = ?", (key,)
+            ).fetchone()
+            if row:
+                findings = json.loads(row[0])
+                self._remember(fingerprint, findings)
+                self._touched.add(key)
+                self.hits += 1
+                return findings
+
+        self.misses += 1
+        return None
+
+    def put(self, fingerprint: Tuple, findings: List[Dict]):
+        """
+        Memoiza los hallazgos de un host
+
+        Args:
+            fingerprint: Huella del host
+            findings: Hallazgos del host (se descartan sus campos propios)
+        """
+        templates = [
+            {key: value for key, value in finding.items() if key not in HOST_FIELDS}
+            for finding in findings
+        ]
+        self._remember(fingerprint, templates)
+        if self._delta is not None:
+            self._delta.append((fingerprint, templates))
+        elif self.path:
+            self._pending[_disk_key(fingerprint)] = templates
+
+    def start_delta(self):
+        """
+        Empieza a registrar lo que un worker debe devolver al proceso padre
+
+        Los contadores se reinician y las entradas nuevas dejan de ir a la
+        capa persistente del worker: las escribe el proceso padre.
+        """
+        self.hits = 0
+        self.misses = 0
+        self._touched.clear()
+        self._delta = []
+
+    def take_delta(self) -> Dict:
+        """
+        Entradas nuevas, huellas leídas de disco y contadores desde start_delta()
+
+        Returns:
+            Diccionario con 'entries', 'touched', 'hits' y 'misses'
+        """
+        delta = {
+            'entries': self._delta or [],
+            'touched': list(self._touched),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+        self.start_delta()
+        return delta
+
+    def merge_delta(self, delta: Dict):
+        """Incorpora lo registrado por un worker (ver take_delta)"""
+        self.hits += delta['hits']
+        self.misses += delta['misses']
+        self._touched.update(delta['touched'])
+        for fingerprint, templates in delta['entries']:
+            self._remember(fingerprint, templates)
+            if self.path:
+                self._pending[_disk_key(fingerprint)] = templates
+
+    def flush(self):
+        """Escribe en disco las entradas nuevas y aplica el límite de huellas"""
+        conn = self._connection()
+        if conn is None or not (self._pending or self._touched):
+            return
+
+        now = time.time()
+        with conn:
+            conn.executemany(
+                "UPDATE host_analysis SET used_at = ? WHERE fingerprint = ?",
+                ((now, key) for key in self._touched)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO host_analysis (fingerprint, findings, used_at) VALUES (?, ?, ?)",
+                ((key, json.dumps(findings, ensure_ascii=False), now)
+                 for key, findings in self._pending.items())
+            )
+            pruned = self._prune(conn)
+        if self._pending:
+            logger.info(f"✓ Caché de análisis: {len(self._pending)} huellas guardadas en {self.path}")
+        if pruned:
+            logger.info(f"✓ Caché de análisis: {pruned} huellas antiguas eliminadas (límite: {self.max_rows})")
+        self._pending.clear()
+        self._touched.clear()
+
+    def _prune(self, conn: sqlite3.Connection) -> int:
+        """Elimina las huellas usadas hace más tiempo por encima de max_rows"""
+        if not self.max_rows:
+            return 0
+        excess = conn.execute("SELECT COUNT(*) FROM host_analysis").fetchone()[0] - self.max_rows
+        if excess <= 0:
+            return 0
+        conn.execute(
+            "DELETE FROM host_analysis WHERE fingerprint IN "
+            "(SELECT fingerprint FROM host_analysis ORDER BY used_at LIMIT ?)",
+            (excess,)
+        )
+        return excess
+
+    def close(self):
+        """Guarda las entradas pendientes y cierra la base de datos"""
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
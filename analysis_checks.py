@@ -0,0 +1,186 @@
+"""
+NetAuditBot - API de Chequeos de Análisis
+Interfaz para definir chequeos de seguridad como plugins: cada chequeo
+declara su alcance (puerto, host o red), los campos que lee y su riesgo.
+Los chequeos de CHECKS_DIR se descubren y cargan automáticamente.
+
+Ejemplo de plugin (checks/ssh_root.py):
+
+    from analysis_checks import AnalysisCheck, SCOPE_PORT
+
+    class SSHVersion1(AnalysisCheck):
+        name = 'ssh_protocolo_1'
+        scope = SCOPE_PORT
+        inputs = ('service', 'extrainfo')
+        finding_type = 'Protocolo Obsoleto'
+        risk = 'ALTO'
+
+        def run(self, analyzer, host_ip, host_data, port_info):
+            if port_info['service'] == 'ssh' and 'protocol 1' in port_info.get('extrainfo', ''):
+                return self.make_finding(
+                    host_ip, host_data, port_info['port'], 'SSH',
+                    description="SSH acepta el protocolo 1",
+                    reason="El protocolo SSH 1 tiene fallos criptográficos conocidos",
+                    recommendation="Deshabilitar el protocolo 1 en sshd_config"
+                )
+"""
+
+import os
+import glob
+import inspect
+import logging
+import importlib.util
+from typing import Dict, List, Optional, Sequence
+import config
+
+logger = logging.getLogger(__name__)
+
+# Alcance de un chequeo: qué recibe run() y cuántas veces se invoca
+SCOPE_PORT = 'port'          # run(analyzer, host_ip, host_data, port_info), por puerto
+SCOPE_HOST = 'host'          # run(analyzer, host_ip, host_data), por host
+SCOPE_NETWORK = 'network'    # run(analyzer, scan_results, findings), una vez al final
+
+SCOPES = (SCOPE_PORT, SCOPE_HOST, SCOPE_NETWORK)
+
+# Riesgos que puede asignar un chequeo (los que contabiliza el analizador)
+CHECK_RISKS = ('ALTO', 'MEDIO', 'BAJO')
+
+
+class AnalysisCheck:
+    """
+    Chequeo de análisis de seguridad
+
+    Atributos que define cada chequeo:
+        name: Identificador único (se usa en los tiempos por chequeo)
+        scope: SCOPE_PORT, SCOPE_HOST o SCOPE_NETWORK
+        inputs: Campos del puerto (alcance puerto) o del host (alcance host)
+            que lee el chequeo; forman parte de la huella de la caché de análisis
+        finding_type: Tipo de los hallazgos que genera
+        risk: Riesgo por defecto de sus hallazgos
+        version: Versión de la lógica del chequeo; al cambiar invalida la
+            caché de análisis (en los plugins, por defecto tamaño y fecha del archivo)
+
+    run() devuelve un hallazgo, una lista de hallazgos o None.
+    Los chequeos de red se ejecutan en paralelo entre sí, por lo que no deben
+    modificar el estado compartido del analizador.
+    """
+
+    name: str = ''
+    scope: str = SCOPE_PORT
+    inputs: Sequence[str] = ()
+    finding_type: str = ''
+    risk: str = 'MEDIO'
+    version: str = ''
+
+    def run(self, analyzer, *args):
+        raise NotImplementedError
+
+    def make_finding(self, host_ip: str, host_data: Dict, port, service: str,
+                     description: str, reason: str, recommendation: str,
+                     risk: Optional[str] = None) -> Dict:
+        """
+        Construye un hallazgo con el formato del analizador
+
+        Args:
+            host_ip: IP del host
+            host_data: Información del host
+            port: Puerto afectado ('N/A' si aplica a todo el host)
+            service: Servicio afectado
+            description: Descripción breve
+            reason: Motivo del riesgo
+            recommendation: Recomendación de mitigación
+            risk: Riesgo del hallazgo (por defecto, el del chequeo)
+
+        Returns:
+            Diccionario del hallazgo
+
+        Raises:
+            ValueError: Si el riesgo no es uno de CHECK_RISKS
+        """
+        if risk is not None and risk not in CHECK_RISKS:
+            raise ValueError(f"Riesgo desconocido '{risk}' en un hallazgo del chequeo {self.name}")
+        return {
+            'host': host_ip,
+            'hostname': host_data.get('hostname', 'N/A'),
+            'type': self.finding_type,
+            'risk': risk or self.risk,
+            'port': port,
+            'service': service,
+            'description': description,
+            'reason': reason,
+            'recommendation': recommendation
+        }
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name} ({self.scope})>"
+
+
+def validate_check(check: AnalysisCheck):
+    """Comprueba que un chequeo declara un alcance, tipo y riesgo válidos"""
+    if not check.name:
+        raise ValueError(f"El chequeo {type(check).__name__} no declara 'name'")
+    if check.scope not in SCOPES:
+        raise ValueError(f"Alcance desconocido '{check.scope}' en el chequeo {check.name}")
+    if not check.finding_type:
+        raise ValueError(f"El chequeo {check.name} no declara 'finding_type'")
+    if check.risk not in CHECK_RISKS:
+        raise ValueError(f"Riesgo desconocido '{check.risk}' en el chequeo {check.name}")
+
+
+def load_check_file(path: str) -> List[AnalysisCheck]:
+    """
+    Carga los chequeos definidos en un archivo Python
+
+    Se instancian todas las subclases de AnalysisCheck definidas en el propio
+    módulo (no las importadas).
+
+    Args:
+        path: Ruta del archivo
+
+    Returns:
+        Lista de chequeos validados
+    """
+    module_name = f"netauditbot_check_{os.path.splitext(os.path.basename(path))[0]}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    stat = os.stat(path)
+    checks = []
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if issubclass(cls, AnalysisCheck) and cls is not AnalysisCheck and cls.__module__ == module_name:
+            check = cls()
+            validate_check(check)
+            # Editar el plugin invalida los hallazgos memoizados con la versión anterior
+            check.version = check.version or f"{stat.st_size}:{stat.st_mtime_ns}"
+            checks.append(check)
+    return checks
+
+
+def discover_checks(directory: str = None) -> List[AnalysisCheck]:
+    """
+    Descubre los chequeos de los archivos *.py de un directorio
+
+    Un plugin que no se puede cargar se registra en el log y se omite.
+
+    Args:
+        directory: Directorio de plugins (por defecto CHECKS_DIR)
+
+    Returns:
+        Lista de chequeos en orden de archivo
+    """
+    directory = directory or config.CHECKS_DIR
+    checks = []
+
+    for path in sorted(glob.glob(os.path.join(directory, '*.py'))):
+        if os.path.basename(path).startswith('_'):
+            continue
+        try:
+            loaded = load_check_file(path)
+        except Exception as e:
+            logger.error(f"No se pudo cargar el chequeo {path}: {e}")
+            continue
+        checks.extend(loaded)
+        logger.info(f"Chequeos cargados desde {path}: {', '.join(check.name for check in loaded)}")
+
+    return checks
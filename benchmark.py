@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+NetAuditBot - Benchmarks de Rendimiento
+Genera conjuntos de datos sintéticos y mide el tiempo del análisis de seguridad
+
+Uso:
+    python benchmark.py [small|medium|large ...]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+from typing import Callable, Dict
+
+from security_analyzer import SecurityAnalyzer
+
+# Perfiles de puertos típicos (puerto, servicio, producto, versión, extrainfo)
+PORT_PROFILES = [
+    (21, 'ftp', 'vsftpd', '2.3.4', ''),
+    (22, 'ssh', 'OpenSSH', '7.4p1 Debian 10+deb9u7', 'protocol 2.0'),
+    (22, 'ssh', 'OpenSSH', '8.9p1 Ubuntu 3ubuntu0.6', 'protocol 2.0'),
+    (23, 'telnet', '', '', ''),
+    (25, 'smtp', 'Postfix smtpd', '', ''),
+    (53, 'domain', 'ISC BIND', '9.16.1', ''),
+    (80, 'http', 'Apache httpd', '2.4.49', '(Unix)'),
+    (80, 'http', 'Microsoft IIS httpd', '7.0', ''),
+    (110, 'pop3', 'Dovecot pop3d', '', ''),
+    (139, 'netbios-ssn', 'Samba smbd', '4.6.2', ''),
+    (443, 'https', 'nginx', '1.18.0', ''),
+    (445, 'microsoft-ds', '', '', ''),
+    (3306, 'mysql', 'MySQL', '5.5.62', ''),
+    (3389, 'ms-wbt-server', 'Microsoft Terminal Services', '', ''),
+    (5432, 'postgresql', 'PostgreSQL DB', '9.6.0', ''),
+    (8080, 'http-proxy', '', '', ''),
+]
+
+# Tamaños de los conjuntos de datos (número de hosts)
+DATASETS = {
+    'small': 1000,
+    'medium': 20000,
+    'large': 100000,
+}
+
+
+def generate_scan_results(num_hosts: int, seed: int = 42, profiles: int = 50) -> Dict[str, Dict]:
+    """
+    Genera resultados de escaneo sintéticos con el mismo formato que NetworkScanner
+
+    Args:
+        num_hosts: Número de hosts a generar
+        seed: Semilla para obtener siempre el mismo conjunto
+        profiles: Número de configuraciones de host distintas
+
+    Returns:
+        Diccionario con el formato de scan_results
+    """
+    rnd = random.Random(seed)
+
+    host_profiles = []
+    for _ in range(profiles):
+        ports = {}
+        for entry in rnd.sample(PORT_PROFILES, rnd.randint(0, 9)):
+            ports.setdefault(entry[0], entry)
+        host_profiles.append(sorted(ports.values()))
+
+    scan_results = {}
+    for i in range(num_hosts):
+        ip = f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+        ports = [
+            {
+                'port': port,
+                'state': 'open',
+                'service': service,
+                'version': version,
+                'product': product,
+                'extrainfo': extrainfo
+            }
+            for port, service, product, version, extrainfo in rnd.choice(host_profiles)
+        ]
+        scan_results[ip] = {
+            'ip': ip,
+            'hostname': f"host-{i}" if i % 3 else '',
+            'state': 'up',
+            'os': 'Linux' if i % 2 else '',
+            'ports': ports,
+            'open_ports_count': len(ports)
+        }
+
+    return scan_results
+
+
+def run_separate_passes(scan_results: Dict) -> int:
+    """Análisis con los cuatro recorridos independientes"""
+    analyzer = SecurityAnalyzer(scan_results)
+    findings = (
+        analyzer.analyze_vulnerable_ports() +
+        analyzer.analyze_unencrypted_services() +
+        analyzer.analyze_vulnerable_versions() +
+        analyzer.analyze_excessive_ports()
+    )
+    return len(findings)
+
+
+def run_fused_pass(scan_results: Dict) -> int:
+    """Los mismos chequeos en un único recorrido (sin puntajes, top K ni agregación)"""
+    results = SecurityAnalyzer(scan_results, top_k=0).analyze_hosts(scan_results.items())
+    return sum(len(findings) for findings in results.values())
+
+
+def run_analyze_all(scan_results: Dict) -> int:
+    """Análisis completo con analyze_all (incluye puntajes, top K y agregación)"""
+    return SecurityAnalyzer(scan_results).analyze_all()['total_vulnerabilities']
+
+
+def run_analyze_all_parallel(scan_results: Dict) -> int:
+    """Análisis completo repartido entre todos los núcleos"""
+    return SecurityAnalyzer(scan_results).analyze_all(workers=0)['total_vulnerabilities']
+
+
+# Casos de benchmark: nombre -> función que recibe scan_results. Los dos
+# primeros hacen el mismo trabajo; analyze_all hace además el resumen completo.
+BENCHMARKS = {
+    'Recorridos separados': run_separate_passes,
+    'Recorrido fusionado': run_fused_pass,
+    'analyze_all': run_analyze_all,
+    f'analyze_all ({os.cpu_count()} procesos)': run_analyze_all_parallel,
+}
+
+
+def time_case(func: Callable, scan_results: Dict, repeat: int = 3) -> tuple:
+    """
+    Mide el mejor tiempo de varias ejecuciones
+
+    Returns:
+        Tupla (segundos, resultado)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(scan_results)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    """Función principal"""
+    # Los avisos por hallazgo no forman parte de lo que se mide
+    logging.disable(logging.CRITICAL)
+
+    names = sys.argv[1:] or ['small', 'medium']
+    for name in names:
+        if name not in DATASETS:
+            print(f"❌ Conjunto desconocido: {name} (opciones: {', '.join(DATASETS)})")
+            sys.exit(1)
+
+        scan_results = generate_scan_results(DATASETS[name])
+        total_ports = sum(host['open_ports_count'] for host in scan_results.values())
+
+        print("\n" + "=" * 60)
+        print(f"  Conjunto '{name}': {len(scan_results)} hosts, {total_ports} puertos")
+        print("=" * 60)
+
+        baseline = None
+        for case_name, func in BENCHMARKS.items():
+            elapsed, result = time_case(func, scan_results)
+            baseline = baseline or elapsed
+            print(f"{case_name:30s}: {elapsed * 1000:10.1f} ms  "
+                  f"({baseline / elapsed:5.2f}x)  resultado={result}")
+
+
+if __name__ == "__main__":
+    main()
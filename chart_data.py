@@ -0,0 +1,94 @@
+"""
+NetAuditBot - Datos de Gráficos
+Agregaciones para los gráficos del reporte que mantienen acotado el número de
+barras (y por tanto el coste de dibujarlas) sea cual sea el número de hosts
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+from config import *
+
+
+def host_label(host_ip: str, host_data: Dict) -> str:
+    """Etiqueta corta de un host: su hostname (20 caracteres) o su IP"""
+    return (host_data.get('hostname', '') or host_ip)[:20]
+
+
+def unique_host_labels(hosts: List[Tuple[str, Dict]]) -> List[str]:
+    """
+    Etiquetas de hosts sin repeticiones
+
+    Dos hostnames que coinciden en sus 20 primeros caracteres darían la misma
+    etiqueta y el gráfico fundiría sus barras; en ese caso se usa la IP.
+
+    Args:
+        hosts: Pares (IP, datos del host)
+
+    Returns:
+        Una etiqueta distinta por host, en el mismo orden
+    """
+    labels = [host_label(host_ip, host_data) for host_ip, host_data in hosts]
+    repeated = {label for label, count in Counter(labels).items() if count > 1}
+    if not repeated:
+        return labels
+
+    unique, used = [], set()
+    for (host_ip, _), label in zip(hosts, labels):
+        if label in repeated or label in used:
+            label = host_ip if host_ip not in used else f"{label} ({host_ip})"
+        used.add(label)
+        unique.append(label)
+    return unique
+
+
+def port_histogram(counts: List[int], bins: int = CHART_PORT_BINS,
+                   threshold: int = MAX_SAFE_OPEN_PORTS) -> List[Tuple[int, int, int]]:
+    """
+    Histograma del número de puertos abiertos por host
+
+    Con pocos valores distintos cada barra es un número de puertos; si no,
+    se agrupan en intervalos del mismo ancho alineados con el umbral, de
+    modo que ningún intervalo mezcla hosts por debajo y por encima de él.
+
+    Args:
+        counts: Puertos abiertos de cada host
+        bins: Número aproximado de intervalos
+        threshold: Umbral seguro de puertos abiertos
+
+    Returns:
+        Lista de (mínimo, máximo, hosts) por intervalo, en orden
+    """
+    if not counts:
+        return []
+
+    frequencies = Counter(counts)
+    top = max(frequencies)
+    width = max(1, math.ceil((top + 1) / max(1, bins)))
+    offset = (threshold + 1) % width
+    lows = sorted({0, *range(offset, top + 1, width)})
+    highs = [low - 1 for low in lows[1:]] + [top]
+
+    histogram = []
+    for low, high in zip(lows, highs):
+        hosts = sum(frequencies.get(ports, 0) for ports in range(low, high + 1))
+        histogram.append((low, high, hosts))
+    return histogram
+
+
+def top_hosts(hosts: List[Tuple[str, Dict]], n: int = CHART_TOP_HOSTS) -> List[Tuple[str, Dict]]:
+    """
+    Los n hosts con más puertos abiertos (a igualdad, en su orden original)
+
+    Args:
+        hosts: Pares (IP, datos del host)
+        n: Número de hosts
+
+    Returns:
+        Pares (IP, datos del host) de mayor a menor número de puertos
+    """
+    ranked = heapq.nlargest(
+        n, enumerate(hosts), key=lambda item: (item[1][1]['open_ports_count'], -item[0])
+    )
+    return [host for _, host in ranked]
@@ -17,6 +17,14 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+# Archivos de reglas adicionales (*.json) cargados automáticamente si existen
+RULES_DIR = os.path.join(BASE_DIR, "rules")
+# Chequeos de análisis adicionales (plugins *.py) cargados automáticamente si existen
+CHECKS_DIR = os.path.join(BASE_DIR, "checks")
+# Datos locales (base de datos de CVEs importada desde feeds del NVD)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+# Caché de bytecode de las plantillas compiladas de TEMPLATES_DIR
+TEMPLATE_CACHE_DIR = os.path.join(DATA_DIR, "template_cache")
 
 # Crear directorios si no existen
 os.makedirs(REPORTS_DIR, exist_ok=True)
@@ -33,6 +41,36 @@ NMAP_ARGUMENTS = "-sV -sC -O --osscan-guess"
 # Timeout del escaneo (en segundos)
 SCAN_TIMEOUT = 300
 
+# ==================== CONFIGURACIÓN DE ANÁLISIS ====================
+# Procesos para el análisis de seguridad (1 = secuencial, 0 = todos los núcleos)
+ANALYSIS_WORKERS = 1
+
+# Número mínimo de hosts para que compense repartir el análisis entre procesos
+PARALLEL_MIN_HOSTS = 5000
+
+# Hilos para ejecutar en paralelo los chequeos de red (plugins de alcance 'network')
+NETWORK_CHECK_THREADS = 4
+
+# Los tiempos por chequeo se miden en uno de cada CHECK_TIMING_SAMPLE hosts y
+# se extrapolan al total (1 = medir todos, más preciso pero más lento)
+CHECK_TIMING_SAMPLE = 16
+
+# Combinaciones distintas de puerto/servicio/producto/versión cuyos hallazgos
+# integrados se reutilizan dentro de un análisis (al llenarse se vacía)
+PORT_MEMO_SIZE = 65536
+
+# Caché de hallazgos por huella de host: entradas en memoria y capa persistente
+ANALYSIS_CACHE_SIZE = 4096
+ANALYSIS_CACHE_PATH = os.path.join(DATA_DIR, "analysis_cache.db")
+# Huellas conservadas en disco: al guardar se eliminan las usadas hace más tiempo
+ANALYSIS_CACHE_MAX_ROWS = 200000  # 0 = sin límite
+
+# Resultados de escaneo guardados para reanalizar sin volver a escanear
+# (python netauditbot.py reanalyze --run <id>)
+STORE_RUNS = True
+RUNS_DIR = os.path.join(DATA_DIR, "runs")
+MAX_STORED_RUNS = 20  # 0 = sin límite de ejecuciones
+
 # ==================== CLASIFICACIÓN DE RIESGOS ====================
 # Puertos vulnerables conocidos
 VULNERABLE_PORTS = {
@@ -58,6 +96,8 @@ VULNERABLE_PORTS = {
 UNENCRYPTED_SERVICES = ["ftp", "telnet", "http", "smtp", "pop3", "imap"]
 
 # Versiones vulnerables conocidas (ejemplos)
+# Cada entrada es una familia de versiones ("7.4" cubre 7.4, 7.4p1 y 7.4.x, pero no 17.4)
+# o un rango explícito (">=2.4.0,<2.4.50")
 VULNERABLE_VERSIONS = {
     "openssh": ["7.4", "7.3", "6.6"],
     "apache": ["2.2", "2.4.49"],
@@ -65,6 +105,28 @@ VULNERABLE_VERSIONS = {
     "microsoft-iis": ["6.0", "7.0"],
 }
 
+# Otros nombres con los que aparecen en los banners de nmap (product/extrainfo)
+# los productos de VULNERABLE_VERSIONS; el nombre del producto siempre se busca
+PRODUCT_ALIASES = {
+    "apache": ["apache2"],
+    "microsoft-iis": ["iis"],
+}
+
+# Base de datos local de CVEs (se crea con: python netauditbot.py import-cve <feeds>)
+CVE_DATABASE_PATH = os.path.join(DATA_DIR, "cve.db")
+
+# Nombres de producto de nmap cuyo CPE no se deduce del propio nombre
+CPE_PRODUCT_ALIASES = {
+    "apache httpd": [("apache", "http_server")],
+    "apache tomcat": [("apache", "tomcat")],
+    "microsoft iis httpd": [("microsoft", "internet_information_services")],
+    "isc bind": [("isc", "bind")],
+    "mysql": [("oracle", "mysql"), ("mysql", "mysql")],
+    "postgresql db": [("postgresql", "postgresql")],
+    "samba smbd": [("samba", "samba")],
+    "openssh": [("openbsd", "openssh")],
+}
+
 # ==================== UMBRALES DE ALERTA ====================
 # Número máximo de puertos abiertos considerado seguro
 MAX_SAFE_OPEN_PORTS = 5
@@ -72,10 +134,78 @@ MAX_SAFE_OPEN_PORTS = 5
 # Porcentaje de hosts vulnerables que activa alerta crítica
 CRITICAL_VULNERABLE_PERCENTAGE = 50
 
+# Prefijo de subred adicional para la analítica de red (además de /24)
+SUBNET_PREFIX = 16
+# Prefijo con el que se agrupan los hosts IPv6
+SUBNET_PREFIX_V6 = 64
+# Hosts mínimos de una subred para que genere alerta
+SUBNET_ALERT_MIN_HOSTS = 4
+
+# Puntos que suma cada hallazgo al puntaje de riesgo de su host
+HOST_RISK_WEIGHTS = {
+    "ALTO": 10,
+    "MEDIO": 5,
+    "BAJO": 2,
+}
+
+# Nivel de riesgo del host según su puntaje (de mayor a menor; por debajo, BAJO)
+HOST_RISK_LEVELS = [
+    (20, "CRÍTICO"),
+    (10, "ALTO"),
+    (5, "MEDIO"),
+]
+
+# Hallazgos prioritarios: prioridad = peso del riesgo * PRIORITY_RISK_FACTOR
+# + puntaje del host + puertos abiertos del host * PRIORITY_EXPOSURE_FACTOR
+TOP_FINDINGS_K = 10
+PRIORITY_RISK_FACTOR = 10
+PRIORITY_EXPOSURE_FACTOR = 1
+
 # ==================== CONFIGURACIÓN DE REPORTES ====================
 REPORT_TITLE = "Reporte de Auditoría de Red"
 REPORT_FILENAME_PREFIX = "audit_report"
 
+# Hosts listados por cada grupo de hallazgos idénticos (el resto se resume)
+REPORT_MAX_HOSTS_PER_FINDING = 10
+
+# Subredes (y alertas de red) mostradas por tabla en el reporte
+REPORT_MAX_SUBNETS = 50
+
+# Escritura del reporte HTML en streaming: eventos del template agrupados por
+# escritura y tamaño del búfer del archivo (bytes)
+REPORT_STREAM_CHUNK = 64
+REPORT_WRITE_BUFFER = 1024 * 1024
+
+# Diseño del reporte HTML: 'single' (un único archivo), 'sharded' (índice con
+# resumen y gráficos más páginas de detalle por subred) o 'auto' (sharded a
+# partir de REPORT_SHARD_MIN_HOSTS hosts)
+REPORT_LAYOUTS = ("auto", "single", "sharded")
+REPORT_LAYOUT = "auto"
+REPORT_SHARD_MIN_HOSTS = 2000
+
+# Máximo de hosts por página de detalle y procesos para renderizarlas (0 = todos los núcleos)
+REPORT_PAGE_HOSTS = 1000
+REPORT_RENDER_WORKERS = 0
+
+# Tablas de hosts y hallazgos: 'html' (una fila <tr> por elemento) o 'virtual'
+# (datos embebidos como JSON columnar; el navegador solo crea las filas
+# visibles y permite ordenar y filtrar)
+REPORT_TABLE_MODES = ("html", "virtual")
+REPORT_TABLE_MODE = "html"
+
+# Gráficos y CSS/JS del reporte: 'inline' (embebidos en cada HTML) o
+# 'external' (archivos con el hash del contenido en el nombre, en un
+# directorio compartido por los reportes), opcionalmente con copias .gz
+REPORT_ASSETS_MODES = ("inline", "external")
+REPORT_ASSETS = "inline"
+REPORT_ASSETS_DIR = os.path.join(REPORTS_DIR, "assets")
+REPORT_ASSETS_GZIP = False
+
+# Caché de renderizado direccionada por el hash de los datos (gráficos, tablas
+# virtuales y páginas de detalle) y su tamaño máximo en disco
+RENDER_CACHE_DIR = os.path.join(REPORTS_DIR, ".render_cache")
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 # Colores para clasificación de riesgos (HTML)
 RISK_COLORS = {
     "ALTO": "#dc3545",
@@ -107,6 +237,26 @@ CHART_STYLE = "default"  # Cambio de 'seaborn' a 'default' por compatibilidad
 CHART_DPI = 100
 CHART_FIGSIZE = (10, 6)
 
+# Gráfico de puertos abiertos: una barra por host hasta CHART_MAX_HOST_BARS
+# hosts; por encima, histograma (unos CHART_PORT_BINS intervalos) más los
+# CHART_TOP_HOSTS hosts con más puertos abiertos
+CHART_MAX_HOST_BARS = 50
+CHART_PORT_BINS = 20
+CHART_TOP_HOSTS = 20
+
+# Procesos para renderizar los gráficos de matplotlib (1 = secuencial, 0 = todos los núcleos)
+CHART_WORKERS = 0
+
+# Renderizador de los gráficos del reporte HTML: 'svg' (SVG en línea generado
+# sin dependencias, en milisegundos) o 'matplotlib' (PNG embebidos). El PDF
+# siempre usa PNG de matplotlib.
+CHART_RENDERERS = ("svg", "matplotlib")
+CHART_RENDERER = "svg"
+
+# Guardar también los gráficos PNG como archivos en el directorio del reporte
+# (se renderizan en memoria y se embeben en el HTML y el PDF)
+SAVE_CHART_IMAGES = False
+
 # ==================== MENSAJES DEL SISTEMA ====================
 MESSAGES = {
     "scan_start": "🔍 Iniciando escaneo de red...",
@@ -0,0 +1,359 @@
+"""
+NetAuditBot - Base de Datos Local de CVEs
+Importa feeds JSON del NVD descargados previamente y construye una base de
+datos SQLite indexada por producto CPE, con búsquedas de producto/versión
+en memoria que no dependen del tamaño del feed
+"""
+
+import os
+import re
+import gzip
+import json
+import sqlite3
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import config
+from version_index import VersionIndex, VersionRange, parse_version
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cves (
+    id TEXT PRIMARY KEY,
+    cvss REAL,
+    severity TEXT,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS cpe_ranges (
+    vendor TEXT NOT NULL,
+    product TEXT NOT NULL,
+    cve_id TEXT NOT NULL,
+    version_start TEXT,
+    start_inclusive INTEGER,
+    version_end TEXT,
+    end_inclusive INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_cpe_ranges_product ON cpe_ranges (product, vendor);
+CREATE INDEX IF NOT EXISTS idx_cpe_ranges_cve ON cpe_ranges (cve_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Palabras genéricas de los nombres de producto de nmap que no identifican un CPE
+_GENERIC_TOKENS = {
+    'httpd', 'http', 'https', 'smtpd', 'ftpd', 'sshd', 'pop3d', 'imapd', 'server',
+    'daemon', 'service', 'services', 'db', 'database', 'proxy', 'web', 'the',
+}
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def _open_feed(path: str):
+    """Abre un feed JSON del NVD, comprimido (.gz) o no"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _parse_cpe(uri: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Extrae (vendor, product, version) de un identificador CPE 2.3
+
+    Ejemplo: cpe:2.3:a:openbsd:openssh:7.4:*:*:*:*:*:*:* -> ('openbsd', 'openssh', '7.4')
+    """
+    parts = uri.split(':')
+    if len(parts) < 6 or parts[0] != 'cpe':
+        return None
+    return parts[3].lower(), parts[4].lower(), parts[5]
+
+
+def _cpe_rows(cve_id: str, cpe_matches: Iterable[Dict]) -> Iterator[Tuple]:
+    """Filas de cpe_ranges para las coincidencias CPE vulnerables de un CVE"""
+    for match in cpe_matches:
+        if not match.get('vulnerable', True):
+            continue
+        parsed = _parse_cpe(match.get('cpe23Uri') or match.get('criteria') or '')
+        if not parsed:
+            continue
+        vendor, product, version = parsed
+
+        start = match.get('versionStartIncluding') or match.get('versionStartExcluding')
+        end = match.get('versionEndIncluding') or match.get('versionEndExcluding')
+
+        if not start and not end and version not in ('*', '-', ''):
+            # Versión concreta en el propio CPE
+            yield vendor, product, cve_id, version, 1, version, 1
+        else:
+            yield (
+                vendor, product, cve_id,
+                start, 1 if match.get('versionStartIncluding') else 0,
+                end, 1 if match.get('versionEndIncluding') else 0
+            )
+
+
+def _walk_nodes(nodes: Iterable[Dict]) -> Iterator[Dict]:
+    """Recorre los nodos de configuración (incluidos los anidados) devolviendo sus CPE"""
+    for node in nodes:
+        yield from node.get('cpe_match', [])
+        yield from node.get('cpeMatch', [])
+        yield from _walk_nodes(node.get('children', []))
+
+
+def _parse_nvd_11(item: Dict) -> Tuple[Tuple, List[Tuple]]:
+    """Registro de CVE y filas CPE de un elemento del feed NVD 1.1 (CVE_Items)"""
+    cve = item['cve']
+    cve_id = cve['CVE_data_meta']['ID']
+    descriptions = cve.get('description', {}).get('description_data', [])
+    summary = descriptions[0]['value'] if descriptions else ''
+
+    impact = item.get('impact', {})
+    cvss, severity = None, None
+    if 'baseMetricV3' in impact:
+        cvss = impact['baseMetricV3']['cvssV3'].get('baseScore')
+        severity = impact['baseMetricV3']['cvssV3'].get('baseSeverity')
+    elif 'baseMetricV2' in impact:
+        cvss = impact['baseMetricV2']['cvssV2'].get('baseScore')
+        severity = impact['baseMetricV2'].get('severity')
+
+    nodes = item.get('configurations', {}).get('nodes', [])
+    rows = list(_cpe_rows(cve_id, _walk_nodes(nodes)))
+    return (cve_id, cvss, severity, summary[:500]), rows
+
+
+def _parse_nvd_20(entry: Dict) -> Tuple[Tuple, List[Tuple]]:
+    """Registro de CVE y filas CPE de un elemento de la API NVD 2.0 (vulnerabilities)"""
+    cve = entry['cve']
+    cve_id = cve['id']
+    summary = next(
+        (d['value'] for d in cve.get('descriptions', []) if d.get('lang') == 'en'), ''
+    )
+
+    cvss, severity = None, None
+    metrics = cve.get('metrics', {})
+    for key in ('cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2'):
+        if metrics.get(key):
+            data = metrics[key][0]
+            cvss = data['cvssData'].get('baseScore')
+            severity = data['cvssData'].get('baseSeverity') or data.get('baseSeverity')
+            break
+
+    nodes = [node for conf in cve.get('configurations', []) for node in conf.get('nodes', [])]
+    rows = list(_cpe_rows(cve_id, _walk_nodes(nodes)))
+    return (cve_id, cvss, severity, summary[:500]), rows
+
+
+def import_feeds(paths: Iterable[str], db_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Importa feeds JSON del NVD en la base de datos local
+
+    Admite feeds 1.1 (clave CVE_Items) y respuestas de la API 2.0 (clave
+    vulnerabilities), comprimidos con gzip o no. Reimportar un CVE reemplaza
+    sus rangos anteriores.
+
+    Args:
+        paths: Rutas de los feeds
+        db_path: Ruta de la base de datos (por defecto CVE_DATABASE_PATH)
+
+    Returns:
+        Diccionario con el número de CVEs y rangos importados
+    """
+    db_path = db_path or config.CVE_DATABASE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+    totals = {'cves': 0, 'ranges': 0}
+
+    try:
+        for path in paths:
+            logger.info(f"Importando feed: {path}")
+            with _open_feed(path) as f:
+                data = json.load(f)
+
+            if 'CVE_Items' in data:
+                records = (_parse_nvd_11(item) for item in data['CVE_Items'])
+            elif 'vulnerabilities' in data:
+                records = (_parse_nvd_20(entry) for entry in data['vulnerabilities'])
+            else:
+                raise ValueError(f"Formato de feed no reconocido: {path}")
+
+            with conn:
+                for cve_row, range_rows in records:
+                    conn.execute("DELETE FROM cpe_ranges WHERE cve_id = ?", (cve_row[0],))
+                    conn.execute("INSERT OR REPLACE INTO cves VALUES (?, ?, ?, ?)", cve_row)
+                    conn.executemany("INSERT INTO cpe_ranges VALUES (?, ?, ?, ?, ?, ?, ?)", range_rows)
+                    totals['cves'] += 1
+                    totals['ranges'] += len(range_rows)
+
+        with conn:
+            conn.execute("ANALYZE")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('cve_count', (SELECT COUNT(*) FROM cves))"
+            )
+    finally:
+        conn.close()
+
+    logger.info(f"✓ Importados {totals['cves']} CVEs ({totals['ranges']} rangos) en {db_path}")
+    return totals
+
+
+class CVEDatabase:
+    """
+    Consultas de CVEs por producto y versión sobre la base de datos local
+
+    La primera consulta de cada producto CPE carga sus rangos en un
+    VersionIndex; las siguientes se resuelven en memoria con un bisect.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Abre la base de datos local
+
+        Args:
+            db_path: Ruta de la base de datos (por defecto CVE_DATABASE_PATH)
+        """
+        self.db_path = db_path or config.CVE_DATABASE_PATH
+        if not os.path.exists(self.db_path):
+            raise FileNotFoundError(f"Base de datos de CVEs no encontrada: {self.db_path}")
+
+        # Identidad del contenido (cambia al reimportar feeds), para cachés derivadas
+        stat = os.stat(self.db_path)
+        self.version = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+        self._conn = None
+        self._pid = None
+        self._indexes: Dict[Tuple[str, str], VersionIndex] = {}
+        self._resolved: Dict[str, List[Tuple[str, str]]] = {}
+        self._cves: Dict[str, Tuple] = {}
+
+        # Tabla en memoria producto CPE -> vendors, para resolver nombres de nmap
+        self._products: Dict[str, List[str]] = {}
+        for vendor, product in self._connection().execute(
+            "SELECT DISTINCT vendor, product FROM cpe_ranges"
+        ):
+            self._products.setdefault(product, []).append(vendor)
+
+        logger.info(f"Base de datos de CVEs cargada: {self.db_path} ({len(self._products)} productos)")
+
+    @classmethod
+    def open_default(cls) -> Optional['CVEDatabase']:
+        """Abre la base de datos por defecto si existe, o devuelve None"""
+        if not os.path.exists(config.CVE_DATABASE_PATH):
+            return None
+        try:
+            return cls(config.CVE_DATABASE_PATH)
+        except sqlite3.Error as e:
+            logger.error(f"No se pudo abrir la base de datos de CVEs: {e}")
+            return None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Las conexiones SQLite no deben compartirse entre procesos
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path)
+            self._pid = os.getpid()
+        return self._conn
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        return state
+
+    def close(self):
+        """Cierra la conexión con la base de datos"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def resolve_product(self, product: str) -> List[Tuple[str, str]]:
+        """
+        Resuelve un nombre de producto de nmap a productos CPE (vendor, product)
+
+        Se prueban, en orden: los alias de CPE_PRODUCT_ALIASES, el nombre
+        completo normalizado y cada palabra no genérica del nombre.
+
+        Args:
+            product: Nombre de producto de nmap (ej: "Apache httpd")
+
+        Returns:
+            Lista de pares (vendor, product)
+        """
+        key = (product or '').strip().lower()
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            return resolved
+
+        resolved = []
+        if key in config.CPE_PRODUCT_ALIASES:
+            resolved = [tuple(pair) for pair in config.CPE_PRODUCT_ALIASES[key]]
+        else:
+            tokens = [t for t in _TOKEN_SPLIT.split(key) if t]
+            candidates = ['_'.join(tokens)] + [t for t in tokens if t not in _GENERIC_TOKENS]
+            for candidate in candidates:
+                if candidate in self._products:
+                    resolved = [(vendor, candidate) for vendor in self._products[candidate]]
+                    break
+
+        self._resolved[key] = resolved
+        return resolved
+
+    def _index_for(self, vendor: str, product: str) -> VersionIndex:
+        index = self._indexes.get((vendor, product))
+        if index is None:
+            index = VersionIndex()
+            rows = self._connection().execute(
+                "SELECT cve_id, version_start, start_inclusive, version_end, end_inclusive "
+                "FROM cpe_ranges WHERE product = ? AND vendor = ?",
+                (product, vendor)
+            )
+            for cve_id, start, start_incl, end, end_incl in rows:
+                start_key = parse_version(start) if start else None
+                end_key = parse_version(end) if end else None
+                if (start and start_key is None) or (end and end_key is None):
+                    continue
+                index.add(VersionRange(start_key, end_key, bool(start_incl), bool(end_incl), cve_id), cve_id)
+            index.build()
+            self._indexes[(vendor, product)] = index
+        return index
+
+    def _cve(self, cve_id: str) -> Dict:
+        row = self._cves.get(cve_id)
+        if row is None:
+            row = self._connection().execute(
+                "SELECT id, cvss, severity, summary FROM cves WHERE id = ?", (cve_id,)
+            ).fetchone() or (cve_id, None, None, '')
+            self._cves[cve_id] = row
+        return {'id': row[0], 'cvss': row[1], 'severity': row[2], 'summary': row[3]}
+
+    def lookup(self, product: str, version: str) -> List[Dict]:
+        """
+        Busca los CVEs que afectan a un producto y versión detectados
+
+        Args:
+            product: Nombre de producto de nmap
+            version: Versión de nmap
+
+        Returns:
+            Lista de CVEs (id, cvss, severity, summary), ordenada por CVSS descendente
+        """
+        key = parse_version(version)
+        if key is None:
+            return []
+
+        cve_ids = set()
+        for vendor, cpe_product in self.resolve_product(product):
+            cve_ids.update(self._index_for(vendor, cpe_product).lookup_key(key))
+
+        cves = [self._cve(cve_id) for cve_id in cve_ids]
+        cves.sort(key=lambda c: (-(c['cvss'] or 0), c['id']))
+        return cves
+
+
+def cvss_to_risk(cvss: Optional[float]) -> str:
+    """Convierte una puntuación CVSS en un nivel de riesgo de NetAuditBot"""
+    if cvss is None or cvss >= 7.0:
+        return 'ALTO'
+    if cvss >= 4.0:
+        return 'MEDIO'
+    return 'BAJO'
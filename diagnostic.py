@@ -115,7 +115,8 @@ def check_files():
         'scanner.py',
         'security_analyzer.py',
         'report_generator.py',
-        'netauditbot.py'
+        'netauditbot.py',
+        os.path.join('templates', 'report.html.j2')
     ]
     
     all_ok = True
@@ -0,0 +1,93 @@
+"""
+NetAuditBot - Instrumentación
+Acumula tiempos por etapa (chequeos de análisis, fases del reporte...) para
+mostrarlos al final de la ejecución
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class TimingRegistry:
+    """
+    Tiempos acumulados por nombre
+
+    Cada entrada guarda los segundos totales, el número de llamadas y un
+    contador libre (por ejemplo, hallazgos generados).
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float, calls: int = 1, count: int = 0):
+        """
+        Acumula una medición
+
+        Args:
+            name: Nombre de la etapa
+            seconds: Tiempo transcurrido
+            calls: Número de llamadas que cubre la medición
+            count: Elementos producidos (hallazgos, archivos...)
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = [0.0, 0, 0]
+        entry[0] += seconds
+        entry[1] += calls
+        entry[2] += count
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Mide el bloque de código como una llamada de la etapa indicada"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def merge(self, timings: Dict[str, Dict]):
+        """Suma las mediciones exportadas por otro registro (ej: de un worker)"""
+        for name, entry in timings.items():
+            self.add(name, entry['seconds'], entry['calls'], entry['count'])
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Mediciones en el orden de registro: nombre -> {seconds, calls, count}"""
+        return {
+            name: {'seconds': seconds, 'calls': int(calls), 'count': int(count)}
+            for name, (seconds, calls, count) in self._entries.items()
+        }
+
+    def __bool__(self):
+        return bool(self._entries)
+
+
+def format_timings(timings: Dict[str, Dict], count_label: str = 'elementos') -> List[str]:
+    """
+    Formatea mediciones como líneas de tabla, de la más lenta a la más rápida
+
+    La columna del contador se omite si ninguna medición lo usa.
+
+    Args:
+        timings: Resultado de TimingRegistry.as_dict
+        count_label: Nombre de la columna del contador
+
+    Returns:
+        Líneas de texto listas para imprimir
+    """
+    if not timings:
+        return []
+
+    width = max(len('Etapa'), *(len(name) for name in timings))
+    total = sum(entry['seconds'] for entry in timings.values()) or 1.0
+    with_count = any(entry['count'] for entry in timings.values())
+    header = f"{'Etapa':<{width}}  {'Tiempo':>10}  {'%':>5}  {'Llamadas':>9}"
+    lines = [header + (f"  {count_label:>10}" if with_count else '')]
+
+    for name, entry in sorted(timings.items(), key=lambda item: -item[1]['seconds']):
+        line = (
+            f"{name:<{width}}  {entry['seconds'] * 1000:8.1f}ms  "
+            f"{100 * entry['seconds'] / total:5.1f}  {entry['calls']:>9}"
+        )
+        lines.append(line + (f"  {entry['count']:>10}" if with_count else ''))
+    return lines
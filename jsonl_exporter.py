@@ -0,0 +1,93 @@
+"""
+NetAuditBot - Módulo de Exportación JSON Lines
+Escribe hosts y hallazgos como registros JSON independientes, uno por línea,
+a medida que se producen (memoria constante sin importar el tamaño de la red)
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Compresores de la librería estándar según la extensión del archivo
+COMPRESSED_OPENERS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open,
+}
+
+
+def open_jsonl(path: str, mode: str = 'wt'):
+    """
+    Abre un archivo JSON Lines, comprimido o no según su extensión
+
+    Args:
+        path: Ruta del archivo (.jsonl, .jsonl.gz, .jsonl.xz o .jsonl.bz2)
+        mode: Modo de apertura en texto ('wt', 'rt', 'at')
+
+    Returns:
+        Objeto de archivo en modo texto
+    """
+    for extension, opener in COMPRESSED_OPENERS.items():
+        if path.endswith(extension):
+            return opener(path, mode, encoding='utf-8')
+    return open(path, mode.replace('t', ''), encoding='utf-8')
+
+
+class JSONLExporter:
+    """
+    Exportador en streaming de registros JSON Lines
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa el exportador y abre el archivo de salida
+
+        Args:
+            path: Ruta del archivo de salida
+        """
+        self.path = path
+        self.records = 0
+        self._file = open_jsonl(path, 'wt')
+        logger.info(f"Exportación JSON Lines activada: {path}")
+
+    def write_record(self, record_type: str, payload: Dict):
+        """
+        Escribe un registro en una línea
+
+        Args:
+            record_type: Tipo de registro ('host', 'finding', ...)
+            payload: Datos del registro
+        """
+        record = {'record': record_type}
+        record.update(payload)
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str))
+        self._file.write('\n')
+        self.records += 1
+
+    def write_host(self, host_ip: str, host_data: Dict):
+        """Escribe el registro de un host escaneado"""
+        payload = dict(host_data)
+        payload.setdefault('ip', host_ip)
+        self.write_record('host', payload)
+
+    def write_finding(self, finding: Dict):
+        """Escribe el registro de un hallazgo de seguridad"""
+        self.write_record('finding', finding)
+
+    def close(self):
+        """Cierra el archivo de salida"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"✓ Exportación JSON Lines completada: {self.path} ({self.records} registros)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,97 @@
+"""
+NetAuditBot - Gráficos con Matplotlib
+Renderiza los gráficos del reporte como PNG en memoria con la API orientada a
+objetos de matplotlib (Figure + FigureCanvasAgg, sin el estado global de
+pyplot), repartidos en un pool de procesos
+"""
+
+import logging
+import multiprocessing
+from io import BytesIO
+from typing import Dict, Sequence, Tuple
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from config import *
+from parallel_analysis import resolve_workers
+
+logger = logging.getLogger(__name__)
+
+
+def render_chart(spec: Dict) -> bytes:
+    """
+    Renderiza un gráfico como PNG
+
+    Args:
+        spec: Especificación del gráfico (ReportGenerator.chart_specs)
+
+    Returns:
+        Contenido PNG
+    """
+    with matplotlib.style.context(CHART_STYLE):
+        fig = Figure(figsize=spec['figsize'])
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+
+        if spec['kind'] == 'barh':
+            bars = ax.barh(spec['labels'], spec['values'], color=spec['color'])
+        else:
+            bars = ax.bar(spec['labels'], spec['values'], color=spec['color'])
+        ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+        if spec.get('xlabel'):
+            ax.set_xlabel(spec['xlabel'])
+        if spec.get('ylabel'):
+            ax.set_ylabel(spec['ylabel'])
+        if spec.get('rotate_labels'):
+            for label in ax.get_xticklabels():
+                label.set_rotation(45)
+                label.set_horizontalalignment('right')
+
+        # Agregar valores sobre las barras
+        if spec.get('value_labels'):
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height,
+                        f'{int(height)}', ha='center', va='bottom')
+
+        if spec.get('threshold'):
+            value, legend = spec['threshold']
+            ax.axhline(y=value, color='r', linestyle='--', label=legend)
+            ax.legend()
+
+        buffer = BytesIO()
+        fig.tight_layout()
+        fig.savefig(buffer, format='png', dpi=CHART_DPI)
+    return buffer.getvalue()
+
+
+def _render_job(spec: Dict) -> Tuple[str, bytes]:
+    """Trabajo de un worker: (nombre, PNG) de un gráfico"""
+    return spec['name'], render_chart(spec)
+
+
+def render_charts(specs: Sequence[Dict], workers: int = CHART_WORKERS) -> Dict[str, bytes]:
+    """
+    Renderiza varios gráficos, en paralelo si hay varios núcleos
+
+    Cada gráfico es independiente y no comparte estado de pyplot, así que
+    se reparten entre procesos (un gráfico por tarea).
+
+    Args:
+        specs: Especificaciones de los gráficos
+        workers: Procesos a usar (1 = secuencial, 0 = todos los núcleos)
+
+    Returns:
+        PNG de cada gráfico por nombre, en el orden de specs
+    """
+    workers = min(resolve_workers(workers), len(specs))
+    if workers <= 1:
+        return dict(_render_job(spec) for spec in specs)
+
+    logger.info(f"Renderizando {len(specs)} gráficos con {workers} procesos")
+    start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+    with multiprocessing.get_context(start_method).Pool(workers) as pool:
+        # El gráfico más grande primero, para que no quede solo al final
+        jobs = sorted(specs, key=lambda spec: len(spec['values']), reverse=True)
+        charts = dict(pool.imap_unordered(_render_job, jobs))
+    return {spec['name']: charts[spec['name']] for spec in specs}
@@ -26,7 +26,9 @@ from datetime import datetime
 from config import *
 from scanner import NetworkScanner
 from security_analyzer import SecurityAnalyzer
-from report_generator import ReportGenerator
+from rule_engine import compile_rules
+from cve_database import CVEDatabase
+from analysis_cache import AnalysisCache
 
 # Banner ASCII
 BANNER = """
@@ -65,7 +67,14 @@ class NetAuditBot:
     Clase principal que orquesta el proceso completo de auditoría
     """
     
-    def __init__(self, target: str, verbose: bool = False, generate_pdf: bool = False):
+    def __init__(self, target: str, verbose: bool = False, generate_pdf: bool = False,
+                 snapshot_path: str = None, jsonl_path: str = None, rule_files: list = None,
+                 workers: int = ANALYSIS_WORKERS, use_cache: bool = True,
+                 subnet_prefix: int = SUBNET_PREFIX, from_run: str = None,
+                 store_run: bool = STORE_RUNS, report_layout: str = REPORT_LAYOUT,
+                 report_tables: str = REPORT_TABLE_MODE, chart_renderer: str = CHART_RENDERER,
+                 save_charts: bool = SAVE_CHART_IMAGES, report_assets: str = REPORT_ASSETS,
+                 gzip_assets: bool = REPORT_ASSETS_GZIP):
         """
         Inicializa NetAuditBot
         
@@ -73,17 +82,64 @@ class NetAuditBot:
             target: Red o rango de IPs a auditar
             verbose: Modo verbose para más detalles
             generate_pdf: Generar reporte en formato PDF además de HTML
+            snapshot_path: Ruta donde guardar un snapshot binario de los resultados
+            jsonl_path: Ruta de exportación JSON Lines (admite .gz/.xz/.bz2)
+            rule_files: Archivos de reglas JSON adicionales
+            workers: Procesos para el análisis (1 = secuencial, 0 = todos los núcleos)
+            use_cache: Reutilizar hallazgos de hosts idénticos y contenido ya renderizado (cachés persistentes)
+            subnet_prefix: Prefijo de subred de la analítica de red (además de /24)
+            from_run: Ejecución guardada (id o ruta del snapshot) a reanalizar en lugar de escanear
+            store_run: Guardar el escaneo para poder reanalizarlo después
+            report_layout: Diseño del reporte HTML ('auto', 'single' o 'sharded')
+            report_tables: Tablas del reporte HTML ('html' o 'virtual')
+            chart_renderer: Renderizador de gráficos del reporte HTML ('svg' o 'matplotlib')
+            save_charts: Guardar también los gráficos como archivos en el directorio del reporte
+            report_assets: Gráficos y CSS/JS embebidos ('inline') o como archivos compartidos ('external')
+            gzip_assets: Escribir también copias .gz de los recursos externos
         """
         self.target = target
         self.verbose = verbose
         self.generate_pdf = generate_pdf
+        self.snapshot_path = snapshot_path
+        self.jsonl_path = jsonl_path
+        self.rule_files = rule_files or []
+        self.workers = workers
+        self.use_cache = use_cache
+        self.subnet_prefix = subnet_prefix
+        self.from_run = from_run
+        self.store_run = store_run and not from_run
+        self.run_id = None
+        self.report_layout = report_layout
+        self.report_tables = report_tables
+        self.chart_renderer = chart_renderer
+        self.save_charts = save_charts
+        self.report_assets = report_assets
+        self.gzip_assets = gzip_assets
+        self.exporter = None
         self.start_time = time.time()
         
         # Resultados
         self.scan_results = None
         self.scan_summary = None
         self.analysis_results = None
+        self.analyzer = None
         self.report_path = None
+        self.report_timings = None
+    
+    def print_timings(self):
+        """Muestra el tiempo empleado por cada chequeo de análisis y fase del reporte"""
+        from instrumentation import format_timings
+        
+        check_timings = (self.analysis_results or {}).get('check_timings')
+        if check_timings:
+            print("\n⏱️  Tiempos por chequeo de análisis:")
+            for line in format_timings(check_timings, count_label='hallazgos'):
+                print(f"   {line}")
+        
+        if self.report_timings:
+            print("\n⏱️  Tiempos del reporte:")
+            for line in format_timings(self.report_timings):
+                print(f"   {line}")
     
     def print_banner(self):
         """Muestra el banner de la aplicación"""
@@ -105,7 +161,8 @@ class NetAuditBot:
             print("-" * 60)
             
             scanner = NetworkScanner(self.target)
-            self.scan_results = scanner.scan_network()
+            on_host = self.exporter.write_host if self.exporter else None
+            self.scan_results = scanner.scan_network(on_host=on_host)
             self.scan_summary = scanner.get_summary()
             
             if not self.scan_results:
@@ -123,6 +180,52 @@ class NetAuditBot:
             print(f"\n❌ Error durante el escaneo: {str(e)}")
             return False
     
+    def load_stored_run(self) -> bool:
+        """
+        Carga los resultados de escaneo de una ejecución guardada (sin Nmap)
+        
+        Returns:
+            True si la ejecución fue cargada, False en caso contrario
+        """
+        try:
+            from run_store import load_run
+            
+            print("\n📂 FASE 1: CARGA DE LA EJECUCIÓN GUARDADA")
+            print("-" * 60)
+            
+            self.scan_results, self.scan_summary = load_run(self.from_run)
+            self.run_id = os.path.splitext(os.path.basename(self.from_run))[0]
+            if not self.scan_results:
+                print(f"\n❌ La ejecución {self.run_id} no contiene hosts")
+                return False
+            
+            if self.exporter:
+                for host_ip, host_data in self.scan_results.items():
+                    self.exporter.write_host(host_ip, host_data)
+            
+            print(f"\n✅ Ejecución {self.run_id} cargada:")
+            print(f"   • Hosts: {self.scan_summary['total_hosts']}")
+            print(f"   • Fecha del escaneo: {self.scan_summary['scan_date']}")
+            
+            return True
+            
+        except (OSError, ValueError) as e:
+            print(f"\n❌ Error cargando la ejecución: {str(e)}")
+            return False
+    
+    def save_run(self):
+        """Guarda el escaneo para reanalizarlo con reglas o umbrales nuevos"""
+        try:
+            from run_store import save_run
+            
+            self.run_id = save_run(self.scan_results, self.scan_summary)
+            print(f"\n💾 Ejecución guardada: {self.run_id} "
+                  f"(reanalizar con: python netauditbot.py reanalyze --run {self.run_id})")
+            
+        except (OSError, ValueError) as e:
+            # No guardar la ejecución no invalida la auditoría
+            print(f"\n⚠️  No se pudo guardar la ejecución: {str(e)}")
+    
     def run_analysis(self) -> bool:
         """
         Ejecuta el análisis de seguridad
@@ -139,8 +242,29 @@ class NetAuditBot:
                 print("\n❌ No hay resultados de escaneo para analizar")
                 return False
             
-            analyzer = SecurityAnalyzer(self.scan_results)
-            self.analysis_results = analyzer.analyze_all()
+            rules = compile_rules(self.rule_files)
+            cve_db = CVEDatabase.open_default()
+            if cve_db:
+                print("   • Base de datos de CVEs local activada")
+            
+            cache = AnalysisCache(ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_PATH) if self.use_cache else None
+            
+            on_finding = self.exporter.write_finding if self.exporter else None
+            analyzer = self.analyzer = SecurityAnalyzer(
+                self.scan_results,
+                on_finding=on_finding,
+                rules=rules,
+                cve_db=cve_db,
+                cache=cache
+            )
+            try:
+                self.analysis_results = analyzer.analyze_all(workers=self.workers)
+            finally:
+                if cache:
+                    cache.close()
+            
+            if cache and self.verbose:
+                print(f"   • Caché de análisis: {cache.hits} hosts reutilizados, {cache.misses} analizados")
             
             # Mostrar resumen
             total_vulns = self.analysis_results['total_vulnerabilities']
@@ -158,17 +282,22 @@ class NetAuditBot:
             if high_risk > 0:
                 print(f"\n⚠️  ALERTA: Se detectaron {high_risk} vulnerabilidades de ALTO riesgo")
             
+            # Hallazgos prioritarios (riesgo, criticidad del host y exposición)
+            if self.exporter:
+                for rank, vuln in enumerate(self.analysis_results['top_findings'], 1):
+                    self.exporter.write_record('top_finding', dict(vuln, rank=rank))
+            
             # Mostrar top vulnerabilidades si está en modo verbose
             if self.verbose and total_vulns > 0:
-                print("\n📋 Top vulnerabilidades encontradas:")
-                for i, vuln in enumerate(self.analysis_results['vulnerabilities'][:5], 1):
+                print("\n📋 Top vulnerabilidades por prioridad:")
+                for i, vuln in enumerate(self.analysis_results['top_findings'], 1):
                     risk_color = {
                         'ALTO': '\033[91m',
                         'MEDIO': '\033[93m',
                         'BAJO': '\033[92m'
                     }.get(vuln['risk'], '')
                     print(f"   {i}. [{risk_color}{vuln['risk']}\033[0m] "
-                          f"{vuln['host']} - {vuln['description']}")
+                          f"{vuln['host']} - {vuln['description']} (prioridad {vuln['priority']})")
             
             return True
             
@@ -176,6 +305,67 @@ class NetAuditBot:
             print(f"\n❌ Error durante el análisis: {str(e)}")
             return False
     
+    def run_network_analytics(self) -> bool:
+        """
+        Agrega los resultados por subred y muestra las alertas de red
+        
+        Returns:
+            True si la analítica fue exitosa, False en caso contrario
+        """
+        try:
+            from network_analytics import compute_subnet_rollups
+            
+            network = compute_subnet_rollups(
+                self.scan_results,
+                self.analysis_results,
+                prefixes=(24, self.subnet_prefix),
+                host_risk_counts=self.analyzer.host_risk_counts if self.analyzer else None
+            )
+            self.analysis_results['network'] = network
+            
+            if self.exporter:
+                for rows in network['subnets'].values():
+                    for row in rows:
+                        self.exporter.write_record('subnet', row)
+                for alert in network['alerts']:
+                    self.exporter.write_record('alert', alert)
+            
+            print(f"\n🌐 Analítica de red: {network['vulnerable_hosts']}/{network['total_hosts']} "
+                  f"hosts vulnerables ({network['vulnerable_percentage']}%)")
+            for alert in network['alerts'][:5]:
+                print(f"   🚨 {alert['message']}")
+            if len(network['alerts']) > 5:
+                print(f"   ... y {len(network['alerts']) - 5} alerta(s) más")
+            
+            return True
+            
+        except Exception as e:
+            print(f"\n❌ Error en la analítica de red: {str(e)}")
+            return False
+    
+    def save_snapshot(self) -> bool:
+        """
+        Guarda los resultados de escaneo y análisis en un snapshot binario
+        
+        Returns:
+            True si el snapshot fue guardado, False en caso contrario
+        """
+        try:
+            from snapshot import write_snapshot
+            
+            write_snapshot(
+                self.snapshot_path,
+                self.scan_results,
+                self.analysis_results,
+                self.scan_summary
+            )
+            print(f"\n💾 Snapshot guardado: {self.snapshot_path}")
+            return True
+            
+        except Exception as e:
+            print(f"\n❌ Error guardando el snapshot: {str(e)}")
+            return False
+    
     def generate_report(self) -> bool:
         """
         Genera el reporte de auditoría
@@ -192,13 +382,32 @@ class NetAuditBot:
                 print("\n❌ Faltan datos para generar el reporte")
                 return False
             
+            # Importación diferida: matplotlib y Jinja2 solo se cargan en esta fase
+            from report_generator import ReportGenerator
+            
             generator = ReportGenerator(
                 self.scan_results,
                 self.analysis_results,
-                self.scan_summary
+                self.scan_summary,
+                layout=self.report_layout,
+                table_mode=self.report_tables,
+                chart_renderer=self.chart_renderer,
+                save_charts=self.save_charts,
+                use_cache=self.use_cache,
+                assets=self.report_assets,
+                gzip_assets=self.gzip_assets
             )
             
             self.report_path = generator.generate(self.generate_pdf)
+            self.report_timings = generator.timings.as_dict()
+            
+            if generator.render_cache and self.verbose:
+                stats = generator.render_cache.stats()
+                summary = "; ".join(
+                    f"{kind}: {counts['hits']} reutilizados, {counts['misses']} renderizados"
+                    for kind, counts in stats.items()
+                )
+                print(f"   • Caché de renderizado: {summary or 'sin uso'}")
             
             print(f"\n✅ Reporte generado exitosamente:")
             print(f"   📁 {self.report_path}")
@@ -218,12 +427,38 @@ class NetAuditBot:
         """
         self.print_banner()
         
-        # Fase 1: Escaneo
-        if not self.run_scan():
-            return False
+        # Exportación JSON Lines opcional (hosts y hallazgos en streaming)
+        if self.jsonl_path:
+            from jsonl_exporter import JSONLExporter
+            self.exporter = JSONLExporter(self.jsonl_path)
         
-        # Fase 2: Análisis
-        if not self.run_analysis():
+        try:
+            # Fase 1: Escaneo (o carga de una ejecución guardada)
+            if self.from_run:
+                if not self.load_stored_run():
+                    return False
+            elif not self.run_scan():
+                return False
+            
+            if self.store_run:
+                self.save_run()
+            
+            # Fase 2: Análisis
+            if not self.run_analysis():
+                return False
+            
+            # Fase 2b: Analítica por subred
+            if not self.run_network_analytics():
+                return False
+        finally:
+            if self.exporter:
+                self.exporter.close()
+        
+        if self.jsonl_path:
+            print(f"\n🧾 Exportación JSON Lines: {self.jsonl_path}")
+        
+        # Snapshot binario opcional
+        if self.snapshot_path and not self.save_snapshot():
             return False
         
         # Fase 3: Reporte
@@ -248,6 +483,8 @@ class NetAuditBot:
         print(f"📄 Reporte: {self.report_path}")
         print("=" * 60)
         
+        self.print_timings()
+        
         return True
 
 
@@ -266,6 +503,8 @@ Ejemplos de uso:
   python netauditbot.py 192.168.1.0/24
   python netauditbot.py 192.168.1.100-120
   python netauditbot.py 10.0.0.1 -v
+  python netauditbot.py import-cve nvdcve-1.1-2023.json.gz
+  python netauditbot.py reanalyze --run latest --rules reglas.json
   
 Nota: Se requiere Nmap instalado en el sistema.
         """
@@ -276,6 +515,30 @@ Nota: Se requiere Nmap instalado en el sistema.
         help='Red o rango de IPs a auditar (ej: 192.168.1.0/24)'
     )
     
+    parser.add_argument(
+        '--version',
+        action='version',
+        version=f'%(prog)s {VERSION}'
+    )
+    
+    add_analysis_arguments(parser)
+    
+    return parser.parse_args()
+
+
+def subnet_prefix_type(value: str) -> int:
+    """Tipo de argparse para --subnet-prefix: prefijo IPv4 entre 0 y 32"""
+    try:
+        prefix = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"prefijo no numérico: '{value}'")
+    if not 0 <= prefix <= 32:
+        raise argparse.ArgumentTypeError(f"el prefijo debe estar entre 0 y 32 (recibido: {prefix})")
+    return prefix
+
+
+def add_analysis_arguments(parser: argparse.ArgumentParser):
+    """Opciones de análisis y reporte comunes a la auditoría y a reanalyze"""
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -283,18 +546,275 @@ Nota: Se requiere Nmap instalado en el sistema.
     )
     
     parser.add_argument(
-        '--version',
-        action='version',
-        version=f'%(prog)s {VERSION}'
+        '--pdf',
+        action='store_true',
+        help='Generar reporte en formato PDF además de HTML'
     )
     
     parser.add_argument(
-        '--pdf',
+        '--snapshot',
+        metavar='RUTA',
+        help='Guardar los resultados en un snapshot binario compacto (.nabs)'
+    )
+    
+    parser.add_argument(
+        '--jsonl',
+        metavar='RUTA',
+        help='Exportar hosts y hallazgos en JSON Lines (comprimido si termina en .gz/.xz/.bz2)'
+    )
+    
+    parser.add_argument(
+        '--rules',
+        metavar='ARCHIVO',
+        action='append',
+        default=[],
+        help='Archivo de reglas JSON adicional (puede repetirse)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        metavar='N',
+        type=int,
+        default=ANALYSIS_WORKERS,
+        help=f'Procesos para el análisis de seguridad (0 = todos los núcleos; por defecto: {ANALYSIS_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
         action='store_true',
-        help='Generar reporte en formato PDF además de HTML'
+        help='No reutilizar hallazgos de hosts idénticos ni gráficos, tablas y páginas ya renderizados'
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        '--subnet-prefix',
+        metavar='N',
+        type=subnet_prefix_type,
+        default=SUBNET_PREFIX,
+        help=f'Prefijo de subred para la analítica de red, además de /24 (por defecto: /{SUBNET_PREFIX})'
+    )
+    
+    parser.add_argument(
+        '--report-layout',
+        choices=REPORT_LAYOUTS,
+        default=REPORT_LAYOUT,
+        help=f'Reporte HTML en un archivo (single), índice más páginas por subred (sharded) '
+             f'o según el tamaño de la red (auto, desde {REPORT_SHARD_MIN_HOSTS} hosts)'
+    )
+    
+    parser.add_argument(
+        '--report-tables',
+        choices=REPORT_TABLE_MODES,
+        default=REPORT_TABLE_MODE,
+        help='Tablas de hosts y hallazgos como HTML (html) o como tablas virtuales con '
+             'ordenación y filtro que solo dibujan las filas visibles (virtual)'
+    )
+    
+    parser.add_argument(
+        '--charts',
+        choices=CHART_RENDERERS,
+        default=CHART_RENDERER,
+        help=f'Gráficos del reporte HTML como SVG en línea (svg) o PNG de matplotlib '
+             f'(matplotlib) (por defecto: {CHART_RENDERER})'
+    )
+    
+    parser.add_argument(
+        '--save-charts',
+        action='store_true',
+        default=SAVE_CHART_IMAGES,
+        help='Guardar también los gráficos como archivos (.svg/.png) en el directorio del reporte'
+    )
+    
+    parser.add_argument(
+        '--report-assets',
+        choices=REPORT_ASSETS_MODES,
+        default=REPORT_ASSETS,
+        help=f'Gráficos y CSS/JS embebidos en cada HTML (inline) o como archivos con hash '
+             f'compartidos por los reportes en {REPORT_ASSETS_DIR} (external) (por defecto: {REPORT_ASSETS})'
+    )
+    
+    parser.add_argument(
+        '--gzip-assets',
+        action='store_true',
+        default=REPORT_ASSETS_GZIP,
+        help='Con --report-assets external, escribir también copias .gz para servirlas precomprimidas'
+    )
+
+
+def run_bot(bot: NetAuditBot, verbose: bool) -> int:
+    """
+    Ejecuta una auditoría
+    
+    Args:
+        bot: Auditoría configurada
+        verbose: Mostrar la traza completa de errores fatales
+        
+    Returns:
+        Código de salida
+    """
+    try:
+        success = bot.run()
+        
+        if success:
+            print("\n💡 Consejo: Abra el reporte HTML en su navegador para ver los resultados completos\n")
+            return 0
+        return 1
+            
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Auditoría interrumpida por el usuario")
+        return 130
+    except Exception as e:
+        print(f"\n❌ Error fatal: {str(e)}")
+        if verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def reanalyze_command(argv: list) -> int:
+    """
+    Subcomando reanalyze: analiza de nuevo una ejecución guardada con las
+    reglas y umbrales actuales y regenera los reportes, sin volver a escanear
+    
+    Args:
+        argv: Argumentos del subcomando
+        
+    Returns:
+        Código de salida
+    """
+    from run_store import list_runs
+    
+    parser = argparse.ArgumentParser(
+        prog='netauditbot.py reanalyze',
+        description='Reanaliza los resultados de escaneo guardados con las reglas actuales (sin Nmap)'
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        '--run',
+        metavar='ID',
+        help="Ejecución a reanalizar ('latest' = la más reciente, o ruta a un snapshot .nabs)"
+    )
+    source.add_argument(
+        '--list',
+        action='store_true',
+        help='Listar las ejecuciones guardadas'
+    )
+    add_analysis_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    if args.list:
+        runs = list_runs()
+        if not runs:
+            print(f"No hay ejecuciones guardadas en {RUNS_DIR}")
+            return 0
+        print(f"{'Ejecución':<20} {'Fecha del escaneo':<20} {'Hosts':>8}  Objetivo")
+        for run in runs:
+            print(f"{run['id']:<20} {run['scan_date']:<20} {run['hosts']:>8}  {run['target']}")
+        return 0
+    
+    try:
+        from run_store import resolve_run
+        from snapshot import Snapshot
+        
+        run_path = resolve_run(args.run)
+        with Snapshot(run_path) as snapshot:
+            target = (snapshot.scan_summary or {}).get('target', args.run)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ {str(e)}")
+        return 1
+    
+    bot = NetAuditBot(
+        target,
+        args.verbose,
+        args.pdf,
+        snapshot_path=args.snapshot,
+        jsonl_path=args.jsonl,
+        rule_files=args.rules,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        subnet_prefix=args.subnet_prefix,
+        from_run=run_path,
+        report_layout=args.report_layout,
+        report_tables=args.report_tables,
+        chart_renderer=args.charts,
+        save_charts=args.save_charts,
+        report_assets=args.report_assets,
+        gzip_assets=args.gzip_assets
+    )
+    return run_bot(bot, args.verbose)
+
+
+def import_cve_command(argv: list) -> int:
+    """
+    Subcomando import-cve: importa feeds JSON del NVD en la base de datos local
+    
+    Args:
+        argv: Argumentos del subcomando
+        
+    Returns:
+        Código de salida
+    """
+    from cve_database import import_feeds
+    
+    parser = argparse.ArgumentParser(
+        prog='netauditbot.py import-cve',
+        description='Importa feeds JSON del NVD (1.1 o API 2.0, opcionalmente .gz) a la base de datos local'
+    )
+    parser.add_argument('feeds', nargs='+', help='Archivos de feed del NVD')
+    parser.add_argument(
+        '--db',
+        default=CVE_DATABASE_PATH,
+        help=f'Ruta de la base de datos (por defecto: {CVE_DATABASE_PATH})'
+    )
+    args = parser.parse_args(argv)
+    
+    try:
+        totals = import_feeds(args.feeds, args.db)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\n❌ Error importando feeds: {str(e)}")
+        return 1
+    
+    print(f"\n✅ Importados {totals['cves']} CVEs ({totals['ranges']} rangos de versiones)")
+    print(f"   📁 {args.db}")
+    return 0
+
+
+def precompile_templates_command(argv: list) -> int:
+    """
+    Subcomando precompile-templates: compila las plantillas de TEMPLATES_DIR
+    en la caché de bytecode para que los reportes no tengan que compilarlas
+    
+    Args:
+        argv: Argumentos del subcomando
+        
+    Returns:
+        Código de salida
+    """
+    from template_env import precompile_templates
+    from jinja2 import TemplateError
+    
+    parser = argparse.ArgumentParser(
+        prog='netauditbot.py precompile-templates',
+        description='Compila las plantillas de reportes en la caché de bytecode'
+    )
+    parser.parse_args(argv)
+    
+    try:
+        names = precompile_templates()
+    except (OSError, TemplateError) as e:
+        print(f"\n❌ Error compilando plantillas: {str(e)}")
+        return 1
+    
+    print(f"\n✅ {len(names)} plantilla(s) compilada(s)")
+    print(f"   📁 {TEMPLATE_CACHE_DIR}")
+    return 0
+
+
+# Subcomandos disponibles además de la auditoría (python netauditbot.py <subcomando> ...)
+COMMANDS = {
+    'import-cve': import_cve_command,
+    'reanalyze': reanalyze_command,
+    'precompile-templates': precompile_templates_command,
+}
 
 
 def check_requirements():
@@ -345,6 +865,10 @@ def main():
     """
     Función principal
     """
+    # Subcomandos
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(COMMANDS[sys.argv[1]](sys.argv[2:]))
+    
     # Parsear argumentos
     args = parse_arguments()
     
@@ -358,25 +882,24 @@ def main():
         print("   Para mejores resultados, ejecutar con: sudo python netauditbot.py ...\n")
     
     # Ejecutar auditoría
-    try:
-        bot = NetAuditBot(args.target, args.verbose, args.pdf)
-        success = bot.run()
-        
-        if success:
-            print("\n💡 Consejo: Abra el reporte HTML en su navegador para ver los resultados completos\n")
-            sys.exit(0)
-        else:
-            sys.exit(1)
-            
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Auditoría interrumpida por el usuario")
-        sys.exit(130)
-    except Exception as e:
-        print(f"\n❌ Error fatal: {str(e)}")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+    bot = NetAuditBot(
+        args.target,
+        args.verbose,
+        args.pdf,
+        snapshot_path=args.snapshot,
+        jsonl_path=args.jsonl,
+        rule_files=args.rules,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        subnet_prefix=args.subnet_prefix,
+        report_layout=args.report_layout,
+        report_tables=args.report_tables,
+        chart_renderer=args.charts,
+        save_charts=args.save_charts,
+        report_assets=args.report_assets,
+        gzip_assets=args.gzip_assets
+    )
+    sys.exit(run_bot(bot, args.verbose))
 
 
 if __name__ == "__main__":
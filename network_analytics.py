@@ -0,0 +1,234 @@
+"""
+NetAuditBot - Analítica de Red
+Agrega hosts y hallazgos por subred (/24 y un prefijo configurable), calcula
+el porcentaje de hosts vulnerables y la distribución de riesgos de cada una
+y genera alertas de red según CRITICAL_VULNERABLE_PERCENTAGE
+"""
+
+import socket
+import struct
+import logging
+import ipaddress
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import *
+
+logger = logging.getLogger(__name__)
+
+RISKS = ('ALTO', 'MEDIO', 'BAJO')
+
+
+def ipv4_to_int(ip: str) -> Optional[int]:
+    """Dirección IPv4 como entero (None si no es IPv4)"""
+    try:
+        return struct.unpack('!I', socket.inet_aton(ip))[0] if ip.count('.') == 3 else None
+    except (OSError, AttributeError):
+        return None
+
+
+def _host_risk_counts(vulnerabilities: Iterable[Dict]) -> Dict[str, List[int]]:
+    """Hallazgos ALTO/MEDIO/BAJO de cada host con hallazgos"""
+    column = {risk: i for i, risk in enumerate(RISKS)}
+    counts: Dict[str, List[int]] = {}
+
+    for vuln in vulnerabilities:
+        if vuln['risk'] in column:
+            row = counts.get(vuln['host'])
+            if row is None:
+                row = counts[vuln['host']] = [0] * len(RISKS)
+            row[column[vuln['risk']]] += 1
+    return counts
+
+
+def _rollup_numpy(np, ips, risk_counts, prefix: int) -> List[Tuple]:
+    """Agregación vectorizada de hosts IPv4 por prefijo (arrays uint32 y (n, 3))"""
+    shift = 32 - prefix
+    networks = (ips >> np.uint32(shift)) if shift < 32 else np.zeros_like(ips)
+    unique, inverse = np.unique(networks, return_inverse=True)
+
+    hosts = np.bincount(inverse, minlength=len(unique))
+    vulnerable = np.bincount(inverse, weights=(risk_counts.sum(axis=1) > 0), minlength=len(unique))
+    by_risk = np.stack([
+        np.bincount(inverse, weights=risk_counts[:, column], minlength=len(unique))
+        for column in range(len(RISKS))
+    ], axis=1).astype(np.int64)
+
+    base = [int(network) << shift if shift < 32 else 0 for network in unique.tolist()]
+    return list(zip(base, hosts.tolist(), vulnerable.astype(np.int64).tolist(), by_risk.tolist()))
+
+
+def _rollup_python(addresses: List[int], counts: List[List[int]], prefix: int) -> List[Tuple]:
+    """Agregación equivalente en Python puro (sin numpy)"""
+    shift = 32 - prefix
+    mask = (0xFFFFFFFF << shift) & 0xFFFFFFFF if shift < 32 else 0
+    groups: Dict[int, List] = {}
+
+    for address, row in zip(addresses, counts):
+        group = groups.get(address & mask)
+        if group is None:
+            group = groups[address & mask] = [0, 0, [0] * len(RISKS)]
+        group[0] += 1
+        group[1] += 1 if any(row) else 0
+        for column, count in enumerate(row):
+            group[2][column] += count
+
+    return [(network, *groups[network]) for network in sorted(groups)]
+
+
+def _subnet_row(subnet: str, prefix: int, hosts: int, vulnerable: int, risk_counts: List[int]) -> Dict:
+    return {
+        'subnet': subnet,
+        'prefix': prefix,
+        'hosts': hosts,
+        'vulnerable_hosts': vulnerable,
+        'vulnerable_percentage': round(100.0 * vulnerable / hosts, 1) if hosts else 0.0,
+        'by_risk': dict(zip(RISKS, risk_counts)),
+    }
+
+
+def compute_subnet_rollups(scan_results: Dict, analysis_results: Dict,
+                           prefixes: Iterable[int] = (24, SUBNET_PREFIX),
+                           host_risk_counts: Optional[Dict[str, List[int]]] = None) -> Dict:
+    """
+    Agrega hosts y hallazgos por subred y genera alertas de red
+
+    Las direcciones IPv4 se agregan para cada prefijo en una sola pasada
+    vectorizada (numpy, con alternativa en Python puro). Los hosts que no son
+    IPv4 se agrupan por SUBNET_PREFIX_V6.
+
+    Args:
+        scan_results: Resultados del escaneo de red
+        analysis_results: Resultados de SecurityAnalyzer.analyze_all
+        prefixes: Longitudes de prefijo IPv4 a calcular
+        host_risk_counts: Conteos ALTO/MEDIO/BAJO por host ya calculados
+            (SecurityAnalyzer.host_risk_counts); si no se indican se derivan
+            de los hallazgos
+
+    Returns:
+        Diccionario con totales de la red, subredes por prefijo ('/24', ...) y alertas
+    """
+    if host_risk_counts is None:
+        host_risk_counts = _host_risk_counts(analysis_results.get('vulnerabilities', []))
+
+    # Los hosts sin hallazgos comparten una misma fila de ceros
+    hosts = list(scan_results)
+    zero = (0,) * len(RISKS)
+    counts = [host_risk_counts.get(host_ip, zero) for host_ip in hosts]
+
+    ipv4_addresses, ipv4_counts, other = [], [], []
+    for host_ip, row in zip(hosts, counts):
+        address = ipv4_to_int(host_ip)
+        if address is None:
+            other.append((host_ip, row))
+        else:
+            ipv4_addresses.append(address)
+            ipv4_counts.append(row)
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    # Con numpy los arrays se construyen una sola vez para todos los prefijos
+    if np is not None and ipv4_addresses:
+        ipv4_data = (
+            np.fromiter(ipv4_addresses, dtype=np.uint32, count=len(ipv4_addresses)),
+            np.array(ipv4_counts, dtype=np.int64).reshape(-1, len(RISKS)),
+        )
+
+    subnets: Dict[str, List[Dict]] = {}
+    for prefix in sorted(set(int(p) for p in prefixes), reverse=True):
+        if not 0 <= prefix <= 32:
+            raise ValueError(f"Prefijo de subred inválido: /{prefix}")
+
+        if not ipv4_addresses:
+            rollup = []
+        elif np is not None:
+            rollup = _rollup_numpy(np, *ipv4_data, prefix)
+        else:
+            rollup = _rollup_python(ipv4_addresses, ipv4_counts, prefix)
+
+        subnets[f"/{prefix}"] = [
+            _subnet_row(f"{ipaddress.IPv4Address(network)}/{prefix}", prefix, total, vulnerable, risk_counts)
+            for network, total, vulnerable, risk_counts in rollup
+        ]
+
+    # Hosts IPv6 (u otros identificadores): pocos en la práctica, se agrupan en Python
+    if other:
+        groups: Dict[str, List] = {}
+        for host_ip, row in other:
+            try:
+                subnet = str(ipaddress.ip_network(f"{host_ip}/{SUBNET_PREFIX_V6}", strict=False))
+            except ValueError:
+                subnet = host_ip
+            group = groups.setdefault(subnet, [0, 0, [0] * len(RISKS)])
+            group[0] += 1
+            group[1] += 1 if any(row) else 0
+            for column, count in enumerate(row):
+                group[2][column] += count
+        subnets[f"/{SUBNET_PREFIX_V6} (IPv6)"] = [
+            _subnet_row(subnet, SUBNET_PREFIX_V6, *groups[subnet]) for subnet in sorted(groups)
+        ]
+
+    vulnerable_hosts = len(hosts) - counts.count(zero)
+    network = {
+        'total_hosts': len(hosts),
+        'vulnerable_hosts': vulnerable_hosts,
+        'vulnerable_percentage': round(100.0 * vulnerable_hosts / len(hosts), 1) if hosts else 0.0,
+        'subnets': subnets,
+    }
+    network['alerts'] = build_alerts(network)
+
+    logger.info(
+        f"✓ Analítica de red: {vulnerable_hosts}/{len(hosts)} hosts vulnerables "
+        f"({network['vulnerable_percentage']}%), {len(network['alerts'])} alerta(s)"
+    )
+    return network
+
+
+def build_alerts(network: Dict) -> List[Dict]:
+    """
+    Alertas de red: la red completa o una subred supera CRITICAL_VULNERABLE_PERCENTAGE
+
+    Las subredes con menos de SUBNET_ALERT_MIN_HOSTS hosts no generan alerta
+    (un único host vulnerable no debe marcar su subred como crítica).
+
+    Args:
+        network: Resultado de compute_subnet_rollups (sin alertas)
+
+    Returns:
+        Lista de alertas ordenada por porcentaje de hosts vulnerables
+    """
+    alerts = []
+
+    if network['total_hosts'] and network['vulnerable_percentage'] >= CRITICAL_VULNERABLE_PERCENTAGE:
+        alerts.append({
+            'scope': 'red',
+            'subnet': 'Red completa',
+            'hosts': network['total_hosts'],
+            'vulnerable_hosts': network['vulnerable_hosts'],
+            'vulnerable_percentage': network['vulnerable_percentage'],
+            'message': (
+                f"El {network['vulnerable_percentage']}% de los hosts de la red tiene vulnerabilidades "
+                f"(umbral: {CRITICAL_VULNERABLE_PERCENTAGE}%)"
+            ),
+        })
+
+    subnet_alerts = []
+    for rows in network['subnets'].values():
+        for row in rows:
+            if row['hosts'] >= SUBNET_ALERT_MIN_HOSTS and \
+                    row['vulnerable_percentage'] >= CRITICAL_VULNERABLE_PERCENTAGE:
+                subnet_alerts.append({
+                    'scope': 'subred',
+                    'subnet': row['subnet'],
+                    'hosts': row['hosts'],
+                    'vulnerable_hosts': row['vulnerable_hosts'],
+                    'vulnerable_percentage': row['vulnerable_percentage'],
+                    'message': (
+                        f"Subred {row['subnet']}: {row['vulnerable_hosts']} de {row['hosts']} hosts "
+                        f"vulnerables ({row['vulnerable_percentage']}%)"
+                    ),
+                })
+
+    subnet_alerts.sort(key=lambda alert: (-alert['vulnerable_percentage'], -alert['hosts']))
+    return alerts + subnet_alerts
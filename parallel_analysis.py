@@ -0,0 +1,125 @@
+"""
+NetAuditBot - Análisis en Paralelo
+Reparte los hosts de scan_results en fragmentos contiguos que se analizan en
+un pool de procesos; los resultados se devuelven en el orden de los fragmentos
+para que la fusión sea determinista
+"""
+
+import os
+import logging
+import multiprocessing
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fragmentos por proceso: varios para repartir mejor la carga entre workers
+SHARDS_PER_WORKER = 4
+
+# Estado compartido con los workers. Con 'fork' se hereda del proceso padre
+# sin serializarse; con 'spawn' lo establece el inicializador una vez por worker.
+_worker_hosts: Optional[List[Tuple[str, Dict]]] = None
+_worker_rules = None
+_worker_cve_db = None
+_worker_cache = None
+_worker_checks = None
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Número de procesos efectivo (0 o None = todos los núcleos)"""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def _init_worker(rules, cve_db, cache, checks):
+    """Inicializador de workers cuando no se dispone de 'fork'"""
+    global _worker_rules, _worker_cve_db, _worker_cache, _worker_checks
+    _worker_rules = rules
+    _worker_cve_db = cve_db
+    _worker_cache = cache
+    _worker_checks = checks
+
+
+def _analyze_shard(task) -> Tuple[List[Dict], Dict[str, Dict], Optional[Dict]]:
+    """
+    Analiza un fragmento de hosts dentro de un worker
+
+    Args:
+        task: (inicio, fin) sobre la lista heredada, o la lista de hosts del fragmento
+
+    Returns:
+        Tupla (hallazgos del fragmento en el orden en que se generaron,
+        tiempos por chequeo, cambios de la caché de análisis o None)
+    """
+    from security_analyzer import SecurityAnalyzer
+
+    if isinstance(task, tuple):
+        start, end = task
+        hosts = _worker_hosts[start:end]
+    else:
+        hosts = task
+
+    # La priorización se hace en el proceso padre al fusionar los fragmentos
+    findings = []
+    if _worker_cache is not None:
+        _worker_cache.start_delta()
+    analyzer = SecurityAnalyzer(dict(hosts), on_finding=findings.append, rules=_worker_rules,
+                                cve_db=_worker_cve_db, cache=_worker_cache, checks=_worker_checks,
+                                top_k=0)
+    analyzer.analyze_hosts(hosts)
+    cache_delta = _worker_cache.take_delta() if _worker_cache is not None else None
+    return findings, analyzer.check_timings.as_dict(), cache_delta
+
+
+def analyze_in_pool(scan_results: Dict, workers: int, rules, cve_db=None, cache=None,
+                    checks=None) -> Iterator[Tuple[List[Dict], Dict[str, Dict], Optional[Dict]]]:
+    """
+    Analiza scan_results en un pool de procesos
+
+    Las reglas compiladas (y los hosts) se heredan mediante fork cuando el
+    sistema lo permite, de modo que cada tarea solo transporta los límites de
+    su fragmento. En otro caso las reglas viajan una sola vez por worker.
+
+    Args:
+        scan_results: Resultados del escaneo de red
+        workers: Número de procesos
+        rules: Reglas compiladas
+        cve_db: Base de datos de CVEs (opcional; reabre su conexión en cada proceso)
+        cache: Caché de análisis (opcional; cada worker usa su copia y devuelve
+            sus entradas nuevas y contadores para que el padre los incorpore)
+        checks: Chequeos a ejecutar (None = los por defecto, que cada worker descubre)
+
+    Returns:
+        Iterador con los hallazgos, tiempos y cambios de la caché de cada
+        fragmento, en orden de hosts
+    """
+    global _worker_hosts, _worker_rules, _worker_cve_db, _worker_cache, _worker_checks
+
+    hosts = list(scan_results.items())
+    shard_size = max(1, -(-len(hosts) // (workers * SHARDS_PER_WORKER)))
+    bounds = [(start, min(start + shard_size, len(hosts))) for start in range(0, len(hosts), shard_size)]
+
+    use_fork = 'fork' in multiprocessing.get_all_start_methods()
+    logger.info(
+        f"Análisis paralelo: {len(hosts)} hosts en {len(bounds)} fragmentos, "
+        f"{workers} procesos ({'fork' if use_fork else 'spawn'})"
+    )
+
+    if use_fork:
+        _worker_hosts, _worker_rules, _worker_cve_db, _worker_cache, _worker_checks = \
+            hosts, rules, cve_db, cache, checks
+        context = multiprocessing.get_context('fork')
+        pool_args = {}
+        tasks = bounds
+    else:
+        context = multiprocessing.get_context()
+        pool_args = {'initializer': _init_worker, 'initargs': (rules, cve_db, cache, checks)}
+        tasks = [hosts[start:end] for start, end in bounds]
+
+    try:
+        with context.Pool(workers, **pool_args) as pool:
+            # imap conserva el orden de las tareas: la fusión es determinista
+            for shard_results in pool.imap(_analyze_shard, tasks):
+                yield shard_results
+    finally:
+        _worker_hosts = _worker_rules = _worker_cve_db = _worker_cache = _worker_checks = None
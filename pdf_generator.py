@@ -5,6 +5,7 @@ Genera reportes en formato PDF
 
 import os
 import logging
+from io import BytesIO
 from datetime import datetime
 from typing import Dict
 from reportlab.lib import colors
@@ -14,6 +15,7 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from config import *
+from security_analyzer import aggregate_findings
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +33,7 @@ class PDFReportGenerator:
             scan_results: Resultados del escaneo
             analysis_results: Resultados del análisis de seguridad
             scan_summary: Resumen del escaneo
-            charts: Rutas de los gráficos generados
+            charts: PNG de los gráficos generados (bytes, compartidos con el reporte HTML)
         """
         self.scan_results = scan_results
         self.analysis_results = analysis_results
@@ -90,6 +92,14 @@ class PDFReportGenerator:
             borderPadding=10,
             spaceAfter=12
         ))
+        
+        # Celdas de tabla con texto largo
+        self.styles.add(ParagraphStyle(
+            name='TableCell',
+            parent=self.styles['Normal'],
+            fontSize=7,
+            leading=9
+        ))
     
     def _create_header(self, story):
         """Crea el encabezado del reporte"""
@@ -176,6 +186,47 @@ class PDFReportGenerator:
             story.append(Paragraph(alert_text, self.styles['Alert']))
         
         story.append(Spacer(1, 0.3*inch))
+        self._create_top_findings_table(story)
+    
+    def _create_top_findings_table(self, story):
+        """Crea la tabla de hallazgos prioritarios"""
+        top_findings = self.analysis_results.get('top_findings')
+        if not top_findings:
+            return
+        
+        story.append(Paragraph("Hallazgos Prioritarios", self.styles['CustomHeading']))
+        story.append(Paragraph(
+            "Ordenados por riesgo, criticidad del host (puntaje de riesgo) y exposición (puertos abiertos).",
+            self.styles['CustomBody']
+        ))
+        
+        table_data = [['#', 'Host', 'Puerto', 'Riesgo', 'Descripción', 'Prioridad']]
+        for rank, vuln in enumerate(top_findings, 1):
+            table_data.append([
+                str(rank),
+                vuln['host'],
+                str(vuln['port']),
+                vuln['risk'],
+                Paragraph(vuln['description'], self.styles['TableCell']),
+                str(vuln['priority'])
+            ])
+        
+        top_table = Table(table_data, colWidths=[0.3*inch, 1.2*inch, 0.6*inch, 0.7*inch, 3.2*inch, 0.7*inch])
+        top_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dc3545')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 7),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP')
+        ]))
+        
+        story.append(top_table)
+        story.append(Spacer(1, 0.3*inch))
     
     def _add_charts(self, story):
         """Añade los gráficos al reporte"""
@@ -187,17 +238,66 @@ class PDFReportGenerator:
         """
         story.append(Paragraph(intro_text, self.styles['CustomBody']))
         
-        for chart_name, chart_path in self.charts.items():
-            if os.path.exists(chart_path):
-                try:
-                    img = Image(chart_path, width=5*inch, height=3*inch)
-                    story.append(img)
-                    story.append(Spacer(1, 0.2*inch))
-                except Exception as e:
-                    logger.error(f"Error añadiendo gráfico {chart_name}: {e}")
+        for chart_name, chart_image in self.charts.items():
+            try:
+                img = Image(BytesIO(chart_image), width=5*inch, height=3*inch)
+                story.append(img)
+                story.append(Spacer(1, 0.2*inch))
+            except Exception as e:
+                logger.error(f"Error añadiendo gráfico {chart_name}: {e}")
         
         story.append(Spacer(1, 0.2*inch))
     
+    def _create_subnets_table(self, story):
+        """Crea la sección de análisis por subred con sus alertas"""
+        network = self.analysis_results.get('network')
+        if not network:
+            return
+        
+        story.append(PageBreak())
+        story.append(Paragraph("Análisis por Subred", self.styles['CustomHeading']))
+        
+        intro_text = f"""
+        Los hosts y hallazgos se agrupan por subred. En total, <b>{network['vulnerable_hosts']}</b> de
+        <b>{network['total_hosts']}</b> hosts ({network['vulnerable_percentage']}%) presentan al menos una vulnerabilidad.
+        Se genera una alerta cuando el porcentaje de hosts vulnerables alcanza el {CRITICAL_VULNERABLE_PERCENTAGE}%.
+        """
+        story.append(Paragraph(intro_text, self.styles['CustomBody']))
+        
+        for alert in network['alerts'][:REPORT_MAX_SUBNETS]:
+            story.append(Paragraph(f"<b>ALERTA DE RED:</b> {alert['message']}", self.styles['Alert']))
+        
+        for prefix, rows in network['subnets'].items():
+            rows = sorted(rows, key=lambda row: (-row['vulnerable_percentage'], -row['vulnerable_hosts']))
+            story.append(Paragraph(f"Subredes {prefix} ({len(rows)})", self.styles['CustomBody']))
+            
+            table_data = [['Subred', 'Hosts', 'Vulnerables', '%', 'ALTO', 'MEDIO', 'BAJO']]
+            for row in rows[:REPORT_MAX_SUBNETS]:
+                table_data.append([
+                    row['subnet'],
+                    str(row['hosts']),
+                    str(row['vulnerable_hosts']),
+                    f"{row['vulnerable_percentage']}%",
+                    str(row['by_risk']['ALTO']),
+                    str(row['by_risk']['MEDIO']),
+                    str(row['by_risk']['BAJO'])
+                ])
+            
+            subnets_table = Table(table_data, colWidths=[1.8*inch, 0.8*inch, 1.0*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch])
+            subnets_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+            ]))
+            story.append(subnets_table)
+            story.append(Spacer(1, 0.3*inch))
+    
     def _create_hosts_table(self, story):
         """Crea la tabla de hosts detectados"""
         story.append(PageBreak())
@@ -205,12 +305,14 @@ class PDFReportGenerator:
         
         intro_text = """
         La siguiente tabla enumera todos los hosts activos que se descubrieron en la red durante la fase de escaneo.
-        Para cada host, se muestra su dirección IP, nombre de host (si está disponible), sistema operativo detectado y el número total de puertos abiertos.
+        Para cada host, se muestra su dirección IP, nombre de host (si está disponible), sistema operativo detectado, el número total de puertos abiertos
+        y su nivel de riesgo según los hallazgos asociados.
         """
         story.append(Paragraph(intro_text, self.styles['CustomBody']))
         
         # Datos de la tabla
-        table_data = [['IP', 'Hostname', 'SO', 'Puertos', 'Estado']]
+        table_data = [['IP', 'Hostname', 'SO', 'Puertos', 'Riesgo', 'Estado']]
+        host_scores = self.analysis_results.get('host_scores', {})
         
         for host_ip, host_data in self.scan_results.items():
             hostname = host_data.get('hostname', 'N/A') or 'N/A'
@@ -223,16 +325,20 @@ class PDFReportGenerator:
             else:
                 estado = 'OK'
             
+            host_score = host_scores.get(host_ip)
+            riesgo = f"{host_score['level']} ({host_score['score']})" if host_score else 'N/A'
+            
             table_data.append([
                 host_ip,
                 hostname[:20],
                 os_info[:30],
                 str(ports_count),
+                riesgo,
                 estado
             ])
         
         # Crear tabla
-        hosts_table = Table(table_data, colWidths=[1.5*inch, 1.5*inch, 2*inch, 0.8*inch, 0.8*inch])
+        hosts_table = Table(table_data, colWidths=[1.3*inch, 1.3*inch, 1.7*inch, 0.7*inch, 1.0*inch, 0.8*inch])
         hosts_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -259,24 +365,30 @@ class PDFReportGenerator:
         
         intro_text = """
         Esta sección detalla las vulnerabilidades de seguridad específicas encontradas durante el análisis.
-        Cada entrada incluye el host afectado, el tipo de vulnerabilidad, el puerto asociado, el nivel de riesgo y una breve descripción
-        para facilitar su identificación y priorización.
+        Los hallazgos idénticos se agrupan por tipo, puerto, servicio y nivel de riesgo; cada entrada indica
+        cuántos hosts están afectados, una muestra de ellos y una breve descripción para facilitar su priorización.
         """
         story.append(Paragraph(intro_text, self.styles['CustomBody']))
         
-        # Datos de la tabla
-        table_data = [['Host', 'Tipo', 'Puerto', 'Riesgo', 'Descripción']]
+        aggregated = self.analysis_results.get('aggregated_findings') \
+            or aggregate_findings(self.analysis_results['vulnerabilities'])
         
-        for vuln in self.analysis_results['vulnerabilities']:
-            # Color según riesgo
-            risk = vuln['risk']
+        # Datos de la tabla
+        table_data = [['Hosts', 'Tipo', 'Puerto', 'Riesgo', 'Descripción']]
+        
+        for group in aggregated:
+            hosts = group['hosts']
+            shown = ', '.join(hosts[:3]) + (f" (+{len(hosts) - 3})" if len(hosts) > 3 else '')
+            description = group['descriptions'][0]
+            if len(group['descriptions']) > 1:
+                description += f" (+{len(group['descriptions']) - 1} variantes)"
             
             table_data.append([
-                vuln['host'],
-                vuln['type'][:20],
-                str(vuln['port']),
-                risk,
-                vuln['description'][:50]
+                Paragraph(f"<b>{len(hosts)}</b>: {shown}", self.styles['TableCell']),
+                group['type'][:20],
+                str(group['port']),
+                group['risk'],
+                Paragraph(description, self.styles['TableCell'])
             ])
         
         # Crear tabla
@@ -356,6 +468,7 @@ class PDFReportGenerator:
         self._create_header(story)
         self._create_executive_summary(story)
         self._add_charts(story)
+        self._create_subnets_table(story)
         self._create_hosts_table(story)
         self._create_vulnerabilities_table(story)
         self._create_recommendations(story)
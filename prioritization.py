@@ -0,0 +1,95 @@
+"""
+NetAuditBot - Priorización de Hallazgos
+Mantiene los K hallazgos de mayor prioridad en un montículo acotado, sin
+ordenar la lista completa de hallazgos
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+from config import *
+
+# Parte de la prioridad que aporta el riesgo del hallazgo
+_RISK_PRIORITY = {risk: weight * PRIORITY_RISK_FACTOR for risk, weight in HOST_RISK_WEIGHTS.items()}
+_MAX_RISK_PRIORITY = max(_RISK_PRIORITY.values(), default=0)
+
+
+def _host_priority(host_score: int, exposure: int) -> int:
+    """Parte de la prioridad que depende solo del host (criticidad y exposición)"""
+    return host_score + exposure * PRIORITY_EXPOSURE_FACTOR
+
+
+class TopFindings:
+    """
+    Los K hallazgos de mayor prioridad vistos hasta el momento
+
+    Es un montículo de mínimos de tamaño K: cada hallazgo cuesta una
+    comparación con el menor de los K y, si lo supera, O(log K). A igual
+    prioridad se conserva el hallazgo generado antes, de modo que el
+    resultado no depende de cómo se reparta el análisis.
+    """
+
+    def __init__(self, k: int = TOP_FINDINGS_K):
+        """
+        Args:
+            k: Número de hallazgos a conservar
+        """
+        self.k = max(0, int(k))
+        self._heap: List[Tuple[int, int, Dict, int]] = []
+        self._seen = 0
+
+    def push_host(self, findings: List[Dict], host_score: int, exposure: int):
+        """
+        Considera para el top K todos los hallazgos de un host
+
+        La prioridad de un hallazgo combina el peso de su riesgo
+        (HOST_RISK_WEIGHTS * PRIORITY_RISK_FACTOR), la criticidad del host (su
+        puntaje de riesgo) y su exposición (puertos abiertos *
+        PRIORITY_EXPOSURE_FACTOR); mayor = más urgente.
+
+        La parte de la prioridad que depende del host se calcula una vez, y si
+        ni el riesgo máximo alcanzaría al menor de los K el host se descarta
+        sin recorrer sus hallazgos.
+
+        Args:
+            findings: Hallazgos del host, en el orden en que se generaron
+            host_score: Puntaje de riesgo del host, con todos sus hallazgos
+            exposure: Puertos abiertos del host
+        """
+        if not self.k or not findings:
+            return
+
+        heap = self._heap
+        base = _host_priority(host_score, exposure)
+        if len(heap) == self.k and base + _MAX_RISK_PRIORITY <= heap[0][0]:
+            self._seen += len(findings)
+            return
+
+        # El orden de llegada desempata: -seen hace que el anterior sea "mayor"
+        for finding in findings:
+            self._seen += 1
+            priority = _RISK_PRIORITY.get(finding['risk'], 0) + base
+            if len(heap) < self.k:
+                heapq.heappush(heap, (priority, -self._seen, finding, host_score))
+            elif priority > heap[0][0]:
+                heapq.heapreplace(heap, (priority, -self._seen, finding, host_score))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def results(self, k: int = None) -> List[Dict]:
+        """
+        Hallazgos prioritarios de mayor a menor prioridad
+
+        Args:
+            k: Número máximo de hallazgos (por defecto, todos los conservados)
+
+        Returns:
+            Copias de los hallazgos con los campos 'priority' y 'host_score'
+        """
+        ranked = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        if k is not None:
+            ranked = ranked[:k]
+        return [
+            dict(finding, priority=priority, host_score=host_score)
+            for priority, _, finding, host_score in ranked
+        ]
@@ -0,0 +1,107 @@
+"""
+NetAuditBot - Buscador Multi-Patrón de Productos
+Autómata Aho-Corasick construido una sola vez con todos los alias de producto
+conocidos; cada banner de nmap (product/extrainfo) se recorre en una única
+pasada, con un coste que no depende del número de patrones
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_banner(text: str) -> str:
+    """
+    Normaliza un texto para la búsqueda por palabras completas
+
+    Ejemplo: "OpenSSH 7.4p1 (Debian)" -> " openssh 7 4p1 debian "
+    """
+    words = _NON_ALNUM.sub(' ', (text or '').lower()).split()
+    return ' ' + ' '.join(words) + ' ' if words else ''
+
+
+class ProductMatcher:
+    """
+    Autómata Aho-Corasick sobre alias de productos
+
+    Los patrones se delimitan con espacios, de modo que "iis" coincide en
+    "microsoft iis httpd" pero no en "thiis".
+    """
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        """
+        Construye el autómata
+
+        Args:
+            aliases: Producto canónico -> alias con los que puede aparecer en un banner
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        self.pattern_count = 0
+
+        for product, product_aliases in aliases.items():
+            for alias in product_aliases:
+                pattern = normalize_banner(alias)
+                if pattern:
+                    self._add(pattern, product)
+
+        self._build()
+
+    def _add(self, pattern: str, product: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        if product not in self._output[state]:
+            self._output[state].append(product)
+            self.pattern_count += 1
+
+    def _build(self):
+        """Calcula los enlaces de fallo en anchura y propaga las salidas"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                for product in self._output[self._fail[next_state]]:
+                    if product not in self._output[next_state]:
+                        self._output[next_state].append(product)
+
+    def scan(self, *texts: str) -> List[str]:
+        """
+        Busca todos los productos presentes en uno o varios textos
+
+        Args:
+            texts: Textos del banner (ej: product y extrainfo de nmap)
+
+        Returns:
+            Productos canónicos encontrados, en orden de aparición y sin repetir
+        """
+        found = []
+        goto, fail, output = self._goto, self._fail, self._output
+
+        for text in texts:
+            state = 0
+            for char in normalize_banner(text):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                for product in output[state]:
+                    if product not in found:
+                        found.append(product)
+
+        return found
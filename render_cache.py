@@ -0,0 +1,184 @@
+"""
+NetAuditBot - Caché de Renderizado
+Guarda los gráficos, tablas y páginas ya renderizados bajo el hash de sus
+datos de entrada, para reutilizarlos cuando se vuelve a generar un reporte
+con los mismos datos (reanálisis, ejecuciones programadas)
+"""
+
+import os
+import glob
+import pickle
+import hashlib
+import logging
+from collections import Counter
+from typing import Callable, Dict, Optional, TypeVar, Union
+import config
+
+logger = logging.getLogger(__name__)
+
+# Cambiar al modificar el formato de las entradas
+CACHE_FORMAT = 1
+
+# Prefijo de cada entrada: tipo del contenido guardado
+_TEXT, _BINARY = b'S', b'B'
+
+Rendered = TypeVar('Rendered', str, bytes)
+
+
+def module_version(module) -> str:
+    """Versión de un módulo o plantilla según su archivo (tamaño y fecha de modificación)"""
+    path = module if isinstance(module, str) else module.__file__
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def content_key(kind: str, *inputs) -> str:
+    """
+    Clave de una entrada: hash de su tipo y de todos sus datos de entrada
+
+    Los datos se serializan con pickle, mucho más rápido que JSON para
+    listas grandes de hallazgos. Una serialización distinta de los mismos
+    datos solo provoca un fallo de caché, nunca un acierto incorrecto.
+
+    Args:
+        kind: Tipo de entrada ('svg', 'png', 'tabla', 'página'...)
+        *inputs: Todo lo que determina el resultado (datos, opciones, versiones)
+
+    Returns:
+        Hash SHA-256 en hexadecimal
+    """
+    payload = pickle.dumps((CACHE_FORMAT, kind, inputs), protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(payload).hexdigest()
+
+
+class RenderCache:
+    """
+    Caché en disco direccionada por contenido
+
+    Cada entrada es un archivo con el hash de sus datos de entrada como
+    nombre. Es segura entre procesos (escritura atómica), de modo que los
+    workers que renderizan páginas pueden usarla directamente. Las entradas
+    se desalojan por tamaño total, empezando por las usadas hace más tiempo.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        """
+        Args:
+            directory: Directorio de la caché (por defecto RENDER_CACHE_DIR)
+            max_bytes: Tamaño máximo total (por defecto RENDER_CACHE_MAX_BYTES)
+        """
+        self.directory = directory or config.RENDER_CACHE_DIR
+        self.max_bytes = config.RENDER_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> Optional[Union[str, bytes]]:
+        """
+        Contenido guardado bajo una clave (None si no está)
+
+        Al leerla se actualiza la fecha de la entrada, que cuenta como uso
+        reciente para el desalojo.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data[1:].decode('utf-8') if data[:1] == _TEXT else data[1:]
+
+    def put(self, key: str, content: Union[str, bytes]):
+        """Guarda contenido (texto o binario) bajo una clave"""
+        path = self._path(key)
+        if isinstance(content, str):
+            data = _TEXT + content.encode('utf-8')
+        else:
+            data = _BINARY + content
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar en la caché de renderizado: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def record(self, kind: str, hit: bool):
+        """Anota un acierto o un fallo (p. ej. los ocurridos en un worker)"""
+        if hit:
+            self.hits[kind] += 1
+        else:
+            self.misses[kind] += 1
+
+    def lookup(self, kind: str, key: str) -> Optional[Union[str, bytes]]:
+        """get() que además anota el acierto o fallo"""
+        content = self.get(key)
+        self.record(kind, content is not None)
+        return content
+
+    def get_or_render(self, kind: str, inputs: tuple, render: Callable[[], Rendered]) -> Rendered:
+        """
+        Contenido en caché para unos datos de entrada, o recién renderizado
+
+        Args:
+            kind: Tipo de entrada (agrupa los contadores)
+            inputs: Todo lo que determina el resultado
+            render: Función que renderiza el contenido si no está en caché
+
+        Returns:
+            Contenido renderizado (texto o binario)
+        """
+        key = content_key(kind, *inputs)
+        content = self.lookup(kind, key)
+        if content is None:
+            content = render()
+            self.put(key, content)
+        return content
+
+    def evict(self) -> int:
+        """
+        Desaloja las entradas usadas hace más tiempo hasta no superar max_bytes
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*', '*')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Caché de renderizado: {removed} entradas desalojadas ({total / 2**20:.1f} MB)")
+        return removed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Aciertos y fallos por tipo de entrada"""
+        return {
+            kind: {'hits': self.hits[kind], 'misses': self.misses[kind]}
+            for kind in sorted(set(self.hits) | set(self.misses))
+        }
@@ -0,0 +1,109 @@
+"""
+NetAuditBot - Recursos Externos del Reporte
+Escribe los gráficos y el CSS/JS del reporte como archivos con el hash de su
+contenido en el nombre, en un directorio compartido por todos los reportes:
+el navegador los cachea y descarga en paralelo, y los reportes sucesivos
+reutilizan los que no cambian
+"""
+
+import os
+import gzip
+import hashlib
+import logging
+import textwrap
+from typing import Dict, Union
+from config import *
+from template_env import get_template
+
+logger = logging.getLogger(__name__)
+
+# Plantillas que forman el paquete CSS/JS compartido (el de las tablas
+# virtuales va siempre incluido: sin tablas en la página no hace nada)
+CSS_TEMPLATES = ("_report.css.j2", "_virtual_table.css.j2")
+JS_TEMPLATES = ("_report.js.j2", "_virtual_table.js.j2")
+
+# Tipos que se comprimen en las copias .gz (los PNG ya van comprimidos)
+GZIP_EXTENSIONS = ("css", "js", "svg")
+
+# Caracteres del hash en el nombre de cada recurso
+_HASH_LENGTH = 12
+
+
+def _bundle(templates) -> str:
+    """Contenido de varias plantillas de CSS o JS concatenadas"""
+    return "\n".join(textwrap.dedent(get_template(name).render()) for name in templates) + "\n"
+
+
+class AssetWriter:
+    """
+    Escribe recursos direccionados por contenido en REPORT_ASSETS_DIR
+
+    Un recurso con el mismo contenido tiene siempre el mismo nombre, así que
+    solo se escribe la primera vez y los reportes lo comparten.
+    """
+
+    def __init__(self, directory: str = REPORT_ASSETS_DIR, gzip_copies: bool = REPORT_ASSETS_GZIP):
+        """
+        Args:
+            directory: Directorio compartido de recursos
+            gzip_copies: Escribir también copias .gz para servirlas precomprimidas
+        """
+        self.directory = directory
+        self.gzip_copies = gzip_copies
+        self.written = 0
+        self.reused = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, name: str, content: Union[str, bytes], extension: str) -> str:
+        """
+        Guarda un recurso (si no existe ya)
+
+        Args:
+            name: Nombre base del recurso
+            content: Contenido (texto o binario)
+            extension: Extensión del archivo ('css', 'js', 'svg', 'png')
+
+        Returns:
+            Nombre del archivo, con el hash del contenido
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()[:_HASH_LENGTH]
+        filename = f"{name}.{digest}.{extension}"
+        path = os.path.join(self.directory, filename)
+
+        if os.path.exists(path):
+            self.reused += 1
+        else:
+            self._write(path, content)
+            self.written += 1
+
+        if self.gzip_copies and extension in GZIP_EXTENSIONS and not os.path.exists(path + ".gz"):
+            # mtime=0: la misma entrada produce siempre el mismo .gz
+            self._write(path + ".gz", gzip.compress(content, compresslevel=9, mtime=0))
+        return filename
+
+    @staticmethod
+    def _write(path: str, content: bytes):
+        """Escritura atómica: otro reporte nunca ve un recurso a medias"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def href(self, filename: str, from_dir: str) -> str:
+        """Ruta relativa (URL) de un recurso desde el directorio de un HTML"""
+        path = os.path.relpath(os.path.join(self.directory, filename), from_dir)
+        return path.replace(os.sep, '/')
+
+    def add_bundle(self) -> Dict[str, str]:
+        """
+        Guarda el paquete CSS/JS compartido del reporte
+
+        Returns:
+            Nombre de archivo de cada parte ('css' y 'js')
+        """
+        return {
+            'css': self.add('netauditbot', _bundle(CSS_TEMPLATES), 'css'),
+            'js': self.add('netauditbot', _bundle(JS_TEMPLATES), 'js'),
+        }
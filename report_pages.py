@@ -0,0 +1,256 @@
+"""
+NetAuditBot - Reporte HTML por Páginas
+Divide el detalle de hosts y hallazgos de redes grandes en páginas por subred
+(/24, con un máximo de REPORT_PAGE_HOSTS hosts cada una) enlazadas desde el
+índice del reporte, y las renderiza en paralelo en un pool de procesos
+"""
+
+import os
+import sys
+import ipaddress
+import logging
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
+from config import *
+from network_analytics import ipv4_to_int
+from parallel_analysis import resolve_workers
+from render_cache import RenderCache, content_key, module_version
+from report_tables import findings_table, hosts_table
+from template_env import get_template, templates_version, write_report_file
+
+logger = logging.getLogger(__name__)
+
+# Plantilla de las páginas de detalle
+PAGE_TEMPLATE = "report_page.html.j2"
+
+# Subdirectorio del reporte con las páginas de detalle
+PAGES_DIRNAME = "pages"
+
+# Las páginas se renderizan con este marcador en lugar del nombre del índice
+# (que lleva la fecha del reporte) para que la caché sirva entre reportes
+_INDEX_PLACEHOLDER = "@@NETAUDITBOT_INDEX@@"
+
+# Datos compartidos con los workers. Con 'fork' se heredan del proceso padre
+# sin serializarse; con 'spawn' los establece el inicializador una vez por worker.
+_render_context: Optional[Dict] = None
+
+
+def _subnet_groups(scan_results: Dict) -> List[Tuple[str, List[str]]]:
+    """Hosts agrupados por /24 (IPv4) o por SUBNET_PREFIX_V6, en orden de dirección"""
+    groups: Dict[Tuple, List[Tuple]] = {}
+
+    for host_ip in scan_results:
+        address = ipv4_to_int(host_ip)
+        if address is not None:
+            key = (4, address >> 8)
+            sort_key = address
+        else:
+            try:
+                network = ipaddress.ip_network(f"{host_ip}/{SUBNET_PREFIX_V6}", strict=False)
+                key = (6, int(network.network_address))
+            except ValueError:
+                key = (9, host_ip)
+            sort_key = host_ip
+        groups.setdefault(key, []).append((sort_key, host_ip))
+
+    result = []
+    for key in sorted(groups):
+        if key[0] == 4:
+            label = f"{ipaddress.IPv4Address(key[1] << 8)}/24"
+        elif key[0] == 6:
+            label = f"{ipaddress.IPv6Address(key[1])}/{SUBNET_PREFIX_V6}"
+        else:
+            label = 'Otros'
+        result.append((label, [host_ip for _, host_ip in sorted(groups[key])]))
+    return result
+
+
+def plan_pages(scan_results: Dict, page_hosts: int = REPORT_PAGE_HOSTS) -> List[Dict]:
+    """
+    Reparte los hosts en páginas de detalle por subred
+
+    Las subredes consecutivas pequeñas comparten página hasta sumar
+    page_hosts hosts; las que los superan se dividen en varias páginas.
+
+    Args:
+        scan_results: Resultados del escaneo de red
+        page_hosts: Máximo de hosts por página
+
+    Returns:
+        Lista de páginas con number, label, file y hosts (IPs de la página)
+    """
+    page_hosts = max(1, int(page_hosts))
+    pages: List[Dict] = []
+    labels: List[str] = []
+    hosts: List[str] = []
+
+    def close_page():
+        if hosts:
+            label = labels[0] if len(labels) == 1 else f"{labels[0]} – {labels[-1]}"
+            pages.append({'label': label, 'hosts': list(hosts)})
+            labels.clear()
+            hosts.clear()
+
+    for label, subnet_hosts in _subnet_groups(scan_results):
+        if len(subnet_hosts) > page_hosts:
+            close_page()
+            chunks = range(0, len(subnet_hosts), page_hosts)
+            for part, start in enumerate(chunks, 1):
+                pages.append({
+                    'label': f"{label} ({part}/{len(chunks)})",
+                    'hosts': subnet_hosts[start:start + page_hosts],
+                })
+            continue
+
+        if len(hosts) + len(subnet_hosts) > page_hosts:
+            close_page()
+        labels.append(label)
+        hosts.extend(subnet_hosts)
+    close_page()
+
+    for number, page in enumerate(pages, 1):
+        page['number'] = number
+        page['file'] = f"hosts_{number:04d}.html"
+    return pages
+
+
+def _init_worker(context: Dict):
+    """Inicializador de workers cuando no se dispone de 'fork'"""
+    global _render_context
+    _render_context = context
+
+
+def _render_page(page: Dict) -> Tuple[int, int, Optional[bool]]:
+    """
+    Renderiza una página de detalle (en un worker o en el propio proceso)
+
+    Args:
+        page: Página de plan_pages
+
+    Returns:
+        Tupla (hosts vulnerables, hallazgos, acierto de caché o None sin caché)
+    """
+    context = _render_context
+    host_scores = context['host_scores']
+    host_findings = context['host_findings']
+    scan_results = context['scan_results']
+    cache: Optional[RenderCache] = context['cache']
+
+    page_hosts = [(host_ip, scan_results[host_ip]) for host_ip in page['hosts']]
+    findings = [finding for host_ip in page['hosts'] for finding in host_findings.get(host_ip, ())]
+    page_scores = {host_ip: host_scores[host_ip] for host_ip in page['hosts'] if host_ip in host_scores}
+
+    def render() -> str:
+        tables = None
+        if context['table_mode'] == 'virtual':
+            tables = {
+                'hosts': hosts_table(page['hosts'], scan_results, page_scores),
+                'findings': findings_table(findings),
+            }
+        # Cada página tiene como mucho REPORT_PAGE_HOSTS hosts: se renderiza
+        # en memoria, más rápido que en streaming
+        return get_template(PAGE_TEMPLATE).render(
+            page=page,
+            page_hosts=page_hosts,
+            findings=findings,
+            host_scores=page_scores,
+            tables=tables,
+            **context['common'],
+            index_file=_INDEX_PLACEHOLDER
+        )
+
+    hit = None
+    if cache is None:
+        html = render()
+    else:
+        key = content_key('página', context['version'], context['common'], context['table_mode'],
+                          page, page_hosts, findings, page_scores)
+        html = cache.get(key)
+        hit = html is not None
+        if not hit:
+            html = render()
+            cache.put(key, html)
+
+    write_report_file(
+        os.path.join(context['pages_dir'], page['file']),
+        html.replace(_INDEX_PLACEHOLDER, context['index_file'])
+    )
+    vulnerable = sum(1 for host_ip in page['hosts'] if host_ip in host_findings)
+    return vulnerable, len(findings), hit
+
+
+def render_pages(pages: List[Dict], scan_results: Dict, analysis_results: Dict, common: Dict,
+                 report_dir: str, workers: int = REPORT_RENDER_WORKERS,
+                 table_mode: str = REPORT_TABLE_MODE, cache: Optional[RenderCache] = None) -> List[Dict]:
+    """
+    Renderiza las páginas de detalle, en paralelo si hay varias
+
+    Args:
+        pages: Páginas de plan_pages
+        scan_results: Resultados del escaneo de red
+        analysis_results: Resultados del análisis (hallazgos y puntajes por host)
+        common: Variables comunes a todas las páginas (título, fecha, índice...)
+        report_dir: Directorio del reporte
+        workers: Procesos a usar (0 = todos los núcleos)
+        table_mode: Tablas de las páginas ('html' o 'virtual')
+        cache: Caché de renderizado (None = renderizar todas las páginas)
+
+    Returns:
+        Páginas en orden, completadas con vulnerable_hosts, findings y href
+        (relativo al índice)
+    """
+    global _render_context
+
+    pages_dir = os.path.join(report_dir, PAGES_DIRNAME)
+    os.makedirs(pages_dir, exist_ok=True)
+
+    host_findings: Dict[str, List[Dict]] = {}
+    for finding in analysis_results.get('vulnerabilities', []):
+        host_findings.setdefault(finding['host'], []).append(finding)
+
+    common = dict(common, page_count=len(pages))
+    context = {
+        'scan_results': scan_results,
+        'host_scores': analysis_results.get('host_scores', {}),
+        'host_findings': host_findings,
+        'pages_dir': pages_dir,
+        'table_mode': table_mode,
+        'index_file': common.pop('index_file'),
+        'common': common,
+        'cache': cache,
+        # Código y plantillas con los que se renderiza: parte de la clave de caché
+        'version': (
+            module_version(sys.modules[__name__]),
+            module_version(sys.modules['report_tables']),
+            templates_version(),
+        ) if cache is not None else None,
+    }
+
+    workers = min(resolve_workers(workers), len(pages))
+    logger.info(f"Renderizando {len(pages)} páginas de detalle con {workers} proceso(s)")
+
+    try:
+        if workers <= 1:
+            _render_context = context
+            results = [_render_page(page) for page in pages]
+        else:
+            if 'fork' in multiprocessing.get_all_start_methods():
+                _render_context = context
+                pool_context, pool_args = multiprocessing.get_context('fork'), {}
+            else:
+                pool_context = multiprocessing.get_context()
+                pool_args = {'initializer': _init_worker, 'initargs': (context,)}
+            with pool_context.Pool(workers, **pool_args) as pool:
+                # map conserva el orden de las páginas
+                results = pool.map(_render_page, pages)
+    finally:
+        _render_context = None
+
+    if cache is not None:
+        for _, _, hit in results:
+            cache.record('página', hit)
+
+    return [
+        dict(page, vulnerable_hosts=vulnerable, findings=findings, href=f"{PAGES_DIRNAME}/{page['file']}")
+        for page, (vulnerable, findings, _) in zip(pages, results)
+    ]
@@ -0,0 +1,166 @@
+"""
+NetAuditBot - Tablas Virtuales del Reporte
+Serializa las tablas de hosts y hallazgos como JSON columnar compacto para
+embeberlo en el reporte HTML, donde una tabla virtual (solo se crean en el
+DOM las filas visibles) lo muestra con ordenación y filtro
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from config import *
+from network_analytics import ipv4_to_int
+
+# Clases de las insignias de estado de la tabla de hosts
+STATUS_REVIEW = "⚠️ Revisar"
+STATUS_OK = "✓ OK"
+STATUS_CLASSES = {STATUS_REVIEW: 'status-warning', STATUS_OK: 'status-ok'}
+
+
+def _ip_sort_key(host_ip: str):
+    """Clave de ordenación de direcciones (IPv4 numéricas, el resto después)"""
+    address = ipv4_to_int(host_ip)
+    return (0, address, '') if address is not None else (1, 0, host_ip)
+
+
+# Severidad de cada nivel de riesgo: las columnas de riesgo se ordenan por
+# severidad y no alfabéticamente
+_RISK_SEVERITY = {level: rank for rank, level in enumerate(
+    [level for _, level in HOST_RISK_LEVELS] + ['BAJO']
+)}
+
+
+def _risk_sort_key(risk):
+    """Clave de ordenación de niveles de riesgo (de más a menos severo)"""
+    return (_RISK_SEVERITY.get(risk, len(_RISK_SEVERITY)), str(risk))
+
+
+def _port_sort_key(port):
+    """Clave de ordenación de puertos (numéricos primero, luego texto como 'N/A')"""
+    return (0, port, '') if isinstance(port, int) else (1, 0, str(port))
+
+
+def column(label: str, values: Sequence[Any], kind: str = 'text', width: str = '1fr',
+           empty: str = 'N/A', sort_key: Optional[Callable] = None,
+           classes: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Columna de una tabla virtual
+
+    Si los valores se repiten (menos de la mitad son distintos) se guardan
+    como diccionario + códigos, lo que reduce mucho el tamaño de columnas
+    como riesgo, tipo, servicio o descripción.
+
+    Args:
+        label: Título de la columna
+        values: Valores de la columna (None = vacío)
+        kind: Presentación: 'text', 'muted', 'code', 'strong' o 'badge'
+        width: Ancho en la rejilla CSS (grid-template-columns)
+        empty: Texto de las celdas vacías
+        sort_key: Clave de ordenación si no es el propio valor (p. ej. IPs)
+        classes: Clase CSS por valor de las insignias (por defecto risk-<valor>)
+
+    Returns:
+        Columna serializable a JSON
+    """
+    spec: Dict[str, Any] = {'label': label, 'kind': kind, 'width': width, 'empty': empty}
+    if classes:
+        spec['classes'] = classes
+
+    index: Dict[Any, int] = dict.fromkeys(values)
+    if len(index) * 2 <= len(values):
+        for code, value in enumerate(index):
+            index[value] = code
+        spec['dict'] = list(index)
+        spec['codes'] = list(map(index.__getitem__, values))
+        distinct = spec['dict']
+    else:
+        spec['values'] = list(values)
+        distinct = spec['values']
+
+    # Rango de cada valor en el orden de sort_key, alineado con dict o values
+    # (valores iguales, mismo rango)
+    if sort_key is not None:
+        keys = [sort_key(value) for value in distinct]
+        order = [0] * len(distinct)
+        rank, previous = -1, None
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            if rank < 0 or keys[i] != previous:
+                rank, previous = rank + 1, keys[i]
+            order[i] = rank
+        spec['order'] = order
+    return spec
+
+
+def table_json(columns: List[Dict], rows: int) -> str:
+    """
+    JSON compacto de una tabla, seguro para embeberlo en un <script>
+
+    Args:
+        columns: Columnas creadas con column()
+        rows: Número de filas
+
+    Returns:
+        JSON de la tabla
+    """
+    payload = json.dumps({'rows': rows, 'columns': columns}, ensure_ascii=False, separators=(',', ':'))
+    # Que el JSON no pueda cerrar el <script> que lo contiene
+    return payload.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+
+def hosts_table(hosts: Iterable[str], scan_results: Dict, host_scores: Dict,
+                max_safe_ports: int = MAX_SAFE_OPEN_PORTS) -> str:
+    """
+    Tabla virtual del inventario de hosts
+
+    Args:
+        hosts: IPs de los hosts, en el orden inicial de la tabla
+        scan_results: Resultados del escaneo de red
+        host_scores: Puntaje de riesgo por host
+        max_safe_ports: Puertos abiertos a partir de los cuales se marca el host
+
+    Returns:
+        JSON de la tabla
+    """
+    hosts = list(hosts)
+    data = [scan_results[host_ip] for host_ip in hosts]
+    scores = [host_scores.get(host_ip) or {} for host_ip in hosts]
+    open_ports = [host_data.get('open_ports_count', 0) for host_data in data]
+
+    columns = [
+        column('Dirección IP', hosts, 'code', 'minmax(130px, 1fr)', sort_key=_ip_sort_key),
+        column('Hostname', [host_data.get('hostname') or None for host_data in data], width='1.2fr'),
+        column('Sistema Operativo', [host_data.get('os') or None for host_data in data],
+               width='1.2fr', empty='Desconocido'),
+        column('Puertos Abiertos', open_ports, 'strong', '0.8fr'),
+        column('Riesgo', [score.get('level') for score in scores], 'badge', '0.8fr',
+               sort_key=_risk_sort_key),
+        column('Puntaje', [score.get('score') for score in scores], 'text', '0.6fr'),
+        column('Estado de Seguridad',
+               [STATUS_REVIEW if ports > max_safe_ports else STATUS_OK for ports in open_ports],
+               'badge', '0.9fr', classes=STATUS_CLASSES),
+    ]
+    return table_json(columns, len(hosts))
+
+
+def findings_table(findings: Sequence[Dict]) -> str:
+    """
+    Tabla virtual de hallazgos, uno por fila
+
+    Args:
+        findings: Hallazgos del análisis
+
+    Returns:
+        JSON de la tabla
+    """
+    def field(name):
+        return [finding.get(name) for finding in findings]
+
+    columns = [
+        column('Host', field('host'), 'code', 'minmax(130px, 1fr)', sort_key=_ip_sort_key),
+        column('Tipo', field('type'), 'muted', '1.2fr'),
+        column('Puerto', field('port'), 'code', '0.6fr', sort_key=_port_sort_key),
+        column('Servicio', field('service'), width='0.8fr'),
+        column('Riesgo', field('risk'), 'badge', '0.7fr', sort_key=_risk_sort_key),
+        column('Descripción', field('description'), width='2fr'),
+        column('Recomendación', field('recommendation'), 'muted', '2fr'),
+    ]
+    return table_json(columns, len(findings))
@@ -0,0 +1,274 @@
+"""
+NetAuditBot - Motor de Reglas
+Compila las tablas de reglas de config.py (y archivos de reglas del usuario)
+en índices precalculados para que cada puerto se evalúe en O(1)
+"""
+
+import os
+import re
+import glob
+import json
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import config
+from analysis_checks import CHECK_RISKS
+from version_index import VersionIndex, parse_range
+from product_matcher import ProductMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECOMMENDATION = "Revisar la necesidad de este servicio y considerar alternativas seguras"
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_service(service: str) -> str:
+    """Normaliza un nombre de servicio de nmap para usarlo como clave"""
+    return (service or '').strip().lower()
+
+
+@lru_cache(maxsize=8192)
+def tokenize_product(product: str) -> Tuple[str, ...]:
+    """
+    Divide un nombre de producto en tokens normalizados
+
+    Ejemplo: "Microsoft IIS httpd" -> ('microsoft', 'iis', 'httpd')
+    """
+    return tuple(token for token in _TOKEN_SPLIT.split((product or '').lower()) if token)
+
+
+class RuleSet:
+    """
+    Conjunto de reglas compilado en índices de despacho
+
+    - port_rules: puerto -> plantilla de hallazgo de puerto vulnerable
+    - unencrypted_services: servicio normalizado -> servicio en mayúsculas
+    - product_indexes: producto -> índice de versiones vulnerables
+    - product_matcher: autómata con los nombres y alias de todos los productos
+    """
+
+    # Máximo de banners distintos cuyo resultado se recuerda
+    BANNER_CACHE_SIZE = 65536
+
+    def __init__(self, vulnerable_ports: Dict, unencrypted_services: Iterable[str],
+                 vulnerable_versions: Dict[str, List[str]], recommendations: Dict[str, str],
+                 max_safe_open_ports: int, product_aliases: Optional[Dict[str, List[str]]] = None):
+        """
+        Compila las tablas de reglas
+
+        Args:
+            vulnerable_ports: Tabla con el formato de VULNERABLE_PORTS
+            unencrypted_services: Servicios que deberían estar cifrados
+            vulnerable_versions: Tabla con el formato de VULNERABLE_VERSIONS
+            recommendations: Tabla con el formato de SECURITY_RECOMMENDATIONS
+            max_safe_open_ports: Umbral de puertos abiertos considerado seguro
+            product_aliases: Tabla con el formato de PRODUCT_ALIASES
+        """
+        self.recommendations = dict(recommendations)
+        self.max_safe_open_ports = int(max_safe_open_ports)
+
+        # Puertos vulnerables: el texto de cada hallazgo se precalcula una vez
+        self.port_rules = {}
+        for port, info in vulnerable_ports.items():
+            port = int(port)
+            self.port_rules[port] = {
+                'risk': info['risk'],
+                'service': info['service'],
+                'description': f"Puerto {port} ({info['service']}) detectado",
+                'reason': info['reason'],
+                'recommendation': self.recommendations.get(info['service'], DEFAULT_RECOMMENDATION),
+            }
+
+        self.unencrypted_services = {
+            normalize_service(service): normalize_service(service).upper()
+            for service in unencrypted_services
+        }
+
+        self.vulnerable_versions = {}
+        self.product_indexes = {}
+        for product, versions in vulnerable_versions.items():
+            key = product.lower()
+            if not tokenize_product(key):
+                continue
+            self.vulnerable_versions[key] = list(versions)
+            index = VersionIndex()
+            for spec in versions:
+                version_range = parse_range(spec)
+                index.add(version_range, version_range.label)
+            index.build()
+            self.product_indexes[key] = index
+
+        # Cada producto se busca por su nombre y por sus alias en una sola pasada
+        self.product_aliases = {
+            key: sorted({key} | {alias.lower() for alias in (product_aliases or {}).get(key, [])})
+            for key in self.product_indexes
+        }
+        self.product_matcher = ProductMatcher(self.product_aliases)
+        self._banner_cache: Dict[Tuple[str, str], List[Tuple[str, VersionIndex]]] = {}
+
+        self.digest = self._compute_digest()
+
+    def _compute_digest(self) -> str:
+        """Huella estable del conjunto de reglas (para cachés e informes)"""
+        canonical = json.dumps({
+            'ports': {str(k): v for k, v in sorted(self.port_rules.items())},
+            'unencrypted': sorted(self.unencrypted_services),
+            'versions': self.vulnerable_versions,
+            'aliases': self.product_aliases,
+            'recommendations': self.recommendations,
+            'max_safe_open_ports': self.max_safe_open_ports,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+    def port_rule(self, port: int) -> Optional[Dict]:
+        """Regla de puerto vulnerable para un número de puerto"""
+        return self.port_rules.get(port)
+
+    def unencrypted_service(self, service: str) -> Optional[str]:
+        """Servicio en mayúsculas si está en la lista de servicios sin cifrado"""
+        return self.unencrypted_services.get(normalize_service(service))
+
+    def match_products(self, product: str, extrainfo: str = '') -> List[Tuple[str, VersionIndex]]:
+        """
+        Busca las reglas de producto que aparecen en un banner de nmap
+
+        El banner se recorre una sola vez con el autómata de alias, por lo que
+        el coste no depende del número de reglas cargadas. Los banners se
+        repiten mucho entre hosts, así que el resultado se recuerda.
+
+        Args:
+            product: Nombre de producto reportado por nmap
+            extrainfo: Información adicional del banner
+
+        Returns:
+            Lista de (producto de la regla, índice de versiones vulnerables)
+        """
+        banner = (product or '', extrainfo or '')
+        matches = self._banner_cache.get(banner)
+        if matches is None:
+            matches = [
+                (key, self.product_indexes[key])
+                for key in self.product_matcher.scan(*banner)
+            ]
+            if len(self._banner_cache) >= self.BANNER_CACHE_SIZE:
+                self._banner_cache.clear()
+            self._banner_cache[banner] = matches
+        return matches
+
+
+def load_rule_file(path: str) -> Dict:
+    """
+    Carga un archivo de reglas JSON del usuario
+
+    Formato (todas las claves son opcionales):
+        {
+            "vulnerable_ports": {"8443": {"service": "...", "risk": "...", "reason": "..."}},
+            "unencrypted_services": ["ldap"],
+            "vulnerable_versions": {"vsftpd": ["2.3.4", ">=3.0,<3.0.3"]},
+            "product_aliases": {"vsftpd": ["very secure ftpd"]},
+            "recommendations": {"LDAP": "..."},
+            "max_safe_open_ports": 5
+        }
+
+    Args:
+        path: Ruta del archivo de reglas
+
+    Returns:
+        Diccionario con las reglas del archivo
+
+    Raises:
+        ValueError: Si una regla está incompleta o un rango de versiones es inválido
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+
+    if not isinstance(rules, dict):
+        raise ValueError(f"Archivo de reglas inválido (se esperaba un objeto JSON): {path}")
+
+    for port, info in rules.get('vulnerable_ports', {}).items():
+        missing = {'service', 'risk', 'reason'} - set(info)
+        if missing:
+            raise ValueError(f"Regla del puerto {port} incompleta en {path}: faltan {', '.join(sorted(missing))}")
+        # Solo los riesgos que cuenta el analizador (no 'INFO')
+        if info['risk'] not in CHECK_RISKS:
+            raise ValueError(
+                f"Nivel de riesgo desconocido '{info['risk']}' en {path} "
+                f"(válidos: {', '.join(CHECK_RISKS)})"
+            )
+
+    # Los rangos se validan al cargar para señalar el producto y la regla culpables
+    for product, specs in rules.get('vulnerable_versions', {}).items():
+        if not isinstance(specs, list):
+            raise ValueError(f"Versiones vulnerables de {product} en {path}: se esperaba una lista")
+        for spec in specs:
+            try:
+                if not isinstance(spec, (str, dict)):
+                    raise ValueError(f"tipo no admitido ({type(spec).__name__})")
+                parse_range(spec)
+            except ValueError as e:
+                raise ValueError(f"Rango de versiones inválido para {product} en {path}: {spec!r} ({e})") from e
+
+    return rules
+
+
+def discover_rule_files(directory: str = None) -> List[str]:
+    """Archivos de reglas *.json presentes en el directorio de reglas"""
+    directory = directory or config.RULES_DIR
+    return sorted(glob.glob(os.path.join(directory, '*.json')))
+
+
+def compile_rules(rule_files: Optional[Iterable[str]] = None, include_rules_dir: bool = True) -> RuleSet:
+    """
+    Compila las tablas de config.py y los archivos de reglas del usuario
+
+    Las reglas de los archivos se aplican en orden y amplían o sobrescriben
+    las de config.py.
+
+    Args:
+        rule_files: Archivos de reglas adicionales
+        include_rules_dir: Incluir los archivos de RULES_DIR
+
+    Returns:
+        Conjunto de reglas compilado
+    """
+    vulnerable_ports = dict(config.VULNERABLE_PORTS)
+    unencrypted_services = list(config.UNENCRYPTED_SERVICES)
+    vulnerable_versions = {k: list(v) for k, v in config.VULNERABLE_VERSIONS.items()}
+    recommendations = dict(config.SECURITY_RECOMMENDATIONS)
+    max_safe_open_ports = config.MAX_SAFE_OPEN_PORTS
+    product_aliases = {k: list(v) for k, v in config.PRODUCT_ALIASES.items()}
+
+    paths = (discover_rule_files() if include_rules_dir else []) + list(rule_files or [])
+    for path in paths:
+        rules = load_rule_file(path)
+        vulnerable_ports.update({int(k): v for k, v in rules.get('vulnerable_ports', {}).items()})
+        unencrypted_services.extend(rules.get('unencrypted_services', []))
+        for product, versions in rules.get('vulnerable_versions', {}).items():
+            vulnerable_versions.setdefault(product.lower(), []).extend(versions)
+        recommendations.update(rules.get('recommendations', {}))
+        for product, aliases in rules.get('product_aliases', {}).items():
+            product_aliases.setdefault(product.lower(), []).extend(aliases)
+        max_safe_open_ports = rules.get('max_safe_open_ports', max_safe_open_ports)
+        logger.info(f"Reglas cargadas desde {path}")
+
+    return RuleSet(
+        vulnerable_ports,
+        unencrypted_services,
+        vulnerable_versions,
+        recommendations,
+        max_safe_open_ports,
+        product_aliases
+    )
+
+
+_default_rules = None
+
+
+def get_default_rules() -> RuleSet:
+    """Conjunto de reglas por defecto, compilado una sola vez por proceso"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = compile_rules()
+    return _default_rules
@@ -0,0 +1,153 @@
+"""
+NetAuditBot - Almacén de Ejecuciones
+Guarda los resultados de escaneo de cada auditoría como snapshot en RUNS_DIR
+para poder reanalizarlos (reglas o umbrales nuevos) sin volver a escanear
+"""
+
+import os
+import glob
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import config
+from snapshot import Snapshot, SNAPSHOT_EXTENSION, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _run_path(run_id: str, runs_dir: str) -> str:
+    return os.path.join(runs_dir, f"{run_id}{SNAPSHOT_EXTENSION}")
+
+
+def new_run_id(runs_dir: str = None) -> str:
+    """Identificador de ejecución basado en la fecha (único dentro de RUNS_DIR)"""
+    runs_dir = runs_dir or config.RUNS_DIR
+    base = datetime.now().strftime('%Y%m%d_%H%M%S')
+    run_id, suffix = base, 1
+    while os.path.exists(_run_path(run_id, runs_dir)):
+        suffix += 1
+        run_id = f"{base}_{suffix}"
+    return run_id
+
+
+def save_run(scan_results: Dict, scan_summary: Optional[Dict] = None, run_id: str = None,
+             runs_dir: str = None) -> str:
+    """
+    Guarda los resultados de escaneo de una ejecución
+
+    Solo se guarda el escaneo: el análisis se recalcula al reanalizar. Tras
+    guardar se eliminan las ejecuciones más antiguas que MAX_STORED_RUNS.
+
+    Args:
+        scan_results: Resultados del escaneo de red
+        scan_summary: Resumen del escaneo
+        run_id: Identificador (por defecto, uno nuevo basado en la fecha)
+        runs_dir: Directorio de ejecuciones (por defecto RUNS_DIR)
+
+    Returns:
+        Identificador de la ejecución guardada
+    """
+    runs_dir = runs_dir or config.RUNS_DIR
+    run_id = run_id or new_run_id(runs_dir)
+    write_snapshot(_run_path(run_id, runs_dir), scan_results, None, scan_summary)
+    prune_runs(config.MAX_STORED_RUNS, runs_dir)
+    return run_id
+
+
+def list_runs(runs_dir: str = None) -> List[Dict]:
+    """
+    Ejecuciones guardadas, de la más reciente a la más antigua
+
+    Solo se leen las cabeceras y metadatos de cada snapshot.
+
+    Returns:
+        Lista de {id, path, target, scan_date, hosts}
+    """
+    runs_dir = runs_dir or config.RUNS_DIR
+    paths = glob.glob(os.path.join(runs_dir, f"*{SNAPSHOT_EXTENSION}"))
+    runs = []
+
+    for path in sorted(paths, key=os.path.getmtime, reverse=True):
+        try:
+            with Snapshot(path) as snapshot:
+                summary = snapshot.scan_summary or {}
+                hosts = len(snapshot)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ejecución ilegible {path}: {e}")
+            continue
+        runs.append({
+            'id': os.path.basename(path)[:-len(SNAPSHOT_EXTENSION)],
+            'path': path,
+            'target': summary.get('target', 'N/A'),
+            'scan_date': summary.get('scan_date', 'N/A'),
+            'hosts': hosts,
+        })
+    return runs
+
+
+def resolve_run(run_id: str, runs_dir: str = None) -> str:
+    """
+    Ruta del snapshot de una ejecución
+
+    Args:
+        run_id: Identificador, 'latest' (la más reciente) o ruta a un snapshot
+
+    Returns:
+        Ruta del snapshot
+
+    Raises:
+        FileNotFoundError: Si la ejecución no existe
+    """
+    runs_dir = runs_dir or config.RUNS_DIR
+
+    if run_id == 'latest':
+        runs = list_runs(runs_dir)
+        if not runs:
+            raise FileNotFoundError(f"No hay ejecuciones guardadas en {runs_dir}")
+        return runs[0]['path']
+
+    path = _run_path(run_id, runs_dir)
+    if os.path.exists(path):
+        return path
+    if os.path.isfile(run_id):
+        return run_id
+    raise FileNotFoundError(f"No existe la ejecución '{run_id}' en {runs_dir}")
+
+
+def load_run(run_id: str, runs_dir: str = None) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Carga los resultados de escaneo de una ejecución guardada
+
+    Args:
+        run_id: Identificador, 'latest' o ruta a un snapshot
+
+    Returns:
+        Tupla (scan_results, scan_summary)
+    """
+    path = resolve_run(run_id, runs_dir)
+    with Snapshot(path) as snapshot:
+        scan_results = snapshot.scan_results()
+        scan_summary = snapshot.scan_summary
+    logger.info(f"✓ Ejecución cargada: {path} ({len(scan_results)} hosts)")
+    return scan_results, scan_summary
+
+
+def prune_runs(keep: int, runs_dir: str = None) -> int:
+    """
+    Elimina las ejecuciones más antiguas
+
+    Args:
+        keep: Ejecuciones a conservar (0 = sin límite)
+
+    Returns:
+        Número de ejecuciones eliminadas
+    """
+    if not keep:
+        return 0
+    runs_dir = runs_dir or config.RUNS_DIR
+    paths = sorted(glob.glob(os.path.join(runs_dir, f"*{SNAPSHOT_EXTENSION}")), key=os.path.getmtime)
+    removed = paths[:-keep] if len(paths) > keep else []
+    for path in removed:
+        os.remove(path)
+        logger.info(f"Ejecución antigua eliminada: {path}")
+    return len(removed)
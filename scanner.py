@@ -5,7 +5,7 @@ Realiza el descubrimiento de hosts y escaneo de puertos
 
 import nmap
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from config import *
 
 # Configurar logging
@@ -136,10 +136,13 @@ class NetworkScanner:
                 'error': str(e)
             }
     
-    def scan_network(self) -> Dict[str, Dict]:
+    def scan_network(self, on_host: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
         """
         Escanea toda la red descubriendo hosts y analizándolos
         
+        Args:
+            on_host: Función opcional invocada con (ip, host_info) por cada host escaneado
+        
         Returns:
             Diccionario con todos los hosts escaneados
         """
@@ -162,6 +165,9 @@ class NetworkScanner:
             logger.info(f"\n[{idx}/{total_hosts}] Procesando host: {host}")
             host_info = self.scan_host(host)
             scan_results[host] = host_info
+            
+            if on_host:
+                on_host(host, host_info)
         
         self.scan_results = scan_results
         logger.info("=" * 60)
@@ -3,151 +3,845 @@ NetAuditBot - Módulo de Análisis de Seguridad
 Analiza los resultados del escaneo y detecta vulnerabilidades
 """
 
+import time
 import logging
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from config import *
+from rule_engine import RuleSet, get_default_rules
+from cve_database import CVEDatabase, cvss_to_risk
+from parallel_analysis import analyze_in_pool, resolve_workers
+from analysis_cache import AnalysisCache, HOST_FIELDS, host_fingerprint
+from analysis_checks import AnalysisCheck, CHECK_RISKS, SCOPE_PORT, SCOPE_HOST, SCOPE_NETWORK, discover_checks, validate_check
+from instrumentation import TimingRegistry
+from prioritization import TopFindings
 
 logger = logging.getLogger(__name__)
 
+# Tipos de hallazgo, en el orden en que se consolidan en el resumen
+TYPE_VULNERABLE_PORT = 'Puerto Vulnerable'
+TYPE_UNENCRYPTED_SERVICE = 'Servicio sin Cifrado'
+TYPE_VULNERABLE_VERSION = 'Versión Vulnerable'
+TYPE_EXCESSIVE_PORTS = 'Exceso de Puertos Abiertos'
+
+FINDING_TYPES = (
+    TYPE_VULNERABLE_PORT,
+    TYPE_UNENCRYPTED_SERVICE,
+    TYPE_VULNERABLE_VERSION,
+    TYPE_EXCESSIVE_PORTS,
+)
+
+# Etiquetas usadas en el contador by_type del resumen
+FINDING_TYPE_LABELS = {
+    TYPE_VULNERABLE_PORT: 'Puerto Vulnerable',
+    TYPE_UNENCRYPTED_SERVICE: 'Servicio sin Cifrado',
+    TYPE_VULNERABLE_VERSION: 'Versión Vulnerable',
+    TYPE_EXCESSIVE_PORTS: 'Exceso de Puertos',
+}
+
+
+# Orden de las columnas de la matriz de conteos por host
+RISK_ORDER = ('ALTO', 'MEDIO', 'BAJO')
+RISK_COLUMN = {risk: column for column, risk in enumerate(RISK_ORDER)}
+
+
+def score_to_level(score: int) -> str:
+    """Nivel de riesgo de un host a partir de su puntaje"""
+    for threshold, level in HOST_RISK_LEVELS:
+        if score >= threshold:
+            return level
+    return 'BAJO'
+
+
+def compute_risk_scores(counts: List[List[int]]) -> Tuple[List[int], List[str]]:
+    """
+    Calcula puntajes y niveles de riesgo para muchos hosts a la vez
+
+    Con numpy los puntajes son un producto matriz-vector y los niveles se
+    resuelven con una búsqueda vectorizada sobre los umbrales; sin numpy se
+    usa el cálculo equivalente en Python puro.
+
+    Args:
+        counts: Una fila por host con el número de hallazgos ALTO, MEDIO y BAJO
+
+    Returns:
+        Tupla (puntajes, niveles) en el mismo orden que las filas
+    """
+    weights = [HOST_RISK_WEIGHTS[risk] for risk in RISK_ORDER]
+
+    try:
+        import numpy as np
+    except ImportError:
+        scores = [sum(c * w for c, w in zip(row, weights)) for row in counts]
+        return scores, [score_to_level(score) for score in scores]
+
+    if not counts:
+        return [], []
+
+    scores = np.asarray(counts, dtype=np.int64).reshape(-1, len(RISK_ORDER)) @ np.asarray(weights, dtype=np.int64)
+
+    # Umbrales ascendentes: el nivel es el del último umbral alcanzado
+    thresholds = sorted(HOST_RISK_LEVELS)
+    labels = np.array(['BAJO'] + [level for _, level in thresholds], dtype=object)
+    positions = np.searchsorted([threshold for threshold, _ in thresholds], scores, side='right')
+
+    return scores.tolist(), labels[positions].tolist()
+
+
+# Campos de texto de los hallazgos que se repiten entre hosts y se comparten
+TEXT_FIELDS = ('description', 'reason', 'recommendation')
+
+
+def aggregate_findings(vulnerabilities: List[Dict]) -> List[Dict]:
+    """
+    Agrupa los hallazgos por (tipo, puerto, servicio, riesgo)
+    
+    Miles de hallazgos idénticos en hosts distintos se convierten en una sola
+    entrada con la lista de hosts afectados, para que los reportes no
+    repitan una fila por host.
+    
+    Args:
+        vulnerabilities: Lista completa de hallazgos por host
+        
+    Returns:
+        Lista de grupos ordenada por riesgo y número de hallazgos, cada uno con
+        type, port, service, risk, count, hosts, descriptions, reason y recommendation
+    """
+    # clave -> [primer hallazgo, número de hallazgos, hosts, descripciones]
+    # (los dict conservan el orden de aparición y descartan repetidos)
+    groups = {}
+    
+    for vuln in vulnerabilities:
+        key = (vuln['type'], vuln['port'], vuln['service'], vuln['risk'])
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [vuln, 0, {}, {}]
+        group[1] += 1
+        group[2][vuln['host']] = None
+        group[3][vuln['description']] = None
+    
+    aggregated = [
+        {
+            'type': first['type'],
+            'port': first['port'],
+            'service': first['service'],
+            'risk': first['risk'],
+            'count': count,
+            'hosts': list(hosts),
+            'descriptions': list(descriptions),
+            'reason': first['reason'],
+            'recommendation': first['recommendation'],
+        }
+        for first, count, hosts, descriptions in groups.values()
+    ]
+    
+    risk_rank = {risk: rank for rank, risk in enumerate(RISK_ORDER)}
+    aggregated.sort(key=lambda group: (risk_rank.get(group['risk'], len(RISK_ORDER)), -group['count']))
+    return aggregated
+
+
+# Campos que ya forman parte de la huella de la caché de análisis
+BASE_PORT_INPUTS = ('port', 'service', 'product', 'version', 'extrainfo')
+BASE_HOST_INPUTS = ('ports', 'open_ports_count')
+
+
+def _port_key(port_info: Dict) -> Tuple:
+    """Campos base de un puerto: lo único que leen los chequeos integrados"""
+    return (port_info['port'], port_info.get('service'), port_info.get('product'),
+            port_info.get('version'), port_info.get('extrainfo'))
+
+
+class BuiltinCheck(AnalysisCheck):
+    """
+    Chequeo integrado: delega en un método del analizador
+
+    En el recorrido de hosts el método se invoca directamente, sin pasar por
+    run() ni por la validación que se aplica a los plugins.
+    """
+    method: str = ''
+    
+    def run(self, analyzer, *args):
+        return getattr(analyzer, self.method)(*args)
+
+
+class VulnerablePortCheck(BuiltinCheck):
+    """Puertos conocidos por ser vulnerables (VULNERABLE_PORTS y reglas)"""
+    name = 'puertos_vulnerables'
+    scope = SCOPE_PORT
+    inputs = ('port',)
+    finding_type = TYPE_VULNERABLE_PORT
+    risk = 'ALTO'
+    method = '_check_vulnerable_port'
+
+
+class UnencryptedServiceCheck(BuiltinCheck):
+    """Servicios que transmiten datos sin cifrado"""
+    name = 'servicios_sin_cifrado'
+    scope = SCOPE_PORT
+    inputs = ('port', 'service')
+    finding_type = TYPE_UNENCRYPTED_SERVICE
+    risk = 'MEDIO'
+    method = '_check_unencrypted_service'
+
+
+class VulnerableVersionCheck(BuiltinCheck):
+    """Versiones de software vulnerables (reglas y base de datos de CVEs)"""
+    name = 'versiones_vulnerables'
+    scope = SCOPE_PORT
+    inputs = ('port', 'service', 'product', 'version', 'extrainfo')
+    finding_type = TYPE_VULNERABLE_VERSION
+    risk = 'ALTO'
+    # 2: las pre-release de una versión X.0 quedan por debajo de ella
+    # 3: el riesgo de los CVEs es el de la mayor puntuación CVSS
+    version = '3'
+    method = '_check_vulnerable_versions'
+
+
+class ExcessivePortsCheck(BuiltinCheck):
+    """Hosts con más puertos abiertos de los considerados seguros"""
+    name = 'exceso_de_puertos'
+    scope = SCOPE_HOST
+    inputs = ('open_ports_count',)
+    finding_type = TYPE_EXCESSIVE_PORTS
+    risk = 'MEDIO'
+    method = '_check_excessive_ports'
+
+
+BUILTIN_CHECKS = (VulnerablePortCheck, UnencryptedServiceCheck, VulnerableVersionCheck, ExcessivePortsCheck)
+
+_default_checks = None
+
+
+def get_default_checks() -> List[AnalysisCheck]:
+    """Chequeos integrados más los plugins de CHECKS_DIR (descubiertos una vez por proceso)"""
+    global _default_checks
+    if _default_checks is None:
+        _default_checks = [check_class() for check_class in BUILTIN_CHECKS] + discover_checks()
+    return _default_checks
+
+
+def _collect(findings: List[Dict], result):
+    """
+    Agrega a la lista el resultado de un chequeo (hallazgo, lista o None)
+    
+    Los hallazgos con un riesgo que el analizador no cuenta (p. ej. 'INFO'
+    en un plugin) se descartan con un error en el log en lugar de
+    interrumpir el análisis.
+    """
+    if not result:
+        return
+    if isinstance(result, dict):
+        result = (result,)
+    for finding in result:
+        if finding.get('risk') in CHECK_RISKS:
+            findings.append(finding)
+        else:
+            logger.error(
+                f"Hallazgo descartado: riesgo desconocido '{finding.get('risk')}' "
+                f"({finding.get('type')} en {finding.get('host')})"
+            )
+
 
 class SecurityAnalyzer:
     """
     Clase para analizar resultados de escaneo y detectar problemas de seguridad
     """
     
-    def __init__(self, scan_results: Dict):
+    def __init__(self, scan_results: Dict, on_finding: Optional[Callable[[Dict], None]] = None,
+                 rules: Optional[RuleSet] = None, cve_db: Optional[CVEDatabase] = None,
+                 cache: Optional[AnalysisCache] = None, checks: Optional[List[AnalysisCheck]] = None,
+                 top_k: int = TOP_FINDINGS_K):
         """
         Inicializa el analizador
         
         Args:
             scan_results: Resultados del escaneo de red
+            on_finding: Función opcional invocada con cada hallazgo al generarse
+            rules: Reglas compiladas (por defecto, las de config.py y RULES_DIR)
+            cve_db: Base de datos local de CVEs para las versiones detectadas (opcional)
+            cache: Caché de hallazgos por huella de host (opcional)
+            checks: Chequeos a ejecutar (por defecto, los integrados y los de CHECKS_DIR)
+            top_k: Hallazgos prioritarios a conservar (0 = no priorizar)
         """
         self.scan_results = scan_results
+        self.on_finding = on_finding
+        self.rules = rules or get_default_rules()
+        self.cve_db = cve_db
+        self.cache = cache
+        
+        self.uses_default_checks = checks is None
+        self.checks = get_default_checks() if checks is None else list(checks)
+        for check in self.checks:
+            validate_check(check)
+        self._host_checks = [check for check in self.checks if check.scope != SCOPE_NETWORK]
+        self._network_checks = [check for check in self.checks if check.scope == SCOPE_NETWORK]
+        self._port_checks = [check for check in self._host_checks if check.scope == SCOPE_PORT]
+        self._host_scope_checks = [check for check in self._host_checks if check.scope == SCOPE_HOST]
+        self._port_runs = [self._check_function(check) for check in self._port_checks]
+        self._host_runs = [self._check_function(check) for check in self._host_scope_checks]
+        # Posición de cada chequeo en los contadores (primero los de puerto)
+        self._indexed_port_runs = list(enumerate(self._port_runs))
+        self._indexed_host_runs = list(enumerate(self._host_runs, len(self._port_runs)))
+        # Si todos los chequeos de puerto son integrados, sus hallazgos solo dependen
+        # de los campos base del puerto y se reutilizan entre puertos iguales
+        self._port_memo = {} if all(
+            isinstance(check, BuiltinCheck) and set(check.inputs) <= set(BASE_PORT_INPUTS)
+            for check in self._port_checks
+        ) else None
+        self.check_timings = TimingRegistry()
+        # Mediciones por chequeo del recorrido en curso (se vuelcan en check_timings):
+        # segundos de los hosts muestreados y hallazgos de todos los hosts
+        self._sampled_seconds = [0.0] * len(self._host_checks)
+        self._check_counts = [0] * len(self._host_checks)
+        self._evaluated_hosts = 0
+        self._sampled_hosts = 0
+        # Llamadas fallidas por chequeo (plugins que lanzan excepciones)
+        self.check_errors: Counter = Counter()
+        self.top_findings = TopFindings(top_k)
+        
+        # Tipos de hallazgo: los integrados y, a continuación, los de los plugins
+        self.finding_types = list(FINDING_TYPES)
+        for check in self.checks:
+            if check.finding_type not in self.finding_types:
+                self.finding_types.append(check.finding_type)
+        
+        # Las huellas dependen de las reglas, de la base de CVEs, de los chequeos
+        # y de los campos adicionales que estos declaran leer
+        self._port_inputs = tuple(sorted({
+            field for check in self._host_checks if check.scope == SCOPE_PORT
+            for field in check.inputs if field not in BASE_PORT_INPUTS
+        }))
+        self._host_inputs = tuple(sorted({
+            field for check in self._host_checks if check.scope == SCOPE_HOST
+            for field in check.inputs if field not in BASE_HOST_INPUTS
+        }))
+        self._cache_context = (
+            f"{self.rules.digest}:{cve_db.version if cve_db else ''}:"
+            f"{','.join(f'{check.name}@{check.version}' for check in self._host_checks)}"
+        )
         self.vulnerabilities = []
+        # Índices por host que se mantienen al registrar cada hallazgo
+        self.host_findings: Dict[str, List[Dict]] = {}
+        self.host_risk_counts: Dict[str, List[int]] = {}
+        # Una sola copia de cada texto repetido (razones, recomendaciones...)
+        self._texts: Dict[str, str] = {}
         self.statistics = {
             'ALTO': 0,
             'MEDIO': 0,
             'BAJO': 0
         }
     
-    def analyze_vulnerable_ports(self) -> List[Dict]:
+    def _record(self, finding: Dict, findings: List[Dict]):
         """
-        Identifica puertos vulnerables conocidos
+        Registra un hallazgo: lo agrega a su lista, actualiza estadísticas
+        e índices por host y lo notifica al consumidor en streaming
+        """
+        texts = self._texts
+        for field in TEXT_FIELDS:
+            text = finding[field]
+            finding[field] = texts.setdefault(text, text)
         
-        Returns:
-            Lista de vulnerabilidades encontradas
+        findings.append(finding)
+        risk = finding['risk']
+        self.statistics[risk] += 1
+        
+        host_ip = finding['host']
+        self.host_findings.setdefault(host_ip, []).append(finding)
+        counts = self.host_risk_counts.get(host_ip)
+        if counts is None:
+            counts = self.host_risk_counts[host_ip] = [0] * len(RISK_ORDER)
+        counts[RISK_COLUMN[risk]] += 1
+        
+        if self.on_finding:
+            self.on_finding(finding)
+    
+    def _record_host(self, host_ip: str, findings: List[Dict], results: Dict[str, List[Dict]]):
+        """
+        Registra los hallazgos de un host (equivale a _record para cada uno)
+        
+        Los índices del host se buscan una vez por host y no por hallazgo,
+        lo que solo es posible en el recorrido fusionado.
         """
+        if not findings:
+            return
+        
+        texts = self._texts
+        statistics = self.statistics
+        on_finding = self.on_finding
+        host_list = self.host_findings.setdefault(host_ip, [])
+        counts = self.host_risk_counts.get(host_ip)
+        if counts is None:
+            counts = self.host_risk_counts[host_ip] = [0] * len(RISK_ORDER)
+        
+        for finding in findings:
+            for field in TEXT_FIELDS:
+                text = finding[field]
+                finding[field] = texts.setdefault(text, text)
+            
+            finding_list = results.get(finding['type'])
+            if finding_list is None:
+                finding_list = results[finding['type']] = []
+            finding_list.append(finding)
+            risk = finding['risk']
+            statistics[risk] += 1
+            host_list.append(finding)
+            counts[RISK_COLUMN[risk]] += 1
+            
+            if on_finding:
+                on_finding(finding)
+    
+    # ==================== CHEQUEOS POR PUERTO / HOST ====================
+    
+    def _check_vulnerable_port(self, host_ip: str, host_data: Dict, port_info: Dict) -> Optional[Dict]:
+        """Chequeo de puerto vulnerable conocido para un puerto concreto"""
+        port_num = port_info['port']
+        rule = self.rules.port_rule(port_num)
+        
+        if rule is None:
+            return None
+        
+        logger.warning(
+            f"[{rule['risk']}] {host_ip}: Puerto vulnerable {port_num} ({rule['service']})"
+        )
+        
+        return {
+            'host': host_ip,
+            'hostname': host_data.get('hostname', 'N/A'),
+            'type': TYPE_VULNERABLE_PORT,
+            'risk': rule['risk'],
+            'port': port_num,
+            'service': rule['service'],
+            'description': rule['description'],
+            'reason': rule['reason'],
+            'recommendation': rule['recommendation']
+        }
+    
+    def _check_unencrypted_service(self, host_ip: str, host_data: Dict, port_info: Dict) -> Optional[Dict]:
+        """Chequeo de servicio sin cifrado para un puerto concreto"""
+        secure_name = self.rules.unencrypted_service(port_info['service'])
+        
+        if secure_name is None:
+            return None
+        
+        service = port_info['service'].lower()
+        logger.warning(
+            f"[MEDIO] {host_ip}: Servicio sin cifrado {service} en puerto {port_info['port']}"
+        )
+        
+        return {
+            'host': host_ip,
+            'hostname': host_data.get('hostname', 'N/A'),
+            'type': TYPE_UNENCRYPTED_SERVICE,
+            'risk': 'MEDIO',
+            'port': port_info['port'],
+            'service': port_info['service'],
+            'description': f"Servicio {service} sin cifrado en puerto {port_info['port']}",
+            'reason': "Los datos transmitidos pueden ser interceptados",
+            'recommendation': f"Migrar a versión cifrada del servicio ({secure_name}S)"
+        }
+    
+    def _check_vulnerable_versions(self, host_ip: str, host_data: Dict, port_info: Dict) -> List[Dict]:
+        """Chequeo de versiones vulnerables para un puerto concreto"""
+        product = port_info.get('product', '').lower()
+        version = port_info.get('version', '')
+        
+        if not product or not version:
+            return []
+        
+        # La base de datos de CVEs, si está disponible, tiene prioridad sobre las reglas
+        if self.cve_db:
+            finding = self._check_cve_database(host_ip, host_data, port_info)
+            if finding:
+                return [finding]
+        
         findings = []
         
-        for host_ip, host_data in self.scan_results.items():
-            for port_info in host_data['ports']:
-                port_num = port_info['port']
+        # Solo se evalúan las reglas cuyos productos aparecen en el banner
+        # (product/extrainfo); cada una resuelve los rangos con una búsqueda binaria
+        matches = self.rules.match_products(product, port_info.get('extrainfo', ''))
+        for vuln_product, version_index in matches:
+            for affected_range in version_index.lookup(version):
+                findings.append({
+                    'host': host_ip,
+                    'hostname': host_data.get('hostname', 'N/A'),
+                    'type': TYPE_VULNERABLE_VERSION,
+                    'risk': 'ALTO',
+                    'port': port_info['port'],
+                    'service': port_info['service'],
+                    'description': f"{product} {version} tiene vulnerabilidades conocidas",
+                    'reason': f"La versión {version} de {product} tiene CVEs publicados",
+                    'recommendation': "Actualizar a la última versión estable del software"
+                })
                 
-                if port_num in VULNERABLE_PORTS:
-                    vuln_info = VULNERABLE_PORTS[port_num]
-                    
-                    finding = {
-                        'host': host_ip,
-                        'hostname': host_data.get('hostname', 'N/A'),
-                        'type': 'Puerto Vulnerable',
-                        'risk': vuln_info['risk'],
-                        'port': port_num,
-                        'service': vuln_info['service'],
-                        'description': f"Puerto {port_num} ({vuln_info['service']}) detectado",
-                        'reason': vuln_info['reason'],
-                        'recommendation': SECURITY_RECOMMENDATIONS.get(
-                            vuln_info['service'],
-                            "Revisar la necesidad de este servicio y considerar alternativas seguras"
-                        )
-                    }
-                    
-                    findings.append(finding)
-                    self.statistics[vuln_info['risk']] += 1
-                    
-                    logger.warning(
-                        f"[{vuln_info['risk']}] {host_ip}: Puerto vulnerable {port_num} ({vuln_info['service']})"
-                    )
-        
+                logger.warning(
+                    f"[ALTO] {host_ip}: Versión vulnerable {product} {version}"
+                )
+    
         return findings
     
-    def analyze_unencrypted_services(self) -> List[Dict]:
+    def _check_cve_database(self, host_ip: str, host_data: Dict, port_info: Dict) -> Optional[Dict]:
+        """Consulta la base de datos local de CVEs para el producto/versión de un puerto"""
+        product = port_info.get('product', '')
+        version = port_info.get('version', '')
+        cves = self.cve_db.lookup(product, version)
+        
+        if not cves:
+            return None
+        
+        # El riesgo es el del CVE más grave; sin puntuación conocida, ALTO
+        max_cvss = max((cve['cvss'] for cve in cves if cve['cvss'] is not None), default=None)
+        risk = cvss_to_risk(max_cvss)
+        cve_ids = [cve['id'] for cve in cves]
+        listed = ', '.join(cve_ids[:5]) + (f" y {len(cve_ids) - 5} más" if len(cve_ids) > 5 else '')
+        
+        logger.warning(
+            f"[{risk}] {host_ip}: {product} {version} afectado por {len(cves)} CVE(s)"
+        )
+        
+        return {
+            'host': host_ip,
+            'hostname': host_data.get('hostname', 'N/A'),
+            'type': TYPE_VULNERABLE_VERSION,
+            'risk': risk,
+            'port': port_info['port'],
+            'service': port_info['service'],
+            'description': f"{product.lower()} {version} tiene {len(cves)} CVE(s) conocidos",
+            'reason': f"CVEs publicados: {listed} (CVSS máximo: {'desconocido' if max_cvss is None else max_cvss})",
+            'recommendation': "Actualizar a la última versión estable del software",
+            'cves': cve_ids
+        }
+    
+    def _check_excessive_ports(self, host_ip: str, host_data: Dict) -> Optional[Dict]:
+        """Chequeo de exceso de puertos abiertos para un host"""
+        open_ports = host_data['open_ports_count']
+        threshold = self.rules.max_safe_open_ports
+        
+        if open_ports <= threshold:
+            return None
+        
+        logger.warning(
+            f"[MEDIO] {host_ip}: Exceso de puertos abiertos ({open_ports})"
+        )
+        
+        return {
+            'host': host_ip,
+            'hostname': host_data.get('hostname', 'N/A'),
+            'type': TYPE_EXCESSIVE_PORTS,
+            'risk': 'MEDIO',
+            'port': 'N/A',
+            'service': 'Multiple',
+            'description': f"Host expone {open_ports} puertos abiertos (umbral: {threshold})",
+            'reason': "Mayor superficie de ataque, aumenta el riesgo de compromiso",
+            'recommendation': "Cerrar puertos innecesarios y aplicar principio de mínimo privilegio"
+        }
+    
+    def _check_function(self, check: AnalysisCheck) -> Callable:
         """
-        Detecta servicios que transmiten datos sin cifrado
+        Función que ejecuta un chequeo de puerto o de host en el recorrido
+        
+        Los chequeos integrados son el método del analizador. Los plugins se
+        envuelven: sus hallazgos se validan y, si lanzan una excepción, se
+        registra el error y se omite esa llamada sin interrumpir el análisis.
+        """
+        if isinstance(check, BuiltinCheck):
+            return getattr(self, check.method)
+        
+        def run(*args) -> List[Dict]:
+            found = []
+            try:
+                _collect(found, check.run(self, *args))
+            except Exception as e:
+                if not self.check_errors[check.name]:
+                    logger.error(f"Error en el chequeo {check.name}: {e} (se omite donde falle)")
+                self.check_errors[check.name] += 1
+            return found
+        
+        return run
+    
+    def _evaluate_host(self, host_ip: str, host_data: Dict) -> List[Dict]:
+        """
+        Ejecuta los chequeos de puerto y de host sobre un host
         
+        Los puertos se recorren una sola vez, aplicando todos los chequeos de
+        puerto a cada uno, y después se aplican los chequeos de host. Los
+        hallazgos por chequeo se cuentan siempre; los tiempos solo en uno de
+        cada CHECK_TIMING_SAMPLE hosts, para no pagar dos lecturas del reloj
+        por chequeo y puerto.
+        
+        Args:
+            host_ip: IP del host
+            host_data: Información del host
+            
         Returns:
-            Lista de servicios sin cifrado encontrados
+            Hallazgos del host en el orden en que se generan (por puerto)
         """
+        timed = self._evaluated_hosts % CHECK_TIMING_SAMPLE == 0
+        self._evaluated_hosts += 1
+        if timed:
+            return self._evaluate_host_timed(host_ip, host_data)
+        
         findings = []
+        counts = self._check_counts
+        memo = self._port_memo
+        if memo is not None:
+            hostname = host_data.get('hostname', 'N/A')
+        for port_info in host_data['ports']:
+            if memo is not None:
+                entry = memo.get(_port_key(port_info))
+                if entry is None:
+                    entry = self._memoize_port(host_ip, host_data, port_info)
+                for i, template in entry:
+                    finding = {'host': host_ip, 'hostname': hostname}
+                    finding.update(template)
+                    findings.append(finding)
+                    counts[i] += 1
+                continue
+            for i, run in self._indexed_port_runs:
+                result = run(host_ip, host_data, port_info)
+                if result:
+                    if type(result) is dict:
+                        findings.append(result)
+                        counts[i] += 1
+                    else:
+                        findings.extend(result)
+                        counts[i] += len(result)
         
-        for host_ip, host_data in self.scan_results.items():
-            for port_info in host_data['ports']:
-                service = port_info['service'].lower()
-                
-                if service in UNENCRYPTED_SERVICES:
-                    finding = {
-                        'host': host_ip,
-                        'hostname': host_data.get('hostname', 'N/A'),
-                        'type': 'Servicio sin Cifrado',
-                        'risk': 'MEDIO',
-                        'port': port_info['port'],
-                        'service': port_info['service'],
-                        'description': f"Servicio {service} sin cifrado en puerto {port_info['port']}",
-                        'reason': "Los datos transmitidos pueden ser interceptados",
-                        'recommendation': f"Migrar a versión cifrada del servicio ({service.upper()}S)"
-                    }
-                    
+        for i, run in self._indexed_host_runs:
+            result = run(host_ip, host_data)
+            if result:
+                if type(result) is dict:
+                    findings.append(result)
+                    counts[i] += 1
+                else:
+                    findings.extend(result)
+                    counts[i] += len(result)
+        
+        return findings
+    
+    def _evaluate_host_timed(self, host_ip: str, host_data: Dict) -> List[Dict]:
+        """_evaluate_host midiendo además el tiempo de cada chequeo"""
+        findings = []
+        counts = self._check_counts
+        seconds = self._sampled_seconds
+        perf_counter = time.perf_counter
+        runs = self._port_runs
+        memo = self._port_memo
+        self._sampled_hosts += 1
+        
+        for port_info in host_data['ports']:
+            if memo is not None:
+                entry = memo.get(_port_key(port_info))
+                if entry is None:
+                    entry = self._memoize_port(host_ip, host_data, port_info, seconds)
+                for i, template in entry:
+                    finding = {'host': host_ip, 'hostname': host_data.get('hostname', 'N/A')}
+                    finding.update(template)
                     findings.append(finding)
-                    self.statistics['MEDIO'] += 1
-                    
-                    logger.warning(
-                        f"[MEDIO] {host_ip}: Servicio sin cifrado {service} en puerto {port_info['port']}"
-                    )
+                    counts[i] += 1
+                continue
+            start = perf_counter()
+            for i, run in enumerate(runs):
+                before = len(findings)
+                _collect(findings, run(host_ip, host_data, port_info))
+                end = perf_counter()
+                seconds[i] += end - start
+                counts[i] += len(findings) - before
+                start = end
+        
+        for i, run in enumerate(self._host_runs, len(runs)):
+            start = perf_counter()
+            before = len(findings)
+            _collect(findings, run(host_ip, host_data))
+            seconds[i] += perf_counter() - start
+            counts[i] += len(findings) - before
         
         return findings
     
-    def analyze_vulnerable_versions(self) -> List[Dict]:
+    def _memoize_port(self, host_ip: str, host_data: Dict, port_info: Dict,
+                      seconds: Optional[List[float]] = None) -> List[Tuple[int, Dict]]:
         """
-        Detecta versiones de software conocidas por ser vulnerables
+        Ejecuta los chequeos integrados de un puerto y memoiza sus hallazgos
         
+        Los hallazgos se guardan sin los campos del host, igual que en la caché
+        de análisis; los puertos posteriores con los mismos campos base los
+        reutilizan sin volver a ejecutar los chequeos (ni repetir sus avisos).
+        
+        Args:
+            host_ip: IP del host
+            host_data: Información del host
+            port_info: Información del puerto
+            seconds: Acumuladores de tiempo por chequeo, si el host se mide
+            
         Returns:
-            Lista de versiones vulnerables encontradas
+            Pares (posición del chequeo, hallazgo sin campos del host)
+        """
+        entry = []
+        perf_counter = time.perf_counter
+        for i, run in self._indexed_port_runs:
+            start = perf_counter()
+            result = run(host_ip, host_data, port_info)
+            if seconds is not None:
+                seconds[i] += perf_counter() - start
+            if not result:
+                continue
+            for finding in ([result] if type(result) is dict else result):
+                entry.append((i, {key: value for key, value in finding.items() if key not in HOST_FIELDS}))
+        
+        if len(self._port_memo) >= PORT_MEMO_SIZE:
+            self._port_memo.clear()
+        self._port_memo[_port_key(port_info)] = entry
+        return entry
+    
+    def _flush_check_timings(self):
+        """
+        Vuelca en check_timings las mediciones del recorrido de hosts
+        
+        El tiempo de los hosts muestreados se extrapola a todos los hosts
+        evaluados; las llamadas y los hallazgos son exactos.
+        """
+        if not self._evaluated_hosts:
+            return
+        scale = self._evaluated_hosts / max(1, self._sampled_hosts)
+        checks = self._port_checks + self._host_scope_checks
+        position = {check.name: i for i, check in enumerate(checks)}
+        for check in self._host_checks:
+            i = position[check.name]
+            self.check_timings.add(
+                check.name, self._sampled_seconds[i] * scale, self._evaluated_hosts, self._check_counts[i]
+            )
+        
+        self._sampled_seconds = [0.0] * len(checks)
+        self._check_counts = [0] * len(checks)
+        self._evaluated_hosts = 0
+        self._sampled_hosts = 0
+    
+    def _run_network_checks(self, results: Dict[str, List[Dict]]):
+        """
+        Ejecuta los chequeos de red en paralelo y registra sus hallazgos
+        
+        Los chequeos de red son independientes entre sí: reciben los hallazgos
+        por host ya calculados y solo devuelven hallazgos nuevos, que se
+        registran en el orden de los chequeos para que el resultado sea
+        determinista.
+        """
+        if not self._network_checks:
+            return
+        
+        host_findings = [finding for findings in results.values() for finding in findings]
+        
+        def run_check(check):
+            start = time.perf_counter()
+            found = []
+            try:
+                _collect(found, check.run(self, self.scan_results, host_findings))
+            except Exception as e:
+                logger.error(f"Error en el chequeo de red {check.name}: {e}")
+            return found, time.perf_counter() - start
+        
+        if len(self._network_checks) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(self._network_checks), NETWORK_CHECK_THREADS)) as executor:
+                outputs = list(executor.map(run_check, self._network_checks))
+        else:
+            outputs = [run_check(self._network_checks[0])]
+        
+        for check, (found, elapsed) in zip(self._network_checks, outputs):
+            self.check_timings.add(check.name, elapsed, 1, len(found))
+            for finding in found:
+                self._record(finding, results.setdefault(finding['type'], []))
+    
+    def _analyze_host(self, host_ip: str, host_data: Dict, results: Dict[str, List[Dict]]):
+        """
+        Analiza un host y registra sus hallazgos
+        
+        Con caché, los hosts con la misma huella reutilizan los hallazgos ya
+        calculados y solo se completan la IP y el hostname.
+        
+        Args:
+            host_ip: IP del host
+            host_data: Información del host
+            results: Listas de hallazgos por tipo donde se acumulan los resultados
         """
+        if self.cache is None:
+            findings = self._evaluate_host(host_ip, host_data)
+        else:
+            fingerprint = host_fingerprint(host_data, self._cache_context, self._port_inputs, self._host_inputs)
+            templates = self.cache.get(fingerprint)
+            if templates is None:
+                errors = sum(self.check_errors.values())
+                findings = self._evaluate_host(host_ip, host_data)
+                # Un host en el que falló algún plugin no se memoiza incompleto
+                if sum(self.check_errors.values()) == errors:
+                    self.cache.put(fingerprint, findings)
+            else:
+                hostname = host_data.get('hostname', 'N/A')
+                findings = []
+                for template in templates:
+                    finding = {'host': host_ip, 'hostname': hostname}
+                    finding.update(template)
+                    findings.append(finding)
+        
+        self._record_host(host_ip, findings, results)
+    
+    def _rank_findings(self):
+        """
+        Considera para el top K los hallazgos registrados, host por host
+        
+        Se invoca cuando ya se ejecutaron los chequeos de red, de modo que
+        todos los hallazgos de un host se priorizan con su puntaje de riesgo
+        (criticidad) definitivo.
+        """
+        if not self.top_findings.k:
+            return
+        
+        for host_ip, findings in self.host_findings.items():
+            score = self.get_host_risk_score(host_ip)[0]
+            exposure = self.scan_results.get(host_ip, {}).get('open_ports_count', 0)
+            self.top_findings.push_host(findings, score, exposure)
+    
+    # ==================== ANÁLISIS INDIVIDUALES ====================
+    
+    def _analyze_ports_with(self, check) -> List[Dict]:
+        """Aplica un chequeo por puerto a todos los hosts"""
         findings = []
         
         for host_ip, host_data in self.scan_results.items():
             for port_info in host_data['ports']:
-                product = port_info.get('product', '').lower()
-                version = port_info.get('version', '')
-                
-                if not product or not version:
-                    continue
-                
-                # Buscar coincidencias en versiones vulnerables
-                for vuln_product, vuln_versions in VULNERABLE_VERSIONS.items():
-                    if vuln_product in product:
-                        for vuln_version in vuln_versions:
-                            if vuln_version in version:
-                                finding = {
-                                    'host': host_ip,
-                                    'hostname': host_data.get('hostname', 'N/A'),
-                                    'type': 'Versión Vulnerable',
-                                    'risk': 'ALTO',
-                                    'port': port_info['port'],
-                                    'service': port_info['service'],
-                                    'description': f"{product} {version} tiene vulnerabilidades conocidas",
-                                    'reason': f"La versión {version} de {product} tiene CVEs publicados",
-                                    'recommendation': "Actualizar a la última versión estable del software"
-                                }
-                                
-                                findings.append(finding)
-                                self.statistics['ALTO'] += 1
-                                
-                                logger.warning(
-                                    f"[ALTO] {host_ip}: Versión vulnerable {product} {version}"
-                                )
+                result = check(host_ip, host_data, port_info)
+                if isinstance(result, dict):
+                    result = [result]
+                for finding in result or []:
+                    self._record(finding, findings)
         
         return findings
     
+    def analyze_vulnerable_ports(self) -> List[Dict]:
+        """
+        Identifica puertos vulnerables conocidos
+        
+        Returns:
+            Lista de vulnerabilidades encontradas
+        """
+        return self._analyze_ports_with(self._check_vulnerable_port)
+    
+    def analyze_unencrypted_services(self) -> List[Dict]:
+        """
+        Detecta servicios que transmiten datos sin cifrado
+        
+        Returns:
+            Lista de servicios sin cifrado encontrados
+        """
+        return self._analyze_ports_with(self._check_unencrypted_service)
+    
+    def analyze_vulnerable_versions(self) -> List[Dict]:
+        """
+        Detecta versiones de software conocidas por ser vulnerables
+        
+        Returns:
+            Lista de versiones vulnerables encontradas
+        """
+        return self._analyze_ports_with(self._check_vulnerable_versions)
+    
     def analyze_excessive_ports(self) -> List[Dict]:
         """
         Detecta hosts con demasiados puertos abiertos
@@ -158,33 +852,61 @@ class SecurityAnalyzer:
         findings = []
         
         for host_ip, host_data in self.scan_results.items():
-            open_ports = host_data['open_ports_count']
-            
-            if open_ports > MAX_SAFE_OPEN_PORTS:
-                finding = {
-                    'host': host_ip,
-                    'hostname': host_data.get('hostname', 'N/A'),
-                    'type': 'Exceso de Puertos Abiertos',
-                    'risk': 'MEDIO',
-                    'port': 'N/A',
-                    'service': 'Multiple',
-                    'description': f"Host expone {open_ports} puertos abiertos (umbral: {MAX_SAFE_OPEN_PORTS})",
-                    'reason': "Mayor superficie de ataque, aumenta el riesgo de compromiso",
-                    'recommendation': "Cerrar puertos innecesarios y aplicar principio de mínimo privilegio"
-                }
-                
-                findings.append(finding)
-                self.statistics['MEDIO'] += 1
-                
-                logger.warning(
-                    f"[MEDIO] {host_ip}: Exceso de puertos abiertos ({open_ports})"
-                )
+            finding = self._check_excessive_ports(host_ip, host_data)
+            if finding:
+                self._record(finding, findings)
         
         return findings
     
-    def analyze_all(self) -> Dict:
+    def analyze_hosts(self, hosts: Iterable[Tuple[str, Dict]]) -> Dict[str, List[Dict]]:
+        """
+        Recorrido fusionado de hosts y puertos
+        
+        Args:
+            hosts: Pares (IP, datos del host) a analizar
+            
+        Returns:
+            Hallazgos agrupados por tipo
+        """
+        results = {finding_type: [] for finding_type in self.finding_types}
+        for host_ip, host_data in hosts:
+            self._analyze_host(host_ip, host_data, results)
+        self._flush_check_timings()
+        return results
+    
+    def _analyze_parallel(self, workers: int) -> Dict[str, List[Dict]]:
+        """
+        Analiza los hosts en un pool de procesos y fusiona los fragmentos
+        
+        Los fragmentos llegan en orden de hosts y cada hallazgo se registra
+        aquí, de modo que estadísticas, índices por host y consumidores en
+        streaming ven exactamente lo mismo que en el recorrido secuencial.
+        Las entradas nuevas y los contadores de la caché de cada worker se
+        incorporan a la caché del analizador, que es la que se persiste.
+        """
+        results = {finding_type: [] for finding_type in self.finding_types}
+        checks = None if self.uses_default_checks else self.checks
+        shards = analyze_in_pool(self.scan_results, workers, self.rules, self.cve_db, self.cache, checks)
+        for shard_findings, shard_timings, cache_delta in shards:
+            self.check_timings.merge(shard_timings)
+            if cache_delta is not None:
+                self.cache.merge_delta(cache_delta)
+            for finding in shard_findings:
+                self._record(finding, results.setdefault(finding['type'], []))
+        return results
+    
+    def analyze_all(self, workers: int = 1) -> Dict:
         """
-        Ejecuta todos los análisis de seguridad
+        Ejecuta todos los análisis de seguridad en una única pasada
+        
+        Cada host se visita una sola vez y desde ese recorrido se despachan
+        los chequeos de puerto y de host; después se ejecutan los chequeos de
+        red. Los hallazgos se agrupan por tipo en el mismo orden que
+        producirían los análisis individuales.
+        
+        Args:
+            workers: Procesos a usar (1 = secuencial; 0 = todos los núcleos).
+                Con pocos hosts se analiza siempre de forma secuencial.
         
         Returns:
             Diccionario completo con todas las vulnerabilidades
@@ -193,19 +915,23 @@ class SecurityAnalyzer:
         logger.info("INICIANDO ANÁLISIS DE SEGURIDAD")
         logger.info("=" * 60)
         
-        # Ejecutar todos los análisis
-        vuln_ports = self.analyze_vulnerable_ports()
-        unenc_services = self.analyze_unencrypted_services()
-        vuln_versions = self.analyze_vulnerable_versions()
-        excessive_ports = self.analyze_excessive_ports()
+        workers = resolve_workers(workers)
+        
+        if workers > 1 and len(self.scan_results) >= PARALLEL_MIN_HOSTS:
+            results = self._analyze_parallel(workers)
+        else:
+            results = self.analyze_hosts(self.scan_results.items())
+        
+        self._run_network_checks(results)
+        self._rank_findings()
+        
+        for check_name, errors in self.check_errors.items():
+            logger.warning(f"⚠️  El chequeo {check_name} falló en {errors} llamadas; sus hallazgos están incompletos")
         
         # Consolidar todas las vulnerabilidades
-        all_vulnerabilities = (
-            vuln_ports + 
-            unenc_services + 
-            vuln_versions + 
-            excessive_ports
-        )
+        all_vulnerabilities = []
+        for findings in results.values():
+            all_vulnerabilities.extend(findings)
         
         self.vulnerabilities = all_vulnerabilities
         
@@ -218,11 +944,13 @@ class SecurityAnalyzer:
                 'BAJO': self.statistics['BAJO']
             },
             'by_type': {
-                'Puerto Vulnerable': len(vuln_ports),
-                'Servicio sin Cifrado': len(unenc_services),
-                'Versión Vulnerable': len(vuln_versions),
-                'Exceso de Puertos': len(excessive_ports)
+                FINDING_TYPE_LABELS.get(finding_type, finding_type): len(findings)
+                for finding_type, findings in results.items()
             },
+            'host_scores': self.get_all_host_risk_scores(),
+            'aggregated_findings': aggregate_findings(all_vulnerabilities),
+            'top_findings': self.get_top_findings(),
+            'check_timings': self.check_timings.as_dict(),
             'vulnerabilities': all_vulnerabilities
         }
         
@@ -235,6 +963,22 @@ class SecurityAnalyzer:
         
         return analysis_summary
     
+    def get_top_findings(self, k: Optional[int] = None) -> List[Dict]:
+        """
+        Hallazgos de mayor prioridad (riesgo, criticidad del host y exposición)
+        
+        Args:
+            k: Número máximo de hallazgos (por defecto, los top_k conservados)
+            
+        Returns:
+            Hallazgos de mayor a menor prioridad, con 'priority' y 'host_score'
+        """
+        return self.top_findings.results(k)
+    
+    def get_host_findings(self, host_ip: str) -> List[Dict]:
+        """Hallazgos registrados para un host"""
+        return self.host_findings.get(host_ip, [])
+    
     def get_host_risk_score(self, host_ip: str) -> tuple:
         """
         Calcula el puntaje de riesgo para un host específico
@@ -245,27 +989,26 @@ class SecurityAnalyzer:
         Returns:
             Tupla (score, risk_level)
         """
-        score = 0
-        host_vulns = [v for v in self.vulnerabilities if v['host'] == host_ip]
-        
-        for vuln in host_vulns:
-            if vuln['risk'] == 'ALTO':
-                score += 10
-            elif vuln['risk'] == 'MEDIO':
-                score += 5
-            elif vuln['risk'] == 'BAJO':
-                score += 2
-        
-        if score >= 20:
-            risk_level = 'CRÍTICO'
-        elif score >= 10:
-            risk_level = 'ALTO'
-        elif score >= 5:
-            risk_level = 'MEDIO'
-        else:
-            risk_level = 'BAJO'
+        counts = self.host_risk_counts.get(host_ip, (0,) * len(RISK_ORDER))
+        score = sum(count * HOST_RISK_WEIGHTS[risk] for risk, count in zip(RISK_ORDER, counts))
+        return score, score_to_level(score)
+    
+    def get_all_host_risk_scores(self) -> Dict[str, Dict]:
+        """
+        Calcula el puntaje y nivel de riesgo de todos los hosts escaneados a la vez
         
-        return score, risk_level
+        Returns:
+            Diccionario IP -> {'score': puntaje, 'level': nivel}
+        """
+        hosts = list(self.scan_results)
+        zero = [0] * len(RISK_ORDER)
+        counts = [self.host_risk_counts.get(host_ip, zero) for host_ip in hosts]
+        scores, levels = compute_risk_scores(counts)
+        
+        return {
+            host_ip: {'score': score, 'level': level}
+            for host_ip, score, level in zip(hosts, scores, levels)
+        }
 
 
 def test_analyzer():
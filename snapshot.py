@@ -0,0 +1,611 @@
+"""
+NetAuditBot - Módulo de Snapshots Binarios
+Serializa los resultados de escaneo y análisis en un formato binario compacto
+que puede abrirse con mmap sin cargar el archivo completo en memoria
+"""
+
+import os
+import io
+import json
+import mmap
+import bisect
+import struct
+import logging
+import ipaddress
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ==================== FORMATO ====================
+# Cabecera: magic, versión, contadores y un índice de secciones (offset, longitud)
+SNAPSHOT_MAGIC = b"NABSNAP\x00"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_EXTENSION = ".nabs"
+
+# La versión 1 no tenía las secciones de ancho fijo del análisis (todo iba en meta)
+_SECTIONS = (
+    "string_offsets", "string_data", "hosts", "ports", "findings", "ip_index", "meta",
+    "host_scores", "top_findings", "check_timings"
+)
+_VERSION_SECTIONS = {1: _SECTIONS[:7], 2: _SECTIONS}
+_HEADERS = {
+    version: struct.Struct("<8sIIIII" + "QQ" * len(sections))
+    for version, sections in _VERSION_SECTIONS.items()
+}
+_HEADER = _HEADERS[SNAPSHOT_VERSION]
+_PREAMBLE = struct.Struct("<8sI")
+
+# Registros de ancho fijo
+# host: ip empaquetada (16 bytes, IPv4 mapeada a IPv6), ip, hostname, os, state,
+#       campos extra (JSON), inicio de puertos, número de puertos, open_ports_count
+_HOST = struct.Struct("<16sIIIIIIII")
+# puerto: número, state, service, product, version, extrainfo, campos extra (JSON)
+_PORT = struct.Struct("<H2xIIIIII")
+# hallazgo: índice de host, host, hostname, type, risk, port (-1 = N/A), service,
+#           description, reason, recommendation, campos extra (JSON)
+_FINDING = struct.Struct("<IIIIIiIIIII")
+# puntaje de host (uno por host, en el orden de hosts): puntaje, nivel
+_HOST_SCORE = struct.Struct("<qI")
+# hallazgo prioritario: índice del hallazgo, prioridad, puntaje del host
+_TOP_FINDING = struct.Struct("<Iqq")
+# tiempo por chequeo: nombre, segundos, llamadas, hallazgos
+_CHECK_TIMING = struct.Struct("<IdQQ")
+_STRING_OFFSET = struct.Struct("<Q")
+_INDEX_ENTRY = struct.Struct("<I")
+
+# Identificador reservado para valores ausentes
+NULL_ID = 0xFFFFFFFF
+
+_HOST_FIELDS = ('ip', 'hostname', 'os', 'state', 'ports', 'open_ports_count')
+_PORT_FIELDS = ('port', 'state', 'service', 'product', 'version', 'extrainfo')
+_FINDING_FIELDS = (
+    'host', 'hostname', 'type', 'risk', 'port', 'service',
+    'description', 'reason', 'recommendation'
+)
+
+# Claves del análisis que crecen con la red: no van en meta, que se lee entera
+# para consultar scan_summary. Las primeras van en secciones de ancho fijo; la
+# agregación y la analítica de red se recalculan al cargar.
+_SECTION_KEYS = ('host_scores', 'top_findings', 'check_timings')
+_DERIVED_KEYS = ('vulnerabilities', 'aggregated_findings', 'network')
+
+
+def _pack_ip(ip: str) -> bytes:
+    """
+    Empaqueta una IP en 16 bytes ordenables (IPv4 como IPv6 mapeada)
+
+    Args:
+        ip: Dirección IP en texto
+
+    Returns:
+        Representación binaria de ancho fijo (ceros si no es una IP válida)
+    """
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return b"\x00" * 16
+
+    if address.version == 4:
+        return b"\x00" * 10 + b"\xff\xff" + address.packed
+    return address.packed
+
+
+class _StringTable:
+    """Tabla de cadenas deduplicadas durante la escritura"""
+
+    def __init__(self):
+        self.ids = {}
+        self.offsets = io.BytesIO()
+        self.data = io.BytesIO()
+
+    def add(self, value) -> int:
+        if value is None:
+            return NULL_ID
+        value = str(value)
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = len(self.ids)
+            self.ids[value] = sid
+            self.offsets.write(_STRING_OFFSET.pack(self.data.tell()))
+            self.data.write(value.encode('utf-8'))
+        return sid
+
+    def add_extra(self, record: Dict, known_fields: Tuple) -> int:
+        extra = {k: v for k, v in record.items() if k not in known_fields}
+        if not extra:
+            return NULL_ID
+        return self.add(json.dumps(extra, ensure_ascii=False, sort_keys=True, default=str))
+
+    def finish(self) -> Tuple[bytes, bytes]:
+        # Offset final para poder calcular la longitud de la última cadena
+        self.offsets.write(_STRING_OFFSET.pack(self.data.tell()))
+        return self.offsets.getvalue(), self.data.getvalue()
+
+
+def _pack_top_findings(top_findings, vulnerabilities) -> Optional[bytes]:
+    """
+    Registros de los hallazgos prioritarios como referencias a los hallazgos
+
+    Returns:
+        Registros empaquetados, o None si alguno no está entre los hallazgos
+    """
+    candidates = {}
+    for rank, top in enumerate(top_findings):
+        finding = {k: v for k, v in top.items() if k not in ('priority', 'host_score')}
+        candidates.setdefault((finding.get('host'), finding.get('description')), []).append((rank, finding))
+
+    indexes = [None] * len(top_findings)
+    for index, vuln in enumerate(vulnerabilities):
+        for rank, finding in candidates.get((vuln.get('host'), vuln.get('description')), ()):
+            if indexes[rank] is None and finding == vuln:
+                indexes[rank] = index
+
+    if None in indexes:
+        return None
+    return b"".join(
+        _TOP_FINDING.pack(index, top['priority'], top['host_score'])
+        for index, top in zip(indexes, top_findings)
+    )
+
+
+def _pack_analysis_sections(analysis_results: Dict, host_ips, strings: _StringTable) -> Dict[str, bytes]:
+    """
+    Secciones de ancho fijo de las claves de _SECTION_KEYS presentes en el análisis
+
+    Args:
+        analysis_results: Resultados del análisis de seguridad
+        host_ips: IPs de los hosts en el orden del snapshot
+        strings: Tabla de cadenas del snapshot
+
+    Returns:
+        Contenido de cada sección, solo para las claves que se guardan así
+    """
+    sections = {}
+    host_scores = analysis_results.get('host_scores')
+    if host_scores is not None:
+        records = io.BytesIO()
+        for host_ip in host_ips:
+            entry = host_scores.get(host_ip)
+            if entry is None:
+                records.write(_HOST_SCORE.pack(0, NULL_ID))
+            else:
+                records.write(_HOST_SCORE.pack(entry['score'], strings.add(entry['level'])))
+        sections['host_scores'] = records.getvalue()
+
+    top_findings = analysis_results.get('top_findings')
+    if top_findings is not None:
+        records = _pack_top_findings(top_findings, analysis_results.get('vulnerabilities', []))
+        # Hallazgos prioritarios ajenos a la lista de hallazgos: se quedan en meta
+        if records is not None:
+            sections['top_findings'] = records
+
+    check_timings = analysis_results.get('check_timings')
+    if check_timings is not None:
+        sections['check_timings'] = b"".join(
+            _CHECK_TIMING.pack(strings.add(name), timing['seconds'], timing['calls'], timing['count'])
+            for name, timing in check_timings.items()
+        )
+    return sections
+
+
+def write_snapshot(path: str, scan_results: Dict, analysis_results: Optional[Dict] = None,
+                   scan_summary: Optional[Dict] = None) -> str:
+    """
+    Escribe un snapshot binario con los resultados de escaneo y análisis
+
+    Args:
+        path: Ruta del archivo de salida
+        scan_results: Resultados del escaneo de red
+        analysis_results: Resultados del análisis de seguridad (opcional)
+        scan_summary: Resumen del escaneo (opcional)
+
+    Returns:
+        Ruta del snapshot generado
+    """
+    strings = _StringTable()
+    hosts = io.BytesIO()
+    ports = io.BytesIO()
+    findings = io.BytesIO()
+    host_positions = {}
+    packed_ips = []
+    port_count = 0
+
+    for host_ip, host_data in scan_results.items():
+        host_positions[host_ip] = len(packed_ips)
+        packed = _pack_ip(host_ip)
+        packed_ips.append(packed)
+
+        host_ports = host_data.get('ports', [])
+        for port_info in host_ports:
+            ports.write(_PORT.pack(
+                int(port_info['port']),
+                strings.add(port_info.get('state')),
+                strings.add(port_info.get('service')),
+                strings.add(port_info.get('product')),
+                strings.add(port_info.get('version')),
+                strings.add(port_info.get('extrainfo')),
+                strings.add_extra(port_info, _PORT_FIELDS)
+            ))
+
+        hosts.write(_HOST.pack(
+            packed,
+            strings.add(host_data.get('ip', host_ip)),
+            strings.add(host_data.get('hostname')),
+            strings.add(host_data.get('os')),
+            strings.add(host_data.get('state')),
+            strings.add_extra(host_data, _HOST_FIELDS),
+            port_count,
+            len(host_ports),
+            host_data.get('open_ports_count', len(host_ports))
+        ))
+        port_count += len(host_ports)
+
+    vulnerabilities = (analysis_results or {}).get('vulnerabilities', [])
+    for vuln in vulnerabilities:
+        port = vuln.get('port')
+        findings.write(_FINDING.pack(
+            host_positions.get(vuln['host'], NULL_ID),
+            strings.add(vuln['host']),
+            strings.add(vuln.get('hostname')),
+            strings.add(vuln.get('type')),
+            strings.add(vuln.get('risk')),
+            port if isinstance(port, int) else -1,
+            strings.add(vuln.get('service')),
+            strings.add(vuln.get('description')),
+            strings.add(vuln.get('reason')),
+            strings.add(vuln.get('recommendation')),
+            strings.add_extra(vuln, _FINDING_FIELDS)
+        ))
+
+    # Índice de hosts ordenado por IP para búsquedas binarias
+    ip_order = sorted(range(len(packed_ips)), key=packed_ips.__getitem__)
+    ip_index = b"".join(_INDEX_ENTRY.pack(i) for i in ip_order)
+
+    analysis = analysis_results or {}
+    analysis_sections = _pack_analysis_sections(analysis, scan_results, strings)
+    network = analysis.get('network')
+    meta = {
+        'analysis': {
+            k: v for k, v in analysis.items()
+            if k not in _DERIVED_KEYS and k not in analysis_sections
+        },
+        'analysis_sections': list(analysis_sections),
+        # Prefijos IPv4 con los que se recalcula la analítica de red al cargar
+        'network_prefixes': (
+            [int(key[1:]) for key in network['subnets'] if key[1:].isdigit()]
+            if network is not None else None
+        ),
+        'has_analysis': analysis_results is not None,
+        'scan_summary': scan_summary,
+    }
+    meta_bytes = json.dumps(meta, ensure_ascii=False, default=str).encode('utf-8')
+
+    string_offsets, string_data = strings.finish()
+    sections = [
+        string_offsets, string_data, hosts.getvalue(), ports.getvalue(),
+        findings.getvalue(), ip_index, meta_bytes
+    ] + [analysis_sections.get(key, b"") for key in _SECTION_KEYS]
+
+    # Secciones alineadas a 8 bytes a continuación de la cabecera
+    layout = []
+    offset = _HEADER.size
+    for section in sections:
+        offset += -offset % 8
+        layout.extend((offset, len(section)))
+        offset += len(section)
+
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(packed_ips), port_count,
+        len(vulnerabilities), len(strings.ids), *layout
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for section in sections:
+            f.write(b"\x00" * (-f.tell() % 8))
+            f.write(section)
+    os.replace(tmp_path, path)
+
+    logger.info(
+        f"✓ Snapshot generado: {path} ({len(packed_ips)} hosts, {len(vulnerabilities)} hallazgos)"
+    )
+    return path
+
+
+class _IPKeys:
+    """Vista perezosa de las IPs empaquetadas en orden del índice (para bisect)"""
+
+    def __init__(self, snapshot: 'Snapshot'):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return self.snapshot.host_count
+
+    def __getitem__(self, position: int) -> bytes:
+        return self.snapshot._packed_ip(self.snapshot._ip_index_entry(position))
+
+
+class Snapshot:
+    """
+    Lector de snapshots mapeado en memoria
+
+    Solo se decodifican las páginas de los registros que se consultan, por lo
+    que abrir un snapshot de millones de hosts es inmediato.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre un snapshot existente
+
+        Args:
+            path: Ruta del snapshot
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Snapshot vacío o inválido: {path}")
+
+        if len(self._mm) < _PREAMBLE.size:
+            self.close()
+            raise ValueError(f"Snapshot truncado: {path}")
+
+        magic, version = _PREAMBLE.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"El archivo no es un snapshot de NetAuditBot: {path}")
+        if version not in _HEADERS:
+            self.close()
+            raise ValueError(f"Versión de snapshot no soportada ({version}): {path}")
+        header = _HEADERS[version]
+        if len(self._mm) < header.size:
+            self.close()
+            raise ValueError(f"Snapshot truncado: {path}")
+
+        fields = header.unpack_from(self._mm, 0)
+        self.version = version
+        self.host_count, self.port_count, self.finding_count, self.string_count = fields[2:6]
+        layout = fields[6:]
+        self._sections = {
+            name: (layout[2 * i], layout[2 * i + 1])
+            for i, name in enumerate(_VERSION_SECTIONS[version])
+        }
+        self._string_cache = {}
+        self._meta = None
+
+    # ---------- Gestión del recurso ----------
+
+    def close(self):
+        """Libera el mapeo de memoria y el archivo"""
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.host_count
+
+    # ---------- Acceso de bajo nivel ----------
+
+    def _string(self, sid: int) -> Optional[str]:
+        if sid == NULL_ID:
+            return None
+        value = self._string_cache.get(sid)
+        if value is None:
+            offsets_start = self._sections['string_offsets'][0]
+            data_start = self._sections['string_data'][0]
+            start = _STRING_OFFSET.unpack_from(self._mm, offsets_start + sid * 8)[0]
+            end = _STRING_OFFSET.unpack_from(self._mm, offsets_start + (sid + 1) * 8)[0]
+            value = self._mm[data_start + start:data_start + end].decode('utf-8')
+            self._string_cache[sid] = value
+        return value
+
+    def _extra(self, sid: int) -> Dict:
+        return json.loads(self._string(sid)) if sid != NULL_ID else {}
+
+    def _host_record(self, index: int) -> Tuple:
+        if not 0 <= index < self.host_count:
+            raise IndexError(f"Host fuera de rango: {index}")
+        return _HOST.unpack_from(self._mm, self._sections['hosts'][0] + index * _HOST.size)
+
+    def _packed_ip(self, index: int) -> bytes:
+        start = self._sections['hosts'][0] + index * _HOST.size
+        return self._mm[start:start + 16]
+
+    def _ip_index_entry(self, position: int) -> int:
+        start = self._sections['ip_index'][0] + position * _INDEX_ENTRY.size
+        return _INDEX_ENTRY.unpack_from(self._mm, start)[0]
+
+    def _records(self, name: str, record: struct.Struct) -> Iterator[Tuple]:
+        start, length = self._sections[name]
+        return record.iter_unpack(self._mm[start:start + length])
+
+    def _host_scores(self) -> Dict[str, Dict]:
+        return {
+            self.host_ip(index): {'score': score, 'level': self._string(level)}
+            for index, (score, level) in enumerate(self._records('host_scores', _HOST_SCORE))
+            if level != NULL_ID
+        }
+
+    def _check_timings(self) -> Dict[str, Dict]:
+        return {
+            self._string(name): {'seconds': seconds, 'calls': calls, 'count': count}
+            for name, seconds, calls, count in self._records('check_timings', _CHECK_TIMING)
+        }
+
+    def _port(self, index: int) -> Dict:
+        record = _PORT.unpack_from(self._mm, self._sections['ports'][0] + index * _PORT.size)
+        port_data = {
+            'port': record[0],
+            'state': self._string(record[1]),
+            'service': self._string(record[2]),
+            'version': self._string(record[4]),
+            'product': self._string(record[3]),
+            'extrainfo': self._string(record[5]),
+        }
+        port_data.update(self._extra(record[6]))
+        return port_data
+
+    # ---------- API pública ----------
+
+    @property
+    def metadata(self) -> Dict:
+        """Metadatos JSON del snapshot (resumen de análisis y de escaneo)"""
+        if self._meta is None:
+            start, length = self._sections['meta']
+            self._meta = json.loads(self._mm[start:start + length].decode('utf-8'))
+        return self._meta
+
+    @property
+    def scan_summary(self) -> Optional[Dict]:
+        """Resumen del escaneo almacenado, si existe"""
+        return self.metadata.get('scan_summary')
+
+    def host_ip(self, index: int) -> str:
+        """Devuelve la IP del host en la posición indicada"""
+        return self._string(self._host_record(index)[1])
+
+    def host(self, index: int) -> Dict:
+        """
+        Decodifica un host con el mismo formato que scan_results
+
+        Args:
+            index: Posición del host en el snapshot
+
+        Returns:
+            Diccionario con la información del host
+        """
+        record = self._host_record(index)
+        port_start, port_total = record[6], record[7]
+        host_info = {
+            'ip': self._string(record[1]),
+            'hostname': self._string(record[2]),
+            'state': self._string(record[4]),
+            'os': self._string(record[3]),
+            'ports': [self._port(port_start + i) for i in range(port_total)],
+            'open_ports_count': record[8],
+        }
+        host_info.update(self._extra(record[5]))
+        return host_info
+
+    def find_host(self, ip: str) -> Optional[Dict]:
+        """
+        Busca un host por IP usando el índice ordenado
+
+        Args:
+            ip: IP del host
+
+        Returns:
+            Información del host o None si no existe
+        """
+        packed = _pack_ip(ip)
+        keys = _IPKeys(self)
+        position = bisect.bisect_left(keys, packed)
+        while position < self.host_count and keys[position] == packed:
+            index = self._ip_index_entry(position)
+            if self.host_ip(index) == ip:
+                return self.host(index)
+            position += 1
+        return None
+
+    def iter_hosts(self) -> Iterator[Tuple[str, Dict]]:
+        """Itera los hosts en el orden original del escaneo"""
+        for index in range(self.host_count):
+            host_info = self.host(index)
+            yield host_info['ip'], host_info
+
+    def finding(self, index: int) -> Dict:
+        """
+        Decodifica un hallazgo con el mismo formato que analysis_results
+
+        Args:
+            index: Posición del hallazgo en el snapshot
+
+        Returns:
+            Diccionario con el hallazgo
+        """
+        if not 0 <= index < self.finding_count:
+            raise IndexError(f"Hallazgo fuera de rango: {index}")
+        record = _FINDING.unpack_from(
+            self._mm, self._sections['findings'][0] + index * _FINDING.size
+        )
+        finding = {
+            'host': self._string(record[1]),
+            'hostname': self._string(record[2]),
+            'type': self._string(record[3]),
+            'risk': self._string(record[4]),
+            'port': record[5] if record[5] >= 0 else 'N/A',
+            'service': self._string(record[6]),
+            'description': self._string(record[7]),
+            'reason': self._string(record[8]),
+            'recommendation': self._string(record[9]),
+        }
+        finding.update(self._extra(record[10]))
+        return finding
+
+    def iter_findings(self) -> Iterator[Dict]:
+        """Itera los hallazgos en el orden en que fueron generados"""
+        for index in range(self.finding_count):
+            yield self.finding(index)
+
+    def scan_results(self) -> Dict[str, Dict]:
+        """Reconstruye el diccionario completo scan_results"""
+        return dict(self.iter_hosts())
+
+    def analysis_results(self) -> Optional[Dict]:
+        """
+        Reconstruye el diccionario completo analysis_results
+
+        Las secciones de ancho fijo se decodifican y la agregación y la
+        analítica de red se recalculan solo aquí, no al leer los metadatos.
+        """
+        if not self.metadata.get('has_analysis'):
+            return None
+        from security_analyzer import aggregate_findings
+
+        results = dict(self.metadata['analysis'])
+        stored = self.metadata.get('analysis_sections', [])
+        vulnerabilities = list(self.iter_findings())
+        if 'host_scores' in stored:
+            results['host_scores'] = self._host_scores()
+        results['aggregated_findings'] = aggregate_findings(vulnerabilities)
+        if 'top_findings' in stored:
+            results['top_findings'] = [
+                dict(vulnerabilities[index], priority=priority, host_score=host_score)
+                for index, priority, host_score in self._records('top_findings', _TOP_FINDING)
+            ]
+        if 'check_timings' in stored:
+            results['check_timings'] = self._check_timings()
+        results['vulnerabilities'] = vulnerabilities
+
+        prefixes = self.metadata.get('network_prefixes')
+        if prefixes is not None:
+            from network_analytics import compute_subnet_rollups
+            results['network'] = compute_subnet_rollups(self.scan_results(), results, prefixes)
+        return results
+
+
+def load_snapshot(path: str) -> Tuple[Dict, Optional[Dict], Optional[Dict]]:
+    """
+    Carga un snapshot completo en memoria
+
+    Args:
+        path: Ruta del snapshot
+
+    Returns:
+        Tupla (scan_results, analysis_results, scan_summary)
+    """
+    with Snapshot(path) as snapshot:
+        return snapshot.scan_results(), snapshot.analysis_results(), snapshot.scan_summary
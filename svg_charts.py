@@ -0,0 +1,243 @@
+"""
+NetAuditBot - Gráficos SVG
+Renderiza los gráficos de barras del reporte como SVG en línea, sin
+dependencias externas, a partir de las mismas especificaciones que usa el
+renderizado con matplotlib
+"""
+
+import math
+from html import escape
+from typing import Dict, List, Sequence
+from config import *
+
+# Píxeles por pulgada al traducir el figsize de la especificación
+PX_PER_INCH = 80
+
+# Ancho aproximado de un carácter de las etiquetas (px, fuente de 11px)
+_CHAR_WIDTH = 6.5
+
+_FONT = "Inter, -apple-system, 'Segoe UI', sans-serif"
+_AXIS_COLOR = "#4a5568"
+_GRID_COLOR = "#e2e8f0"
+_TEXT_COLOR = "#2d3748"
+
+
+def _number(value: float) -> str:
+    """Valor numérico sin decimales innecesarios"""
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+
+def _ticks(maximum: float, count: int = 5) -> List[float]:
+    """Marcas del eje de valores: de 0 hasta cubrir maximum con pasos 1, 2 o 5 x 10^n"""
+    if maximum <= 0:
+        return [0, 1]
+    raw = maximum / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(factor * magnitude for factor in (1, 2, 5, 10) if raw <= factor * magnitude)
+    # Los valores son recuentos: no tiene sentido un paso menor que 1
+    step = max(step, 1)
+    return [i * step for i in range(math.ceil(maximum / step) + 1)]
+
+
+def _colors(color, count: int) -> List[str]:
+    """Color de cada barra (un color para todas o uno por barra)"""
+    if isinstance(color, str):
+        return [color] * count
+    return list(color)
+
+
+def _truncate(label: str, max_chars: int) -> str:
+    return label if len(label) <= max_chars else label[:max(1, max_chars - 1)] + "…"
+
+
+def _open_svg(spec: Dict, width: int, height: int) -> List[str]:
+    """Raíz del SVG, fondo y título"""
+    title = escape(spec['title'])
+    return [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="{width}" '
+        f'role="img" aria-label="{title}" font-family="{escape(_FONT)}" font-size="11" fill="{_TEXT_COLOR}">',
+        f'<rect width="{width}" height="{height}" fill="#ffffff"/>',
+        f'<text x="{width / 2:.1f}" y="26" text-anchor="middle" font-size="15" font-weight="700">{title}</text>',
+    ]
+
+
+def _bar_chart(spec: Dict) -> str:
+    """Barras verticales (con umbral y etiquetas de valor opcionales)"""
+    width, height = (int(size * PX_PER_INCH) for size in spec['figsize'])
+    labels = [str(label) for label in spec['labels']]
+    values = spec['values']
+    colors = _colors(spec['color'], len(values))
+    threshold = spec.get('threshold')
+    rotate = spec.get('rotate_labels', False)
+
+    ticks = _ticks(max(max(values, default=0), threshold[0] if threshold else 0))
+    top_value = ticks[-1]
+
+    # Espacio bajo el eje para las etiquetas (giradas 45º, ocupan ~0.71 de su largo)
+    longest = max((len(label) for label in labels), default=0)
+    label_space = longest * _CHAR_WIDTH * 0.71 + 16 if rotate else 22
+    margin_left, margin_right, margin_top = 60, 20, 45
+    margin_bottom = label_space + (24 if spec.get('xlabel') else 0) + 6
+    plot_w = width - margin_left - margin_right
+    plot_h = max(10, height - margin_top - margin_bottom)
+    base_y = margin_top + plot_h
+
+    parts = _open_svg(spec, width, height)
+
+    # Rejilla y marcas del eje Y
+    for tick in ticks:
+        y = base_y - tick / top_value * plot_h
+        parts.append(f'<line x1="{margin_left}" y1="{y:.1f}" x2="{width - margin_right}" y2="{y:.1f}" stroke="{_GRID_COLOR}"/>')
+        parts.append(f'<text x="{margin_left - 6}" y="{y + 4:.1f}" text-anchor="end">{_number(tick)}</text>')
+
+    # Barras
+    slot = plot_w / max(1, len(values))
+    bar_w = slot * 0.8
+    for i, (label, value, color) in enumerate(zip(labels, values, colors)):
+        bar_h = value / top_value * plot_h
+        x = margin_left + i * slot + (slot - bar_w) / 2
+        parts.append(
+            f'<rect x="{x:.2f}" y="{base_y - bar_h:.2f}" width="{bar_w:.2f}" height="{bar_h:.2f}" fill="{color}">'
+            f'<title>{escape(label)}: {_number(value)}</title></rect>'
+        )
+        if spec.get('value_labels'):
+            parts.append(
+                f'<text x="{x + bar_w / 2:.1f}" y="{base_y - bar_h - 4:.1f}" text-anchor="middle">{_number(value)}</text>'
+            )
+
+    # Etiquetas del eje X: con muchas barras se muestra solo una de cada 'every'
+    label_room = 14 if rotate else longest * _CHAR_WIDTH + 8
+    every = max(1, math.ceil(label_room / slot))
+    for i in range(0, len(labels), every):
+        x = margin_left + (i + 0.5) * slot
+        label = escape(labels[i])
+        if rotate:
+            parts.append(
+                f'<text x="{x:.1f}" y="{base_y + 12:.1f}" text-anchor="end" '
+                f'transform="rotate(-45 {x:.1f} {base_y + 12:.1f})">{label}</text>'
+            )
+        else:
+            parts.append(f'<text x="{x:.1f}" y="{base_y + 16:.1f}" text-anchor="middle">{label}</text>')
+
+    # Línea de umbral con su leyenda
+    if threshold:
+        value, legend = threshold
+        y = base_y - value / top_value * plot_h
+        parts.append(
+            f'<line x1="{margin_left}" y1="{y:.1f}" x2="{width - margin_right}" y2="{y:.1f}" '
+            f'stroke="#e53e3e" stroke-width="1.5" stroke-dasharray="6 4"/>'
+        )
+        legend_x = width - margin_right - 10
+        line_x = legend_x - len(legend) * _CHAR_WIDTH - 8
+        parts.append(
+            f'<line x1="{line_x - 24:.1f}" y1="{margin_top + 10}" x2="{line_x:.1f}" y2="{margin_top + 10}" '
+            f'stroke="#e53e3e" stroke-width="1.5" stroke-dasharray="6 4"/>'
+        )
+        parts.append(f'<text x="{legend_x}" y="{margin_top + 14}" text-anchor="end">{escape(legend)}</text>')
+
+    # Ejes y sus títulos
+    parts.append(f'<line x1="{margin_left}" y1="{margin_top}" x2="{margin_left}" y2="{base_y:.1f}" stroke="{_AXIS_COLOR}"/>')
+    parts.append(f'<line x1="{margin_left}" y1="{base_y:.1f}" x2="{width - margin_right}" y2="{base_y:.1f}" stroke="{_AXIS_COLOR}"/>')
+    if spec.get('xlabel'):
+        parts.append(
+            f'<text x="{margin_left + plot_w / 2:.1f}" y="{height - 10}" text-anchor="middle" font-size="12">'
+            f'{escape(spec["xlabel"])}</text>'
+        )
+    if spec.get('ylabel'):
+        y = margin_top + plot_h / 2
+        parts.append(
+            f'<text x="16" y="{y:.1f}" text-anchor="middle" font-size="12" transform="rotate(-90 16 {y:.1f})">'
+            f'{escape(spec["ylabel"])}</text>'
+        )
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def _barh_chart(spec: Dict) -> str:
+    """Barras horizontales (la primera categoría abajo, como en matplotlib)"""
+    width, height = (int(size * PX_PER_INCH) for size in spec['figsize'])
+    labels = [str(label) for label in spec['labels']]
+    values = spec['values']
+    colors = _colors(spec['color'], len(values))
+
+    ticks = _ticks(max(values, default=0))
+    top_value = ticks[-1]
+
+    # Margen izquierdo según la etiqueta más larga (como mucho el 40% del ancho)
+    longest = max((len(label) for label in labels), default=0)
+    margin_left = min(width * 0.4, longest * _CHAR_WIDTH + 16)
+    max_chars = int((margin_left - 16) / _CHAR_WIDTH)
+    margin_right, margin_top = 25, 45
+    margin_bottom = 50 if spec.get('xlabel') else 30
+    plot_w = width - margin_left - margin_right
+    plot_h = height - margin_top - margin_bottom
+    base_y = margin_top + plot_h
+
+    parts = _open_svg(spec, width, height)
+
+    # Rejilla y marcas del eje X
+    for tick in ticks:
+        x = margin_left + tick / top_value * plot_w
+        parts.append(f'<line x1="{x:.1f}" y1="{margin_top}" x2="{x:.1f}" y2="{base_y:.1f}" stroke="{_GRID_COLOR}"/>')
+        parts.append(f'<text x="{x:.1f}" y="{base_y + 16:.1f}" text-anchor="middle">{_number(tick)}</text>')
+
+    # Barras y etiquetas de categoría
+    slot = plot_h / max(1, len(values))
+    bar_h = slot * 0.8
+    for i, (label, value, color) in enumerate(zip(labels, values, colors)):
+        y = base_y - (i + 1) * slot + (slot - bar_h) / 2
+        bar_w = value / top_value * plot_w
+        parts.append(
+            f'<rect x="{margin_left:.1f}" y="{y:.2f}" width="{bar_w:.2f}" height="{bar_h:.2f}" fill="{color}">'
+            f'<title>{escape(label)}: {_number(value)}</title></rect>'
+        )
+        parts.append(
+            f'<text x="{margin_left - 6:.1f}" y="{y + bar_h / 2 + 4:.1f}" text-anchor="end">'
+            f'{escape(_truncate(label, max_chars))}</text>'
+        )
+
+    # Ejes y título del eje X
+    parts.append(f'<line x1="{margin_left:.1f}" y1="{margin_top}" x2="{margin_left:.1f}" y2="{base_y:.1f}" stroke="{_AXIS_COLOR}"/>')
+    parts.append(f'<line x1="{margin_left:.1f}" y1="{base_y:.1f}" x2="{width - margin_right}" y2="{base_y:.1f}" stroke="{_AXIS_COLOR}"/>')
+    if spec.get('xlabel'):
+        parts.append(
+            f'<text x="{margin_left + plot_w / 2:.1f}" y="{height - 10}" text-anchor="middle" font-size="12">'
+            f'{escape(spec["xlabel"])}</text>'
+        )
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+_RENDERERS = {
+    'bar': _bar_chart,
+    'barh': _barh_chart,
+}
+
+
+def render_chart(spec: Dict) -> str:
+    """
+    Renderiza un gráfico como SVG en línea
+
+    Args:
+        spec: Especificación del gráfico (ReportGenerator.chart_specs): kind
+            ('bar' o 'barh'), title, labels, values, color, figsize y
+            opcionalmente xlabel, ylabel, rotate_labels, value_labels y
+            threshold (valor, leyenda)
+
+    Returns:
+        Documento SVG
+
+    Raises:
+        ValueError: Si el tipo de gráfico no está soportado
+    """
+    renderer = _RENDERERS.get(spec['kind'])
+    if renderer is None:
+        raise ValueError(f"Tipo de gráfico no soportado en SVG: {spec['kind']}")
+    return renderer(spec)
+
+
+def render_charts(specs: Sequence[Dict]) -> Dict[str, str]:
+    """SVG de cada especificación, por nombre de gráfico"""
+    return {spec['name']: render_chart(spec) for spec in specs}
@@ -0,0 +1,138 @@
+"""
+NetAuditBot - Entorno de Plantillas
+Entorno Jinja2 compartido que carga las plantillas de TEMPLATES_DIR y guarda
+su código compilado en una caché de bytecode en disco, de modo que las
+ejecuciones sucesivas no vuelven a compilarlas
+"""
+
+import os
+import logging
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from config import *
+from instrumentation import TimingRegistry
+
+logger = logging.getLogger(__name__)
+
+# Plantilla del reporte HTML
+REPORT_TEMPLATE = "report.html.j2"
+
+_environment: Optional[Environment] = None
+
+
+def get_environment() -> Environment:
+    """
+    Entorno compartido por todos los reportes del proceso
+
+    El entorno guarda en memoria las plantillas ya cargadas; entre procesos,
+    la caché de bytecode de TEMPLATE_CACHE_DIR evita volver a compilarlas.
+    auto_reload detecta los cambios en las plantillas e invalida ambas cachés.
+    """
+    global _environment
+    if _environment is None:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        _environment = Environment(
+            loader=FileSystemLoader(TEMPLATES_DIR),
+            bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+            auto_reload=True
+        )
+    return _environment
+
+
+def get_template(name: str, timings: Optional[TimingRegistry] = None) -> Template:
+    """
+    Carga una plantilla del entorno compartido
+
+    Args:
+        name: Nombre de la plantilla dentro de TEMPLATES_DIR
+        timings: Registro donde anotar el tiempo de carga (opcional)
+
+    Returns:
+        Plantilla compilada
+    """
+    if timings is None:
+        return get_environment().get_template(name)
+    with timings.timed('plantilla: carga'):
+        return get_environment().get_template(name)
+
+
+@contextmanager
+def _atomic_output(path: str):
+    """Archivo de texto que solo aparece en path si se escribe completo"""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def render_to_file(template: Template, path: str, **context) -> str:
+    """
+    Renderiza una plantilla por fragmentos directamente a un archivo
+
+    La memoria no depende del tamaño del resultado. Se escribe en un
+    temporal para no dejar un archivo a medias si el renderizado falla.
+
+    Args:
+        template: Plantilla compilada
+        path: Archivo de salida
+        **context: Variables de la plantilla
+
+    Returns:
+        Ruta del archivo generado
+    """
+    stream = template.stream(**context)
+    stream.enable_buffering(REPORT_STREAM_CHUNK)
+    with _atomic_output(path) as f:
+        stream.dump(f)
+    return path
+
+
+def write_report_file(path: str, content: str) -> str:
+    """
+    Escribe un documento ya renderizado (p. ej. procedente de la caché)
+
+    Args:
+        path: Archivo de salida
+        content: Documento
+
+    Returns:
+        Ruta del archivo generado
+    """
+    with _atomic_output(path) as f:
+        f.write(content)
+    return path
+
+
+def templates_version() -> Tuple[Tuple[str, str], ...]:
+    """
+    Versión de todas las plantillas (nombre, tamaño y fecha de modificación)
+
+    Forma parte de las claves de la caché de renderizado: cualquier cambio
+    en una plantilla invalida lo renderizado con ella.
+    """
+    environment = get_environment()
+    version = []
+    for name in environment.list_templates(extensions=['j2']):
+        stat = os.stat(os.path.join(TEMPLATES_DIR, name))
+        version.append((name, f"{stat.st_size}:{stat.st_mtime_ns}"))
+    return tuple(version)
+
+
+def precompile_templates() -> List[str]:
+    """
+    Compila todas las plantillas de TEMPLATES_DIR y llena la caché de bytecode
+
+    Returns:
+        Nombres de las plantillas compiladas
+    """
+    environment = get_environment()
+    names = environment.list_templates(extensions=['j2'])
+    for name in names:
+        environment.get_template(name)
+    logger.info(f"✓ Plantillas precompiladas en {TEMPLATE_CACHE_DIR}: {', '.join(names)}")
+    return names
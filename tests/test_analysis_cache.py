@@ -0,0 +1,53 @@
+"""
+Pruebas de la capa persistente de la caché de análisis
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_cache import AnalysisCache
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM host_analysis").fetchone()[0]
+
+
+def test_flush_prunes_least_recently_used_rows(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = AnalysisCache(16, path, max_rows=2)
+    cache.put(('a',), [{'host': '10.0.0.1', 'risk': 'ALTO'}])
+    cache.put(('b',), [])
+    cache.close()
+
+    # 'a' se lee de disco (se marca como usada) antes de añadir 'c'
+    cache = AnalysisCache(16, path, max_rows=2)
+    assert cache.get(('a',)) == [{'risk': 'ALTO'}]
+    cache.put(('c',), [])
+    cache.close()
+
+    assert _rows(path) == 2
+    cache = AnalysisCache(16, path, max_rows=2)
+    assert cache.get(('a',)) is not None
+    assert cache.get(('b',)) is None
+    assert cache.get(('c',)) is not None
+
+
+def test_worker_delta_is_merged_into_the_parent(tmp_path):
+    path = str(tmp_path / "cache.db")
+    parent = AnalysisCache(16, path)
+    worker = AnalysisCache(16, path)
+    worker.start_delta()
+    assert worker.get(('a',)) is None
+    worker.put(('a',), [{'host': '10.0.0.1', 'risk': 'MEDIO'}])
+    assert worker.get(('a',)) is not None
+    worker.flush()
+    assert _rows(path) == 0
+
+    parent.merge_delta(worker.take_delta())
+    assert (parent.hits, parent.misses) == (1, 1)
+    parent.close()
+    assert _rows(path) == 1
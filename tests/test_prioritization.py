@@ -0,0 +1,58 @@
+"""
+Pruebas de los hallazgos prioritarios (top K) del analizador
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_checks import AnalysisCheck, SCOPE_NETWORK
+from config import HOST_RISK_WEIGHTS, PRIORITY_EXPOSURE_FACTOR, PRIORITY_RISK_FACTOR
+from security_analyzer import SecurityAnalyzer, get_default_checks
+
+
+class LateNetworkCheck(AnalysisCheck):
+    """Chequeo de red que añade hallazgos ALTO a un host ya analizado"""
+    name = 'hallazgos_de_red'
+    scope = SCOPE_NETWORK
+    finding_type = 'red'
+    risk = 'ALTO'
+
+    def __init__(self, host_ip, count):
+        self.host_ip = host_ip
+        self.count = count
+
+    def run(self, analyzer, scan_results, findings):
+        host_data = scan_results[self.host_ip]
+        return [
+            self.make_finding(self.host_ip, host_data, 'N/A', 'red', f"Hallazgo {i}", "Motivo", "Revisar")
+            for i in range(self.count)
+        ]
+
+
+def _host(ip, ports):
+    ports = [{'port': port, 'state': 'open', 'service': service, 'product': '', 'version': '', 'extrainfo': ''}
+             for port, service in ports]
+    return {'ip': ip, 'hostname': '', 'state': 'up', 'os': '', 'ports': ports, 'open_ports_count': len(ports)}
+
+
+def test_network_findings_update_the_priority_of_earlier_host_findings():
+    scan_results = {
+        '10.0.0.1': _host('10.0.0.1', [(21, 'ftp')]),
+        '10.0.0.2': _host('10.0.0.2', [(23, 'telnet'), (21, 'ftp')]),
+    }
+    checks = get_default_checks() + [LateNetworkCheck('10.0.0.1', 3)]
+    analyzer = SecurityAnalyzer(scan_results, checks=checks, top_k=4)
+    summary = analyzer.analyze_all()
+
+    def priority(finding):
+        score = analyzer.get_host_risk_score(finding['host'])[0]
+        exposure = scan_results[finding['host']]['open_ports_count']
+        return HOST_RISK_WEIGHTS[finding['risk']] * PRIORITY_RISK_FACTOR + score + exposure * PRIORITY_EXPOSURE_FACTOR
+
+    expected = sorted((priority(finding) for finding in summary['vulnerabilities']), reverse=True)[:4]
+    top = summary['top_findings']
+    assert [finding['priority'] for finding in top] == expected
+    for finding in top:
+        assert finding['host_score'] == analyzer.get_host_risk_score(finding['host'])[0]
@@ -0,0 +1,41 @@
+"""
+Pruebas de la validación de los archivos de reglas
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rule_engine import load_rule_file
+
+
+def _write_rules(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(rules), encoding='utf-8')
+    return str(path)
+
+
+def test_valid_version_specs_are_accepted(tmp_path):
+    path = _write_rules(tmp_path, {"vulnerable_versions": {
+        "vsftpd": ["2.3.4", ">=3.0,<3.0.3", {"introduced": "1.0", "fixed": "1.2"}]
+    }})
+    assert load_rule_file(path)["vulnerable_versions"]["vsftpd"][0] == "2.3.4"
+
+
+@pytest.mark.parametrize("spec", [">>2.0", "<abc", "", {"introduced": "x.y", "fixed": "2.0"}, 3])
+def test_invalid_version_spec_names_product_and_spec(tmp_path, spec):
+    path = _write_rules(tmp_path, {"vulnerable_versions": {"vsftpd": ["2.3.4", spec]}})
+    with pytest.raises(ValueError) as error:
+        load_rule_file(path)
+    assert "vsftpd" in str(error.value)
+    assert repr(spec) in str(error.value)
+
+
+def test_version_specs_must_be_a_list(tmp_path):
+    path = _write_rules(tmp_path, {"vulnerable_versions": {"vsftpd": "2.3.4"}})
+    with pytest.raises(ValueError, match="vsftpd"):
+        load_rule_file(path)
@@ -0,0 +1,47 @@
+"""
+Pruebas de la ida y vuelta de los snapshots binarios
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network_analytics import compute_subnet_rollups
+from security_analyzer import SecurityAnalyzer
+from snapshot import Snapshot, load_snapshot, write_snapshot
+
+
+def _scan_results():
+    profiles = [[(21, 'ftp', 'vsftpd', '2.3.4')], [(23, 'telnet', '', ''), (80, 'http', 'Apache httpd', '2.4.49')], []]
+    scan_results = {}
+    for i in range(30):
+        ip = f"10.0.{i // 10}.{i}"
+        ports = [{'port': port, 'state': 'open', 'service': service, 'product': product,
+                  'version': version, 'extrainfo': ''} for port, service, product, version in profiles[i % 3]]
+        scan_results[ip] = {'ip': ip, 'hostname': f"h{i}", 'state': 'up', 'os': '',
+                            'ports': ports, 'open_ports_count': len(ports)}
+    return scan_results
+
+
+def _plain(value):
+    return json.loads(json.dumps(value, default=str))
+
+
+def test_analysis_round_trip_keeps_large_keys_out_of_meta(tmp_path):
+    scan_results = _scan_results()
+    analyzer = SecurityAnalyzer(scan_results, top_k=5)
+    analysis = analyzer.analyze_all()
+    analysis['network'] = compute_subnet_rollups(scan_results, analysis, prefixes=(24, 16))
+    path = write_snapshot(str(tmp_path / "run.nabs"), scan_results, analysis, {'target': '10.0.0.0/16'})
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.scan_summary == {'target': '10.0.0.0/16'}
+        meta_analysis = snapshot.metadata['analysis']
+        for key in ('host_scores', 'top_findings', 'check_timings', 'network', 'vulnerabilities'):
+            assert key not in meta_analysis
+
+    loaded_scan, loaded_analysis, _ = load_snapshot(path)
+    assert _plain(loaded_scan) == _plain(scan_results)
+    assert _plain(loaded_analysis) == _plain(analysis)
@@ -0,0 +1,58 @@
+"""
+Pruebas del orden de versiones y de los rangos de version_index
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from version_index import parse_range, parse_version
+
+
+@pytest.mark.parametrize("pre_release, release", [
+    ("1.0rc1", "1.0"),
+    ("1.0beta2", "1.0"),
+    ("1.0alpha", "1.0"),
+    ("3.0.0rc1", "3.0"),
+    ("7.4rc1", "7.4"),
+    ("7.4beta", "7.4"),
+    ("7.4alpha1", "7.4"),
+    ("2.4.0rc2", "2.4"),
+])
+def test_pre_release_sorts_below_release(pre_release, release):
+    assert parse_version(pre_release) < parse_version(release)
+
+
+@pytest.mark.parametrize("lower, higher", [
+    ("1.0alpha", "1.0beta"),
+    ("1.0beta", "1.0rc1"),
+    ("1.0rc1", "1.0rc2"),
+    ("0.9", "1.0rc1"),
+    ("1.0rc1", "1.0.1"),
+    ("7.4", "7.4p1"),
+    ("7.4p1", "7.4.1"),
+])
+def test_version_order(lower, higher):
+    assert parse_version(lower) < parse_version(higher)
+
+
+def test_zero_components_before_pre_release_are_ignored():
+    assert parse_version("3.0rc1") == parse_version("3rc1") == parse_version("3.0.0rc1")
+    assert parse_version("3.0") == parse_version("3")
+
+
+@pytest.mark.parametrize("spec, version, expected", [
+    ("<3.0", "3.0rc1", True),
+    ("<3.0", "3.0", False),
+    ("<7.4", "7.4beta", True),
+    (">=3.0", "3.0alpha", False),
+    ("3.0", "3.0rc1", False),
+    ("3.0", "3.0.5", True),
+    ("7.4", "7.4rc1", False),
+    ("7.4", "7.4p1", True),
+])
+def test_ranges_with_pre_releases(spec, version, expected):
+    assert parse_range(spec).contains(parse_version(version)) is expected
@@ -0,0 +1,268 @@
+"""
+NetAuditBot - Índice de Rangos de Versiones
+Modelo de versiones comparables y rangos afectados con búsqueda por bisect,
+para sustituir las comparaciones por subcadena ("7.4" no debe coincidir con "17.4.1")
+"""
+
+import re
+import bisect
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Primer token con forma de versión dentro de una cadena de nmap ("7.4p1 Debian 10" -> "7.4p1")
+_VERSION_TOKEN = re.compile(r"\d+(?:[.\-_]?[0-9a-z]+)*", re.IGNORECASE)
+_COMPONENT = re.compile(r"\d+|[a-z]+", re.IGNORECASE)
+
+# Sufijos que indican una versión anterior a la release (1.0rc1 < 1.0)
+_PRE_RELEASE = {'a', 'alpha', 'b', 'beta', 'c', 'rc', 'pre', 'preview', 'dev'}
+
+# Terminador común: permite que "7.4" < "7.4p1" < "7.4.1" y "7.4rc1" < "7.4"
+_END = (0, '')
+
+VersionKey = Tuple[Tuple[int, Any], ...]
+
+
+def _components(text: str) -> Optional[List[Tuple[int, Any]]]:
+    """Componentes comparables del primer token de versión de una cadena"""
+    match = _VERSION_TOKEN.search(text or '')
+    if not match:
+        return None
+
+    components = []
+    for component in _COMPONENT.findall(match.group(0).lower()):
+        if component.isdigit():
+            components.append((1, int(component)))
+        elif component in _PRE_RELEASE:
+            components.append((-1, component))
+        else:
+            components.append((0, component))
+    return components
+
+
+@lru_cache(maxsize=8192)
+def parse_version(text: str) -> Optional[VersionKey]:
+    """
+    Convierte una versión en una clave comparable
+
+    Los componentes numéricos se comparan como enteros ("2.4.49" > "2.4.5"),
+    los sufijos alfabéticos como texto y los de pre-release quedan por debajo
+    de la versión final. Los ceros finales no cuentan ("3.0" == "3"), tampoco
+    los que preceden a un sufijo de pre-release ("3.0rc1" == "3rc1" < "3.0").
+    Las cadenas de versión se repiten mucho entre hosts, por eso se cachean.
+
+    Args:
+        text: Versión o cadena de versión de nmap
+
+    Returns:
+        Tupla comparable o None si no contiene ninguna versión
+    """
+    components = _components(text)
+    if components is None:
+        return None
+
+    key = []
+    for component in components:
+        if component[0] == -1:
+            _strip_zeros(key)
+        key.append(component)
+    _strip_zeros(key)
+    return tuple(key) + (_END,)
+
+
+def _strip_zeros(components: List[Tuple[int, Any]]):
+    """Quita los componentes numéricos a cero del final (conservando el primero)"""
+    while len(components) > 1 and components[-1] == (1, 0):
+        components.pop()
+
+
+def _next_prefix(text: str) -> VersionKey:
+    """Primera versión posterior a la familia de un prefijo ("7.4" -> "7.5", "7.0" -> "7.1")"""
+    components = _components(text)
+    for i in range(len(components) - 1, -1, -1):
+        if components[i][0] == 1:
+            return tuple(components[:i]) + ((1, components[i][1] + 1), _END)
+    return tuple(components) + ((2, ''),)
+
+
+class VersionRange:
+    """
+    Rango de versiones afectadas [inicio, fin) con límites configurables
+    """
+
+    def __init__(self, start: Optional[VersionKey] = None, end: Optional[VersionKey] = None,
+                 start_inclusive: bool = True, end_inclusive: bool = False, label: str = ''):
+        self.start = start
+        self.end = end
+        self.start_inclusive = start_inclusive
+        self.end_inclusive = end_inclusive
+        self.label = label
+
+    def contains(self, key: VersionKey) -> bool:
+        """Indica si una versión (ya parseada) está dentro del rango"""
+        if self.start is not None:
+            if key < self.start or (key == self.start and not self.start_inclusive):
+                return False
+        if self.end is not None:
+            if key > self.end or (key == self.end and not self.end_inclusive):
+                return False
+        return True
+
+    def __repr__(self):
+        return f"VersionRange({self.label!r})"
+
+
+def parse_range(spec: Union[str, Dict]) -> VersionRange:
+    """
+    Convierte una especificación de versiones afectadas en un rango
+
+    Formatos admitidos:
+        "7.4"                       familia completa (7.4, 7.4p1, 7.4.2; no 7.40 ni 17.4)
+        "=2.4.49"                   versión exacta
+        ">=2.4.0,<2.4.50"           comparadores separados por comas
+        {"introduced": "2.4.0", "fixed": "2.4.50"}
+        {"introduced": "1.0", "last_affected": "1.2"}
+
+    Args:
+        spec: Especificación del rango
+
+    Returns:
+        Rango de versiones
+    """
+    if isinstance(spec, dict):
+        introduced = spec.get('introduced')
+        fixed = spec.get('fixed')
+        last_affected = spec.get('last_affected')
+        label = spec.get('label') or f">={introduced or '0'}" + (
+            f",<{fixed}" if fixed else f",<={last_affected}" if last_affected else ''
+        )
+        for version in (introduced, fixed, last_affected):
+            if version and parse_version(version) is None:
+                raise ValueError(f"Versión inválida: '{version}'")
+        return VersionRange(
+            start=parse_version(introduced) if introduced else None,
+            end=parse_version(fixed or last_affected) if (fixed or last_affected) else None,
+            start_inclusive=True,
+            end_inclusive=bool(last_affected and not fixed),
+            label=label
+        )
+
+    spec = spec.strip()
+    if not any(op in spec for op in '<>=,'):
+        if parse_version(spec) is None:
+            raise ValueError(f"Versión inválida: '{spec}'")
+        return VersionRange(parse_version(spec), _next_prefix(spec), True, False, label=spec)
+
+    version_range = VersionRange(label=spec)
+    for clause in spec.split(','):
+        clause = clause.strip()
+        match = re.match(r"(>=|<=|==|=|>|<)\s*(\w.*)", clause)
+        if not match or parse_version(match.group(2)) is None:
+            raise ValueError(f"Rango de versiones inválido: '{spec}'")
+        operator, key = match.group(1), parse_version(match.group(2))
+        if operator in ('=', '=='):
+            version_range.start, version_range.end = key, key
+            version_range.start_inclusive = version_range.end_inclusive = True
+        elif operator.startswith('>'):
+            version_range.start, version_range.start_inclusive = key, operator == '>='
+        else:
+            version_range.end, version_range.end_inclusive = key, operator == '<='
+    return version_range
+
+
+class VersionIndex:
+    """
+    Índice de intervalos de versiones para búsquedas O(log n)
+
+    Los extremos de todos los rangos dividen el eje de versiones en intervalos
+    elementales (huecos entre extremos y los propios extremos). Para cada uno se
+    precalcula la tupla de elementos que lo cubren, de modo que una búsqueda es
+    un único bisect sin importar cuántos rangos contenga el índice.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[VersionRange, Any]] = []
+        self._bounds: List[VersionKey] = []
+        self._slots: List[Tuple] = []
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, version_range: VersionRange, payload: Any = None):
+        """
+        Agrega un rango al índice
+
+        Args:
+            version_range: Rango de versiones afectadas
+            payload: Dato devuelto cuando una versión cae en el rango (por defecto, el rango)
+        """
+        self._entries.append((version_range, version_range if payload is None else payload))
+        self._dirty = True
+
+    def _slot_of(self, key: VersionKey) -> int:
+        i = bisect.bisect_left(self._bounds, key)
+        if i < len(self._bounds) and self._bounds[i] == key:
+            return 2 * i + 1
+        return 2 * i
+
+    def build(self):
+        """Recalcula los intervalos elementales (se llama automáticamente)"""
+        bounds = set()
+        for version_range, _ in self._entries:
+            if version_range.start is not None:
+                bounds.add(version_range.start)
+            if version_range.end is not None:
+                bounds.add(version_range.end)
+        self._bounds = sorted(bounds)
+
+        last_slot = 2 * len(self._bounds)
+        starts: Dict[int, List[int]] = {}
+        stops: Dict[int, List[int]] = {}
+        for entry_id, (version_range, _) in enumerate(self._entries):
+            if version_range.start is None:
+                first = 0
+            else:
+                first = self._slot_of(version_range.start) + (0 if version_range.start_inclusive else 1)
+            if version_range.end is None:
+                last = last_slot
+            else:
+                last = self._slot_of(version_range.end) - (0 if version_range.end_inclusive else 1)
+            if first <= last:
+                starts.setdefault(first, []).append(entry_id)
+                stops.setdefault(last + 1, []).append(entry_id)
+
+        # Barrido: los intervalos sin cambios comparten la misma tupla
+        active = set()
+        current: Tuple = ()
+        self._slots = []
+        for slot in range(last_slot + 1):
+            if slot in starts or slot in stops:
+                active.difference_update(stops.get(slot, ()))
+                active.update(starts.get(slot, ()))
+                current = tuple(self._entries[i][1] for i in sorted(active))
+            self._slots.append(current)
+
+        self._dirty = False
+
+    def lookup_key(self, key: VersionKey) -> Tuple:
+        """Elementos cuyos rangos contienen una versión ya parseada"""
+        if self._dirty:
+            self.build()
+        if not self._slots:
+            return ()
+        return self._slots[self._slot_of(key)]
+
+    def lookup(self, version: str) -> Tuple:
+        """
+        Busca los elementos cuyos rangos contienen una versión
+
+        Args:
+            version: Versión o cadena de versión de nmap
+
+        Returns:
+            Tupla de elementos (vacía si la versión no es parseable)
+        """
+        key = parse_version(version)
+        if key is None:
+            return ()
+        return self.lookup_key(key)